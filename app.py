@@ -1,38 +1,82 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 import os
+import time
+from utils.runtime_profile import bot_options, get_profile_name
+from utils.members import MemberLRU
+from utils.sharding import shard_options
 
 load_dotenv()
+from utils import guild_config, metrics  # lê GUILD_ID/LOG_CHANNEL_ID do .env
+
 TOKEN = os.getenv("TOKEN")
-GUILD_ID = 797637779332661258
 
-class Waffle(commands.Bot):
+# ────────────── MÉTRICAS POR COMANDO ──────────────
+class WaffleTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        started_at = interaction.extras.get("started_at")
+        if interaction.command is not None and started_at is not None:
+            metrics.observe_command(
+                interaction.command.qualified_name,
+                time.perf_counter() - started_at,
+                error=True
+            )
+        await super().on_error(interaction, error)
+
+class Waffle(commands.AutoShardedBot):
     def __init__(self):
-        intents = discord.Intents.all()
-        super().__init__(command_prefix="!", intents=intents)
+        # intents, cache de membros e chunking vêm do perfil (BOT_PROFILE);
+        # shards deste processo vêm de SHARD_COUNT/SHARD_IDS (launcher.py)
+        self.profile = get_profile_name()
+        super().__init__(
+            command_prefix="!",
+            tree_cls=WaffleTree,
+            http_trace=metrics.http_trace(),
+            **bot_options(self.profile),
+            **shard_options()
+        )
+        self.member_lru = MemberLRU()
+        self.warmed_up = False
 
     async def setup_hook(self):
-        guild = discord.Object(id=GUILD_ID)
+        # valida e resolve os webhooks de log uma única vez
+        from utils.logger import init_logger, start_log_replay
+        await init_logger()
+        start_log_replay(self)  # logs que ficaram no outbox da última execução
+        await metrics.start(self)
+
+        # cogs em paralelo, com tempo de carga por extensão
+        from utils.extensions import load_all, refresh_commands
+        from utils.command_sync import format_report
+        await load_all(self)
 
-        for ext in (
-    		"commands.embeds",
-    		"commands.raw",
-    		"commands.moderation",
-    		"commands.sync",
-            "commands.invite",
-		):
-            await self.load_extension(ext)
+        reports = await refresh_commands(self.tree)
+        if reports:
+            for report in reports:
+                print(format_report(report))
+            print("✅ Slash & Apps sincronizados")
 
-        self.tree.copy_global_to(guild=guild)
-        await self.tree.sync(guild=guild)
-        print("✅ Slash & Apps sincronizados")
+    async def close(self):
+        # drena as filas de log antes de fechar a sessão HTTP
+        from utils.logger import close_logger
+        from utils import invites_store
+        await close_logger()
+        await metrics.stop()
+        invites_store.close()
+        guild_config.close()
+        await super().close()
 
 bot = Waffle()
 
 @bot.event
 async def on_ready():
-    print(f"🧇 {bot.user} online")
+    print(f"🧇 {bot.user} online (perfil: {bot.profile}, shards: {bot.shard_ids or 'todos'}/{bot.shard_count})")
 
     await bot.change_presence(
         status=discord.Status.online,
@@ -42,12 +86,37 @@ async def on_ready():
         )
     )
 
+    # on_ready dispara de novo a cada reconexão: o warm-up roda uma vez só
+    if bot.warmed_up:
+        return
+    bot.warmed_up = True
+
     # ────────────── ADIÇÃO OBRIGATÓRIA (THREADS DE LOG) ──────────────
     from utils.logger import get_or_create_thread, THREAD_NAMES
+    from utils.warmup import warm_up
 
-    for action in THREAD_NAMES.keys():
-        await get_or_create_thread(bot, action)
+    # só guilds deste processo com canal de logs configurado;
+    # "Mute" e "Mute (Apps)" usam a mesma thread: deduplicado pelo nome
+    await warm_up("threads de log", [
+        (
+            (guild.id, thread_name),
+            lambda guild_id=guild.id, action=action: get_or_create_thread(bot, guild_id, action)
+        )
+        for guild in bot.guilds
+        if guild_config.get(guild.id).log_channel_id is not None
+        for action, thread_name in THREAD_NAMES.items()
+    ])
 
     print("📋 Threads de log pré-criadas com sucesso")
 
+@bot.event
+async def on_app_command_completion(interaction, command):
+    started_at = interaction.extras.get("started_at")
+    if started_at is not None:
+        metrics.observe_command(command.qualified_name, time.perf_counter() - started_at)
+
+@bot.event
+async def on_member_remove(member):
+    bot.member_lru.discard(member.guild.id, member.id)
+
 bot.run(TOKEN)
@@ -0,0 +1,321 @@
+# Benchmark offline contra a API falsa (bench/fake_discord.py).
+# Roda os caminhos quentes do bot sem Discord: validate_payload,
+# load_embeds, invites_store, send_raw_v2, log_action, atribuição de
+# convites, timeouts em massa e sync de comandos. Para cada cenário:
+# vazão, p50/p99 por operação, requisições HTTP e 429s.
+#
+# Tudo roda num diretório temporário (data/ descartável), com cópia
+# de embeds/ e messages/.
+#
+# Uso: python -m bench.bench_api [-n 2000] [-c 16] [--latency 30] [--ratelimit 0.02]
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.fake_discord import FakeDiscord, GUILD_ID
+
+# token com o formato aceito por discord.Webhook.from_url
+WEBHOOK_URL = "https://discord.com/api/webhooks/1300000000000000001/" + "t" * 68
+
+# ────────────── MEDIÇÃO ──────────────
+class Result:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.elapsed = 0.0
+        self.requests = 0
+        self.ratelimited = 0
+        self.errors = 0
+
+    def row(self) -> str:
+        n = len(self.latencies)
+        if n >= 2:
+            q = statistics.quantiles(self.latencies, n=100, method="inclusive")
+            p50, p99 = q[49], q[98]
+        else:
+            p50 = p99 = self.latencies[0] if n else 0.0
+        rate = n / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{self.name:<34} {n:>7} {rate:>11.0f} {p50 * 1e3:>9.2f} {p99 * 1e3:>9.2f}"
+            f" {self.requests:>7} {self.ratelimited:>5} {self.errors:>5}"
+        )
+
+HEADER = (
+    f"{'cenário':<34} {'ops':>7} {'ops/s':>11} {'p50 ms':>9} {'p99 ms':>9}"
+    f" {'req':>7} {'429':>5} {'erros':>5}"
+)
+
+async def measure(name: str, api: FakeDiscord, ops, *, concurrency: int = 1, drain=None) -> Result:
+    # `ops`: lista de funções async; cada uma é uma operação cronometrada.
+    # `drain`: aguardado no fim e incluído no tempo total (ex.: filas de log).
+    result = Result(name)
+    api.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(op):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await op()
+            except Exception:
+                result.errors += 1
+            result.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(op) for op in ops))
+    if drain is not None:
+        await drain()
+    result.elapsed = time.perf_counter() - start
+    result.requests = api.total()
+    result.ratelimited = api.total_ratelimited()
+    return result
+
+def measure_sync(name: str, fn, runs: int) -> Result:
+    result = Result(name)
+    start = time.perf_counter()
+    for i in range(runs):
+        t = time.perf_counter()
+        fn(i)
+        result.latencies.append(time.perf_counter() - t)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+# ────────────── CENÁRIOS ──────────────
+def bench_validator(n: int) -> list[Result]:
+    import json
+    from utils import cv2_validator
+
+    with open("messages/v22.json", "r", encoding="utf-8") as f:
+        v22 = json.load(f)
+
+    def cold(_):
+        cv2_validator.clear_cache()
+        cv2_validator.validate_payload(v22)
+
+    return [
+        measure_sync("validate_payload (frio)", cold, n),
+        measure_sync("validate_payload (memoizado)", lambda _: cv2_validator.validate_payload(v22), n),
+    ]
+
+def bench_embeds(bot, n: int) -> list[Result]:
+    from commands.embeds import Embeds
+
+    cog = Embeds(bot)
+
+    def cold(_):
+        cog.templates.invalidate("anuncio")
+        cog.load_embeds("anuncio")
+
+    return [
+        measure_sync("load_embeds (frio)", cold, n),
+        measure_sync("load_embeds (cache)", lambda _: cog.load_embeds("anuncio"), n),
+    ]
+
+def bench_invites_store(n: int) -> list[Result]:
+    from utils import invites_store
+
+    now = time.time()
+    add = measure_sync("invites_store.add_invite", lambda i: invites_store.add_invite({
+        "code": f"bench{i}",
+        "guild_id": GUILD_ID,
+        "channel_id": 2,
+        "inviter_id": 1000,
+        "max_uses": 0,
+        "uses": 0,
+        "created_at": now,
+        "expires_at": now - 1 if i % 2 else now + 3600,
+    }), n)
+    joins = measure_sync("invites_store.record_join", lambda i: invites_store.record_join(
+        GUILD_ID, 20_000 + i, f"bench{i % 50}", now
+    ), n)
+    listing = measure_sync("invites_store.list_invites", lambda _: invites_store.list_invites(GUILD_ID), 50)
+    expired = measure_sync("invites_store.pop_expired", lambda _: invites_store.pop_expired(now), 1)
+    return [add, joins, listing, expired]
+
+async def bench_send_raw(bot, api: FakeDiscord, n: int, concurrency: int) -> Result:
+    import json
+    from utils.raw_api import send_raw_v2
+
+    with open("messages/v22.json", "r", encoding="utf-8") as f:
+        payload = json.load(f)
+
+    # canais diferentes: buckets por rota independentes, como em produção
+    channels = [bot.get_partial_messageable(5000 + i % 20) for i in range(n)]
+    return await measure(
+        "send_raw_v2", api,
+        [lambda ch=ch: send_raw_v2(bot, ch, payload) for ch in channels],
+        concurrency=concurrency
+    )
+
+async def bench_log_action(bot, api: FakeDiscord, n: int) -> Result:
+    import discord
+    from utils import logger
+
+    await logger.init_logger()
+    embed = discord.Embed(title="🔇 Mute", description="bench " * 20, color=0xF1C40F)
+    actions = ("Mute", "Kick", "Ban", "DEFAULT")
+
+    # cronometra só o enfileiramento (custo no comando); o dreno das
+    # filas entra no tempo total e nas requisições
+    return await measure(
+        "log_action (thread + webhook)", api,
+        [lambda i=i: logger.log_action(bot, action=actions[i % 4], embed=embed) for i in range(n)],
+        drain=logger.close_logger
+    )
+
+async def bench_invite_joins(bot, api: FakeDiscord, n: int) -> Result:
+    import discord
+    from commands.invite import InviteManager
+    from utils import logger
+
+    cog = InviteManager(bot)
+    guild = bot._connection._get_or_create_unavailable_guild(GUILD_ID)
+    api.invites = {f"fake{i}": 0 for i in range(200)}
+    await cog.update_invite_cache(guild)
+
+    async def join(i: int):
+        api.invites[f"fake{i % 200}"] += 1   # o Discord contaria o uso
+        member = discord.Member(
+            data={
+                "user": {"id": str(30_000 + i), "username": f"m{i}", "discriminator": "0", "avatar": None},
+                "roles": [],
+                "joined_at": datetime.now(timezone.utc).isoformat(),
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            },
+            guild=guild,
+            state=bot._connection
+        )
+        await cog.on_member_join(member)
+
+    # entradas já são serializadas por guild (lock): mede uma por vez;
+    # o log "📥 Entrada via convite" de cada uma é drenado no fim
+    await logger.init_logger()
+    return await measure(
+        "on_member_join (atribuição)", api,
+        [lambda i=i: join(i) for i in range(n)],
+        drain=logger.close_logger
+    )
+
+async def bench_bulk_timeout(bot, api: FakeDiscord, n: int, concurrency: int) -> Result:
+    from utils.bulk import RateLimiter, run_bulk
+
+    until = (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat()
+    result = Result("run_bulk (timeout)")
+    api.reset()
+
+    async def timeout(user_id: int):
+        t = time.perf_counter()
+        try:
+            await bot.http.edit_member(GUILD_ID, user_id, communication_disabled_until=until)
+        finally:
+            result.latencies.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    _, failed = await run_bulk(range(40_000, 40_000 + n), timeout, limit=concurrency, limiter=RateLimiter())
+    result.elapsed = time.perf_counter() - start
+    result.errors = len(failed)
+    result.requests = api.total()
+    result.ratelimited = api.total_ratelimited()
+    return result
+
+async def bench_sync(bot, api: FakeDiscord) -> list[Result]:
+    from utils.command_sync import sync_if_changed
+
+    for ext in ("commands.embeds", "commands.raw", "commands.moderation", "commands.sync", "commands.invite"):
+        await bot.load_extension(ext)
+
+    guild = bot._connection._get_or_create_unavailable_guild(GUILD_ID)
+    scopes = (None, guild)
+    first = await measure(
+        "sync_if_changed (alterado)", api,
+        [lambda scope=scope: sync_if_changed(bot.tree, guild=scope) for scope in scopes]
+    )
+    second = await measure(
+        "sync_if_changed (sem mudança)", api,
+        [lambda scope=scope: sync_if_changed(bot.tree, guild=scope) for scope in scopes]
+    )
+    return [first, second]
+
+# ────────────── MAIN ──────────────
+async def run(args) -> list[Result]:
+    import discord
+    from discord.ext import commands
+
+    api = FakeDiscord(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        ratelimit=args.ratelimit,
+        retry_after=args.retry_after
+    )
+    await api.start()
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    await bot.login("bench")
+
+    results = []
+    try:
+        results += bench_validator(args.n)
+        results += bench_embeds(bot, args.n)
+        results += bench_invites_store(args.n)
+        results.append(await bench_send_raw(bot, api, args.n, args.concurrency))
+        results.append(await bench_log_action(bot, api, args.n))
+        results.append(await bench_invite_joins(bot, api, min(args.n, 500)))
+        results.append(await bench_bulk_timeout(bot, api, min(args.n, 500), args.concurrency))
+        results += await bench_sync(bot, api)
+    finally:
+        from utils import invites_store, logger
+        await logger.close_logger()
+        await bot.close()
+        invites_store.close()
+        await api.stop()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline contra uma API falsa do Discord")
+    parser.add_argument("-n", type=int, default=2000, help="operações por cenário")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="requisições simultâneas")
+    parser.add_argument("--latency", type=float, default=30.0, help="latência da API falsa (ms)")
+    parser.add_argument("--jitter", type=float, default=5.0, help="variação da latência (± ms)")
+    parser.add_argument("--ratelimit", type=float, default=0.0, help="fração de respostas 429 (0–1)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="retry_after dos 429 (s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="waffle-bench-")
+    for folder in ("embeds", "messages"):
+        shutil.copytree(os.path.join(ROOT, folder), os.path.join(workdir, folder))
+    os.chdir(workdir)
+
+    # antes de importar utils.logger: só webhooks/threads da API falsa
+    os.environ["LOG_SINKS"] = "thread,webhook"
+    os.environ["LOG_WEBHOOK_URL"] = WEBHOOK_URL
+    for var in ("LOG_WEBHOOK_MUTE", "LOG_WEBHOOK_KICK", "LOG_WEBHOOK_BAN", "LOG_WEBHOOK_UNMUTE", "LOG_WEBHOOK_DEFAULT"):
+        os.environ.pop(var, None)
+
+    print(
+        f"n={args.n}  concorrência={args.concurrency}  latência={args.latency:.0f}±{args.jitter:.0f} ms"
+        f"  429={args.ratelimit:.1%}\n"
+    )
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(HEADER)
+    print("─" * len(HEADER))
+    for result in results:
+        print(result.row())
+
+if __name__ == "__main__":
+    main()
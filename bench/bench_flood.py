@@ -0,0 +1,92 @@
+# Benchmark do detector de flood (utils/flood.py): custo por evento e
+# memória com muitos membros ativos, incluindo mais membros distintos do
+# que o limite rastreado (despejo LRU) e o despejo por ociosidade.
+#
+# Confere também os limites (N eventos disparam, N-1 não).
+#
+# Uso: python -m bench.bench_flood [--members 100000] [--events 1000000]
+import argparse
+import random
+import time
+import tracemalloc
+
+from utils.flood import FLOOD_MESSAGES, FLOOD_SECONDS, RAID_JOINS, RAID_SECONDS, JoinWindow, RateTracker
+
+def run(label: str, members: int, events: int, max_tracked: int, rate: float, seed: int):
+    rng = random.Random(seed)
+    keys = [(1, 10_000 + rng.randrange(members)) for _ in range(events)]
+    step = 1.0 / rate  # tempo simulado entre eventos
+
+    def replay(tracker: RateTracker) -> int:
+        hits = 0
+        now = 0.0
+        for key in keys:
+            now += step
+            hits += tracker.hit(key, now)
+        return hits
+
+    # tempo sem tracemalloc (que deixa tudo várias vezes mais lento)
+    tracker = RateTracker(FLOOD_MESSAGES, FLOOD_SECONDS, max_tracked)
+    start = time.perf_counter()
+    hits = replay(tracker)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracker = RateTracker(FLOOD_MESSAGES, FLOOD_SECONDS, max_tracked)
+    replay(tracker)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<34} {elapsed / events * 1e9:>6.0f} ns/evento"
+        f" {len(tracker):>8} rastreados {peak / 2**20:>7.1f} MiB pico"
+        f" {peak / max(len(tracker), 1):>5.0f} B/membro  ({hits} floods)"
+    )
+
+def flood_check(seed: int):
+    # um membro mandando 1 msg/0.5s em meio ao tráfego: precisa disparar
+    tracker = RateTracker(FLOOD_MESSAGES, FLOOD_SECONDS, 1000)
+    rng = random.Random(seed)
+    fired = False
+    for i in range(200):
+        now = i * 0.05
+        tracker.hit((1, rng.randrange(10_000)), now)
+        if i % 10 == 0:
+            fired |= tracker.hit((1, 1), now)
+    assert fired, "flood não detectado"
+
+def threshold_check():
+    # `limit` eventos na janela disparam; `limit - 1` não
+    for limit in (1, FLOOD_MESSAGES, 10):
+        tracker = RateTracker(limit, FLOOD_SECONDS, 10)
+        fired = [tracker.hit((1, 1), i * 0.01) for i in range(limit)]
+        assert fired[-1] and not any(fired[:-1]), f"limite {limit}: disparou em {fired}"
+        # fora da janela não conta
+        tracker.forget((1, 1))
+        fired = [tracker.hit((1, 1), i * FLOOD_SECONDS) for i in range(limit + 1)]
+        assert limit == 1 or not any(fired), f"limite {limit}: disparou fora da janela"
+
+    # raid: quem entrou primeiro na janela também está em recent()
+    window = JoinWindow(RAID_JOINS)
+    fired = [window.join(1000 + i, i * 0.01, RAID_SECONDS) for i in range(RAID_JOINS)]
+    assert fired[-1] and not any(fired[:-1]), "raid disparou fora do limite"
+    assert sorted(window.recent()) == list(range(1000, 1000 + RAID_JOINS)), "raider perdido"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do anti-flood")
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    threshold_check()
+    flood_check(args.seed)
+    # tráfego alto (20k msg/s): dezenas de milhares de membros na janela
+    run("membros ativos (limite folgado)", args.members, args.events, args.members * 2, 20_000, args.seed)
+    # 10x mais membros que o limite: o LRU segura a memória
+    run("10x acima do limite", args.members * 10, args.events, args.members, 20_000, args.seed)
+    # tráfego baixo: entradas ociosas saem sozinhas
+    run("tráfego baixo (ociosos)", args.members, args.events // 10, args.members * 2, 200, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Benchmark de memória por perfil de runtime (BOT_PROFILE).
+# Simula, sem conexão, os eventos que o gateway enviaria a cada perfil
+# (GUILD_CREATE, chunks de membros, presenças e mensagens) e mede o
+# heap Python (tracemalloc) e o RSS de um processo limpo por perfil.
+#
+# Uso: python -m bench.bench_profiles [membros] [mensagens]
+import asyncio
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+import discord
+from discord.ext import commands
+
+from utils.runtime_profile import PROFILES, bot_options
+
+GUILD_ID = 1
+
+def user(i: int) -> dict:
+    return {"id": str(10_000 + i), "username": f"user{i}", "discriminator": "0", "avatar": None}
+
+def member(i: int) -> dict:
+    return {
+        "user": user(i),
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+def guild_create() -> dict:
+    return {
+        "id": str(GUILD_ID),
+        "name": "bench",
+        "owner_id": "10000",
+        "member_count": 0,
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [{"id": "2", "type": 0, "name": "geral", "position": 0, "guild_id": str(GUILD_ID)}],
+        "members": [],
+        "presences": [],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+    }
+
+def message(i: int, n_members: int) -> dict:
+    return {
+        "id": str(1_000_000 + i),
+        "channel_id": "2",
+        "guild_id": str(GUILD_ID),
+        "author": user(i % n_members),
+        "member": {k: v for k, v in member(i % n_members).items() if k != "user"},
+        "content": "mensagem de teste " * 4,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+def run_profile(name: str, n_members: int, n_messages: int):
+    async def main():
+        bot = commands.Bot(command_prefix="!", **bot_options(name))
+        state = bot._connection
+        state.dispatch = lambda *args, **kwargs: None  # sem listeners no benchmark
+        intents = bot.intents
+
+        tracemalloc.start()
+        state.parse_guild_create(guild_create())
+        guild = bot.get_guild(GUILD_ID)
+
+        # chunking só acontece com o perfil que pede; é o que o
+        # ChunkRequest faria com cada GUILD_MEMBERS_CHUNK recebido
+        if intents.members and state._chunk_guilds:
+            for i in range(n_members):
+                guild._add_member(discord.Member(data=member(i), guild=guild, state=state))
+
+        # entradas com o bot online (cache `joined`)
+        if intents.members:
+            for i in range(n_members, n_members + n_members // 10):
+                state.parse_guild_member_add({**member(i), "guild_id": str(GUILD_ID)})
+
+        if intents.presences:
+            for i in range(n_members):
+                state.parse_presence_update({
+                    "user": {"id": str(10_000 + i)}, "guild_id": str(GUILD_ID),
+                    "status": "online", "activities": [], "client_status": {"desktop": "online"},
+                })
+
+        if intents.guild_messages:
+            for i in range(n_messages):
+                state.parse_message_create(message(i, n_members))
+
+        heap, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        cached = len(guild._members) if guild else 0
+        print(f"{name:<11} membros em cache: {cached:>7}   heap: {heap / 2**20:>8.1f} MiB   RSS máx: {rss_mb:>8.1f} MiB")
+
+    asyncio.run(main())
+
+def main():
+    n_members = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_messages = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    print(f"{n_members} membros, {n_messages} mensagens simuladas\n")
+    for name in PROFILES:
+        # processo separado por perfil: RSS não contamina o próximo
+        subprocess.run(
+            [sys.executable, "-c",
+             f"from bench.bench_profiles import run_profile; run_profile({name!r}, {n_members}, {n_messages})"],
+            check=True
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Micro-benchmark do validador Components V2.
+# Uso: python -m bench.bench_validator
+import json
+import time
+
+from utils import cv2_validator
+from utils.cv2_validator import validate_payload
+
+def timeit(label: str, fn, runs: int):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed / runs * 1e6:>10.1f} µs/op  ({runs} runs)")
+
+def cold(payload):
+    def run():
+        cv2_validator.clear_cache()
+        validate_payload(payload)
+    return run
+
+def rejected(payload):
+    def run():
+        cv2_validator.clear_cache()
+        try:
+            validate_payload(payload)
+        except ValueError:
+            pass
+    return run
+
+def wide_payload(n: int) -> dict:
+    # container com n-1 textos (n componentes no total)
+    return {
+        "flags": cv2_validator.IS_COMPONENTS_V2,
+        "components": [{
+            "type": 17,
+            "components": [{"type": 10, "content": "x" * 50} for _ in range(n - 1)]
+        }]
+    }
+
+def deep_payload(depth: int) -> dict:
+    comp = {"type": 10, "content": "fim"}
+    for _ in range(depth):
+        comp = {"type": 17, "components": [comp]}
+    return {"flags": cv2_validator.IS_COMPONENTS_V2, "components": [comp]}
+
+def main():
+    with open("messages/v22.json", "r", encoding="utf-8") as f:
+        v22 = json.load(f)
+
+    timeit("v22.json (frio, sem cache)", cold(v22), 20000)
+    timeit("v22.json (memoizado)", lambda: validate_payload(v22), 20000)
+
+    for n in (5, 10, 20, 40):
+        payload = wide_payload(n)
+        timeit(f"{n} componentes (frio)", cold(payload), 5000)
+        timeit(f"{n} componentes (memoizado)", lambda: validate_payload(payload), 5000)
+
+    # acima dos limites do Discord: rejeitado cedo, sem recursão
+    timeit("10 000 componentes (rejeitado)", rejected(wide_payload(10000)), 200)
+    timeit("aninhamento 5 000 níveis (rejeitado)", rejected(deep_payload(5000)), 200)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# API REST falsa do Discord para benchmarks offline.
+# Responde só às rotas que o bot usa (mensagens, webhooks, threads,
+# convites, timeout/kick/ban e sync de comandos), com latência e 429
+# configuráveis, e conta as requisições por rota.
+#
+# Uso (dentro de um event loop):
+#   api = FakeDiscord(latency=0.05, ratelimit=0.02)
+#   await api.start()   # redireciona discord.http.Route.BASE para cá
+#   ...
+#   await api.stop()
+import asyncio
+import itertools
+import json
+import random
+from collections import Counter
+from datetime import datetime, timezone
+
+from aiohttp import web
+from discord.http import Route
+
+GUILD_ID = 797637779332661258
+APPLICATION_ID = 1000
+BOT_USER = {"id": "1000", "username": "waffle", "discriminator": "0", "avatar": None, "bot": True}
+
+_ids = itertools.count(1_300_000_000_000_000_000)
+
+def snowflake() -> str:
+    return str(next(_ids))
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def message(channel_id, payload: dict | None = None) -> dict:
+    payload = payload or {}
+    return {
+        "id": snowflake(),
+        "channel_id": str(channel_id),
+        "author": BOT_USER,
+        "content": payload.get("content", ""),
+        "timestamp": now_iso(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": payload.get("embeds", []),
+        "components": payload.get("components", []),
+        "flags": payload.get("flags", 0),
+        "pinned": False,
+        "type": 0,
+    }
+
+def text_channel(channel_id) -> dict:
+    return {
+        "id": str(channel_id),
+        "type": 0,
+        "guild_id": str(GUILD_ID),
+        "name": "logs",
+        "position": 0,
+        "permission_overwrites": [],
+        "nsfw": False,
+        "parent_id": None,
+    }
+
+def thread(parent_id, name: str) -> dict:
+    return {
+        "id": snowflake(),
+        "type": 11,
+        "guild_id": str(GUILD_ID),
+        "parent_id": str(parent_id),
+        "owner_id": BOT_USER["id"],
+        "name": name,
+        "message_count": 0,
+        "member_count": 1,
+        "rate_limit_per_user": 0,
+        "thread_metadata": {
+            "archived": False,
+            "auto_archive_duration": 10080,
+            "archive_timestamp": now_iso(),
+            "locked": False,
+        },
+    }
+
+def invite(code: str, uses: int = 0) -> dict:
+    return {
+        "code": code,
+        "guild": {"id": str(GUILD_ID), "name": "bench", "splash": None, "banner": None,
+                  "description": None, "icon": None, "features": [], "verification_level": 0,
+                  "vanity_url_code": None, "nsfw_level": 0, "premium_subscription_count": 0},
+        "channel": {"id": "2", "name": "geral", "type": 0},
+        "inviter": BOT_USER,
+        "uses": uses,
+        "max_uses": 0,
+        "max_age": 0,
+        "temporary": False,
+        "created_at": now_iso(),
+    }
+
+def json_response(data, *, status: int = 200, headers: dict | None = None) -> web.Response:
+    # discord.py só decodifica quando o content-type é exatamente application/json
+    return web.Response(
+        body=json.dumps(data).encode("utf-8"),
+        status=status,
+        headers={"Content-Type": "application/json", **(headers or {})}
+    )
+
+class FakeDiscord:
+    def __init__(self, *, latency: float = 0.0, jitter: float = 0.0,
+                 ratelimit: float = 0.0, retry_after: float = 0.05, seed: int = 0):
+        self.latency = latency          # segundos por resposta
+        self.jitter = jitter            # ± segundos aleatórios
+        self.ratelimit = ratelimit      # fração das requisições que recebe 429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.requests: Counter[tuple[str, str]] = Counter()
+        self.ratelimited: Counter[tuple[str, str]] = Counter()
+        self.invites: dict[str, int] = {}   # code → uses
+
+        self._runner: web.AppRunner | None = None
+        self._old_base = Route.BASE
+        self.base_url = ""
+
+    # ────────────── CONTADORES ──────────────
+    def reset(self):
+        self.requests.clear()
+        self.ratelimited.clear()
+
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+    def total_ratelimited(self) -> int:
+        return sum(self.ratelimited.values())
+
+    # ────────────── LATÊNCIA / 429 ──────────────
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        resource = request.match_info.route.resource
+        key = (request.method, resource.canonical if resource else request.path)
+        self.requests[key] += 1
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if key[1] != "/api/v10/users/@me" and self.random.random() < self.ratelimit:
+            self.ratelimited[key] += 1
+            # "Via" distingue 429 do Discord de bloqueio do Cloudflare no discord.py
+            return json_response(
+                {"message": "You are being rate limited.", "retry_after": self.retry_after, "global": False},
+                status=429,
+                headers={"Via": "1.1 google", "Retry-After": str(self.retry_after)}
+            )
+
+        response = await handler(request)
+        # bucket folgado: sem esses headers o discord.py serializa cada rota
+        # (limite desconhecido = 1 por vez); os 429 vêm só da injeção acima
+        response.headers.update({
+            "X-RateLimit-Bucket": key[1],
+            "X-RateLimit-Limit": "50",
+            "X-RateLimit-Remaining": "49",
+            "X-RateLimit-Reset-After": "1.0",
+        })
+        return response
+
+    # ────────────── HANDLERS ──────────────
+    async def _me(self, request):
+        return json_response(BOT_USER)
+
+    async def _application(self, request):
+        return json_response({
+            "id": str(APPLICATION_ID),
+            "name": "waffle",
+            "icon": None,
+            "description": "",
+            "rpc_origins": [],
+            "bot_public": True,
+            "bot_require_code_grant": False,
+            "owner": BOT_USER,
+            "summary": "",
+            "verify_key": "0" * 64,
+            "team": None,
+            "flags": 0,
+        })
+
+    async def _create_message(self, request):
+        payload = await request.json()
+        return json_response(message(request.match_info["channel_id"], payload))
+
+    async def _execute_webhook(self, request):
+        payload = await request.json()
+        if request.query.get("wait") == "true":
+            return json_response(message(request.match_info["webhook_id"], payload))
+        return web.Response(status=204)
+
+    async def _get_channel(self, request):
+        return json_response(text_channel(request.match_info["channel_id"]))
+
+    async def _archived_threads(self, request):
+        return json_response({"threads": [], "members": [], "has_more": False})
+
+    async def _create_thread(self, request):
+        payload = await request.json()
+        return json_response(thread(request.match_info["channel_id"], payload["name"]))
+
+    async def _guild_invites(self, request):
+        return json_response([invite(code, uses) for code, uses in self.invites.items()])
+
+    async def _delete_invite(self, request):
+        code = request.match_info["code"]
+        self.invites.pop(code, None)
+        return json_response(invite(code))
+
+    async def _edit_member(self, request):
+        payload = await request.json()
+        return json_response({
+            "user": {"id": request.match_info["user_id"], "username": "membro", "discriminator": "0", "avatar": None},
+            "roles": [],
+            "joined_at": now_iso(),
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+            "communication_disabled_until": payload.get("communication_disabled_until"),
+        })
+
+    async def _no_content(self, request):
+        return web.Response(status=204)
+
+    async def _bulk_ban(self, request):
+        payload = await request.json()
+        return json_response({"banned_users": payload.get("user_ids", []), "failed_users": []})
+
+    async def _sync_commands(self, request):
+        payload = await request.json()
+        guild_id = request.match_info.get("guild_id")
+        return json_response([
+            {
+                "description": "",   # menus de contexto não enviam descrição
+                **cmd,
+                "id": snowflake(),
+                "application_id": str(APPLICATION_ID),
+                "version": snowflake(),
+                **({"guild_id": guild_id} if guild_id else {}),
+            }
+            for cmd in payload
+        ])
+
+    # ────────────── SERVIDOR ──────────────
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes([
+            web.get("/api/v10/users/@me", self._me),
+            web.get("/api/v10/oauth2/applications/@me", self._application),
+            web.post("/api/v10/channels/{channel_id}/messages", self._create_message),
+            web.post("/api/v10/webhooks/{webhook_id}/{token}", self._execute_webhook),
+            web.get("/api/v10/channels/{channel_id}", self._get_channel),
+            web.get("/api/v10/channels/{channel_id}/threads/archived/public", self._archived_threads),
+            web.post("/api/v10/channels/{channel_id}/threads", self._create_thread),
+            web.get("/api/v10/guilds/{guild_id}/invites", self._guild_invites),
+            web.delete("/api/v10/invites/{code}", self._delete_invite),
+            web.patch("/api/v10/guilds/{guild_id}/members/{user_id}", self._edit_member),
+            web.delete("/api/v10/guilds/{guild_id}/members/{user_id}", self._no_content),
+            web.put("/api/v10/guilds/{guild_id}/bans/{user_id}", self._no_content),
+            web.post("/api/v10/guilds/{guild_id}/bulk-ban", self._bulk_ban),
+            web.put("/api/v10/applications/{application_id}/commands", self._sync_commands),
+            web.put("/api/v10/applications/{application_id}/guilds/{guild_id}/commands", self._sync_commands),
+        ])
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}/api/v10"
+        # discord.py (cliente e webhooks) monta toda URL a partir daqui
+        Route.BASE = self.base_url
+        return self.base_url
+
+    async def stop(self):
+        Route.BASE = self._old_base
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
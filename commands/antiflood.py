@@ -0,0 +1,174 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import time
+from datetime import datetime
+from utils import metrics
+from utils.bulk import run_bulk
+from utils.logger import log_action
+from utils.extensions import take_state
+from utils.flood import (
+    FLOOD_MAX_TRACKED, FLOOD_MESSAGES, FLOOD_SECONDS, FLOOD_TIMEOUT_MINUTES,
+    RAID_JOINS, RAID_LOCKDOWN_MINUTES, RAID_SECONDS, JoinWindow, RateTracker
+)
+from commands.moderation import auto_timeout
+
+class AntiFlood(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # (guild, membro) → últimas mensagens; limitado a FLOOD_MAX_TRACKED
+        self.messages = RateTracker(FLOOD_MESSAGES, FLOOD_SECONDS, FLOOD_MAX_TRACKED)
+        self.joins: dict[int, JoinWindow] = {}   # guild → últimas entradas
+        self.lockdowns: dict[int, float] = {}    # guild → fim do lockdown (monotonic)
+
+    # ────────────── HAND-OFF NO /reload ──────────────
+    def export_state(self) -> dict:
+        return {"messages": self.messages, "joins": self.joins, "lockdowns": self.lockdowns}
+
+    async def cog_load(self):
+        state = take_state(self.qualified_name)
+        if state is not None:
+            self.messages = state["messages"]
+            self.joins = state["joins"]
+            self.lockdowns = state["lockdowns"]
+
+    def make_embed(self, title: str, description: str, color: int):
+        return discord.Embed(
+            title=title,
+            description=description,
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+    def in_lockdown(self, guild_id: int) -> bool:
+        until = self.lockdowns.get(guild_id)
+        if until is not None and until <= time.monotonic():
+            del self.lockdowns[guild_id]
+            return False
+        return until is not None
+
+    # ────────────── FLOOD DE MENSAGENS ──────────────
+    # O caso comum é uma escrita no ring buffer; permissões e API só
+    # entram quando o limite estoura.
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None or message.author.bot:
+            return
+
+        key = (message.guild.id, message.author.id)
+        if not self.messages.hit(key):
+            return
+
+        member = message.author
+        if not isinstance(member, discord.Member) or member.guild_permissions.manage_messages:
+            return
+
+        # janela zerada: as próximas mensagens não disparam de novo
+        self.messages.forget(key)
+        if member.is_timed_out():
+            return
+
+        metrics.inc("antiflood:flood")
+        await auto_timeout(
+            self.bot,
+            member,
+            FLOOD_TIMEOUT_MINUTES,
+            title="Anti-flood",
+            reason=f"Flood: {FLOOD_MESSAGES} mensagens em {FLOOD_SECONDS:g}s em {message.channel.mention}"
+        )
+
+    # ────────────── RAID (ENTRADAS EM MASSA) ──────────────
+    # RAID_JOINS entradas em RAID_SECONDS ativam o lockdown: quem entrou
+    # na janela e quem entrar até o fim do lockdown leva timeout.
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if member.bot:
+            return
+
+        guild = member.guild
+        if self.in_lockdown(guild.id):
+            await auto_timeout(
+                self.bot, member, RAID_LOCKDOWN_MINUTES,
+                title="Anti-raid", reason="Entrada durante o lockdown anti-raid"
+            )
+            return
+
+        window = self.joins.get(guild.id)
+        if window is None:
+            window = self.joins[guild.id] = JoinWindow(RAID_JOINS)
+        if not window.join(member.id, time.monotonic(), RAID_SECONDS):
+            return
+
+        recent = window.recent()
+        window.reset()
+        metrics.inc("antiflood:raid")
+        await self.start_lockdown(
+            guild, None, RAID_LOCKDOWN_MINUTES,
+            f"📥 Gatilho: {RAID_JOINS} entradas em {RAID_SECONDS:g}s"
+        )
+
+        members = [m for m in map(guild.get_member, recent) if m is not None and not m.bot]
+        await run_bulk(
+            members,
+            lambda m: auto_timeout(
+                self.bot, m, RAID_LOCKDOWN_MINUTES,
+                title="Anti-raid", reason="Entrada em massa (raid)"
+            )
+        )
+
+    async def start_lockdown(self, guild: discord.Guild, author: discord.abc.User | None, minutes: int, trigger: str):
+        self.lockdowns[guild.id] = time.monotonic() + minutes * 60
+        until = int(time.time() + minutes * 60)
+
+        await log_action(
+            self.bot,
+            action="DEFAULT",
+            guild_id=guild.id,
+            author_id=author.id if author else self.bot.user.id,
+            embed=self.make_embed(
+                "🚨 Lockdown anti-raid ativado",
+                f"🛡️ Autor: {author.mention if author else f'{self.bot.user.mention} (automático)'}\n"
+                f"{trigger}\n"
+                f"⏱️ Até: <t:{until}:f> (<t:{until}:R>)",
+                0xE74C3C
+            )
+        )
+
+    # ────────────── LOCKDOWN MANUAL ──────────────
+    @app_commands.command(name="lockdown", description="Ativa ou encerra o lockdown anti-raid")
+    @app_commands.describe(ativo="Liga ou desliga o lockdown", minutos="Duração ao ligar")
+    async def lockdown(self, interaction: discord.Interaction, ativo: bool,
+                       minutos: app_commands.Range[int, 1, 1440] = RAID_LOCKDOWN_MINUTES):
+        if not interaction.user.guild_permissions.moderate_members:
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Permissão negada", "Você não pode alterar o lockdown.", 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        if ativo:
+            await interaction.response.send_message(
+                embed=self.make_embed("🚨 Lockdown ativado", f"⏱️ {minutos} minutos: novas entradas levam timeout.", 0xE74C3C),
+                ephemeral=True
+            )
+            await self.start_lockdown(interaction.guild, interaction.user, minutos, "📥 Gatilho: manual")
+            return
+
+        self.lockdowns.pop(interaction.guild_id, None)
+        await interaction.response.send_message(
+            embed=self.make_embed("✅ Lockdown encerrado", "Entradas voltaram ao normal.", 0x2ECC71),
+            ephemeral=True
+        )
+        await log_action(
+            self.bot,
+            action="DEFAULT",
+            guild_id=interaction.guild_id,
+            embed=self.make_embed(
+                "✅ Lockdown anti-raid encerrado",
+                f"🛡️ Autor: {interaction.user.mention}",
+                0x2ECC71
+            )
+        )
+
+async def setup(bot):
+    await bot.add_cog(AntiFlood(bot))
@@ -0,0 +1,59 @@
+import discord
+from discord.ext import commands
+from utils import metrics
+from utils.automod import AutomodRules
+from commands.moderation import auto_timeout
+
+class Automod(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # data/automod.json, recompilado sozinho quando o arquivo muda
+        self.rules = AutomodRules()
+        self._punishing: set[tuple[int, int]] = set()  # (guild, membro) com ação em andamento
+
+    # ────────────── FILTRO DE MENSAGENS ──────────────
+    # Caminho quente: checagens baratas primeiro, uma única regex depois.
+    # Só mensagens que casam geram chamadas à API.
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None or message.author.bot or not message.content:
+            return
+
+        hit = self.rules.check(message.content)
+        if hit is None:
+            return
+
+        member = message.author
+        if not isinstance(member, discord.Member) or member.guild_permissions.manage_messages:
+            return  # moderação não passa pelo filtro
+
+        kind, text = hit
+        metrics.inc(f"automod:{kind}")
+
+        key = (message.guild.id, member.id)
+        if key in self._punishing:
+            return
+        self._punishing.add(key)
+        try:
+            if self.rules.config["delete_message"]:
+                try:
+                    await message.delete()
+                except (discord.NotFound, discord.Forbidden):
+                    pass
+
+            # vários envios seguidos: um timeout só
+            if member.is_timed_out():
+                return
+
+            await auto_timeout(
+                self.bot,
+                member,
+                int(self.rules.config["timeout_minutes"]),
+                title="Automod",
+                reason=f"{'Link bloqueado' if kind == 'domain' else 'Palavra bloqueada'}: {text} em {message.channel.mention}"
+            )
+        finally:
+            self._punishing.discard(key)
+
+async def setup(bot):
+    await bot.add_cog(Automod(bot))
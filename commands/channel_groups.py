@@ -0,0 +1,132 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+from utils.logger import log_action
+from utils.broadcast import delete_group, get_group, group_choices, group_names, resolve_channels, set_group
+
+class ChannelGroups(commands.Cog):
+    grupo_canais = app_commands.Group(
+        name="grupo_canais",
+        description="Grupos de canais para /enviar_embed e /enviar_raw_v2"
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # ────────────── EMBED HELPER ──────────────
+    def make_embed(self, title: str, description: str, color: int):
+        return discord.Embed(
+            title=title,
+            description=description,
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+    # ────────────── PERMISSÃO ──────────────
+    async def check_permission(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.guild_permissions.manage_channels:
+            return True
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "❌ Permissão negada",
+                "Apenas quem gerencia canais pode alterar grupos.",
+                0xE74C3C
+            ),
+            ephemeral=True
+        )
+        return False
+
+    # ────────────── SALVAR ──────────────
+    @grupo_canais.command(name="salvar", description="Cria ou substitui um grupo de canais")
+    @app_commands.describe(
+        nome="Nome do grupo",
+        canais="Menções ou IDs dos canais",
+        categoria="Inclui todos os canais de texto da categoria"
+    )
+    async def salvar(
+        self,
+        interaction: discord.Interaction,
+        nome: str,
+        canais: str | None = None,
+        categoria: discord.CategoryChannel | None = None
+    ):
+        if not await self.check_permission(interaction):
+            return
+
+        try:
+            destinos = resolve_channels(interaction.guild, canais=canais, categoria=categoria)
+        except ValueError as e:
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Erro ao salvar grupo", str(e), 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        set_group(interaction.guild.id, nome, [ch.id for ch in destinos])
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "✅ Grupo salvo",
+                f"📁 **{nome}**: {len(destinos)} canais\n" + ", ".join(ch.mention for ch in destinos[:25]),
+                0x2ECC71
+            ),
+            ephemeral=True
+        )
+
+        await log_action(
+            self.bot,
+            action="DEFAULT",
+            guild_id=interaction.guild_id,
+            embed=self.make_embed(
+                "📁 Grupo de canais salvo",
+                f"🛡️ Autor: {interaction.user.mention}\n📁 Grupo: `{nome}`\n📢 Canais: {len(destinos)}",
+                0x3498DB
+            )
+        )
+
+    # ────────────── REMOVER ──────────────
+    @grupo_canais.command(name="remover", description="Remove um grupo de canais")
+    async def remover(self, interaction: discord.Interaction, nome: str):
+        if not await self.check_permission(interaction):
+            return
+
+        if not delete_group(interaction.guild.id, nome):
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Erro", f"Grupo `{nome}` não encontrado.", 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.send_message(
+            embed=self.make_embed("🗑️ Grupo removido", f"📁 `{nome}`", 0x95A5A6),
+            ephemeral=True
+        )
+
+    # ────────────── LISTAR ──────────────
+    @grupo_canais.command(name="listar", description="Lista os grupos de canais salvos")
+    async def listar(self, interaction: discord.Interaction):
+        linhas = []
+        for nome in group_names(interaction.guild.id):
+            ids = get_group(interaction.guild.id, nome) or []
+            mentions = ", ".join(f"<#{channel_id}>" for channel_id in ids[:10])
+            if len(ids) > 10:
+                mentions += f" e mais {len(ids) - 10}"
+            linhas.append(f"📁 **{nome}** ({len(ids)}): {mentions}")
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "📁 Grupos de canais",
+                "\n".join(linhas)[:4000] or "Nenhum grupo salvo.",
+                0x3498DB
+            ),
+            ephemeral=True
+        )
+
+    @remover.autocomplete("nome")
+    async def nome_autocomplete(self, interaction: discord.Interaction, current: str):
+        return group_choices(interaction.guild_id, current)
+
+async def setup(bot):
+    await bot.add_cog(ChannelGroups(bot))
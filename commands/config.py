@@ -0,0 +1,131 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+from typing import Literal
+from utils import guild_config
+from utils.logger import THREAD_NAMES, is_valid_webhook, log_action
+
+WebhookAction = Literal["DEFAULT", "Mute", "Mute (Apps)", "Unmute", "Kick", "Ban"]
+
+class GuildSettings(commands.Cog):
+    config = app_commands.Group(
+        name="config",
+        description="Configuração de logs desta guild"
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # ────────────── EMBED HELPER ──────────────
+    def make_embed(self, title: str, description: str, color: int):
+        return discord.Embed(
+            title=title,
+            description=description,
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+    # ────────────── PERMISSÃO ──────────────
+    async def check_permission(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.guild_permissions.administrator:
+            return True
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "❌ Permissão negada",
+                "Apenas administradores podem alterar a configuração.",
+                0xE74C3C
+            ),
+            ephemeral=True
+        )
+        return False
+
+    # ────────────── CANAL DE LOGS ──────────────
+    @config.command(name="canal_logs", description="Define o canal onde ficam as threads de log")
+    async def canal_logs(self, interaction: discord.Interaction, canal: discord.TextChannel):
+        if not await self.check_permission(interaction):
+            return
+
+        config = guild_config.get(interaction.guild_id)
+        config.log_channel_id = canal.id
+        config.threads.clear()  # threads do canal antigo não valem mais
+        config.save()
+
+        await interaction.response.send_message(
+            embed=self.make_embed("✅ Canal de logs definido", f"📋 {canal.mention}", 0x2ECC71),
+            ephemeral=True
+        )
+
+        await log_action(
+            self.bot,
+            action="DEFAULT",
+            guild_id=interaction.guild_id,
+            embed=self.make_embed(
+                "⚙️ Canal de logs alterado",
+                f"🛡️ Autor: {interaction.user.mention}\n📋 Canal: {canal.mention}",
+                0x3498DB
+            )
+        )
+
+    # ────────────── WEBHOOKS ──────────────
+    @config.command(name="webhook", description="Define (ou remove) o webhook de log de uma ação")
+    @app_commands.describe(acao="Ação registrada no webhook", url="URL do webhook (vazio remove)")
+    async def webhook(self, interaction: discord.Interaction, acao: WebhookAction, url: str | None = None):
+        if not await self.check_permission(interaction):
+            return
+
+        if url and not is_valid_webhook(url):
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Webhook inválido", "Use uma URL `https://discord.com/api/webhooks/...`.", 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        config = guild_config.get(interaction.guild_id)
+        if url:
+            config.webhooks[acao] = url
+        else:
+            config.webhooks.pop(acao, None)
+        config.save()
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "✅ Webhook atualizado" if url else "🗑️ Webhook removido",
+                f"🪝 Ação: `{acao}`",
+                0x2ECC71 if url else 0x95A5A6
+            ),
+            ephemeral=True
+        )
+
+    # ────────────── VER ──────────────
+    @config.command(name="ver", description="Mostra a configuração de logs desta guild")
+    async def ver(self, interaction: discord.Interaction):
+        if not await self.check_permission(interaction):
+            return
+
+        config = guild_config.get(interaction.guild_id)
+        canal = f"<#{config.log_channel_id}>" if config.log_channel_id else "não definido"
+        # o token do webhook nunca aparece: só o ID
+        webhooks = "\n".join(
+            f"• `{acao}` → `{url.split('/webhooks/', 1)[-1].split('/', 1)[0]}`"
+            for acao, url in sorted(config.webhooks.items())
+        ) or "nenhum"
+        threads = "\n".join(
+            f"• {nome} → <#{thread_id}>"
+            for nome, thread_id in config.threads.items()
+            if nome in THREAD_NAMES.values()
+        ) or "nenhuma"
+
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "⚙️ Configuração de logs",
+                f"📋 **Canal:** {canal}\n\n🪝 **Webhooks:**\n{webhooks}\n\n"
+                f"🧵 **Threads:**\n{threads}\n\n📁 **Grupos de canais:** {len(config.channel_groups)}",
+                0x3498DB
+            ),
+            ephemeral=True
+        )
+
+async def setup(bot):
+    await bot.add_cog(GuildSettings(bot))
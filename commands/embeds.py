@@ -1,13 +1,19 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
 from datetime import datetime
 from utils.logger import log_action  # ← ADIÇÃO
+from utils.templates import TemplateRegistry
+from utils.embed_pack import check_limits, describe_plan, pack
+from utils.broadcast import (
+    broadcast, check_broadcast_permission, format_results, group_choices, resolve_channels
+)
 
 class Embeds(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # arquivos de embeds/ já validados e montados em memória
+        self.templates = TemplateRegistry("embeds", self.build_embeds)
 
     # ────────────── EMBED HELPER (JÁ EXISTENTE) ──────────────
     def make_embed(self, title: str, description: str, color: int):
@@ -43,15 +49,17 @@ class Embeds(commands.Cog):
             if "fields" in embed and not isinstance(embed["fields"], list):
                 raise ValueError(f"`fields` do embed #{i} precisa ser uma lista")
 
-    def load_embeds(self, path):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def load_embeds(self, arquivo: str):
+        # mensagens já empacotadas; cópia das listas: o cache nunca é
+        # alterado por quem envia
+        return [list(message) for message in self.templates.get(arquivo)]
 
+    def build_embeds(self, data: dict):
         # ────────────── VALIDAÇÃO (ADIÇÃO) ──────────────
         self.validate_embed_json(data)
 
         embeds = []
-        for e in data.get("embeds", []):
+        for i, e in enumerate(data.get("embeds", []), start=1):
             embed = discord.Embed(
                 title=e.get("title"),
                 description=e.get("description"),
@@ -68,50 +76,42 @@ class Embeds(commands.Cog):
             if "footer" in e:
                 embed.set_footer(text=e["footer"].get("text"))
 
+            check_limits(i, embed)
             embeds.append(embed)
 
         if not embeds:
             raise ValueError("Nenhum embed válido")
 
-        return embeds
+        # ────────────── EMPACOTAMENTO (LIMITES DO DISCORD) ──────────────
+        # até 10 embeds / 6000 caracteres por mensagem, fields divididos
+        # em blocos de 25: calculado uma vez, junto com a validação
+        return pack(embeds)
 
     # ────────────── SLASH COMMAND ──────────────
     @app_commands.command(name="enviar_embed", description="Envia embed do Discohook")
+    @app_commands.describe(
+        arquivo="Arquivo em embeds/",
+        canal="Canal de destino",
+        canais="Vários canais (menções ou IDs)",
+        categoria="Todos os canais de texto da categoria",
+        grupo="Grupo de canais salvo (/grupo_canais)"
+    )
     async def enviar_embed(
         self,
         interaction: discord.Interaction,
-        canal: discord.TextChannel,
-        arquivo: str
+        arquivo: str,
+        canal: discord.TextChannel | None = None,
+        canais: str | None = None,
+        categoria: discord.CategoryChannel | None = None,
+        grupo: str | None = None
     ):
         try:
-            embeds = self.load_embeds(f"embeds/{arquivo}.json")
-            await canal.send(embeds=embeds)
-
-            await interaction.response.send_message(
-                embed=self.make_embed(
-                    "✅ Embed enviado",
-                    f"Os embeds do arquivo `{arquivo}.json` foram enviados em {canal.mention}.",
-                    0x2ECC71
-                ),
-                ephemeral=True
-            )
-
-            # ────────────── LOG SUCESSO (ADIÇÃO) ──────────────
-            await log_action(
-                self.bot,
-                action="EMBED",
-                embed=discord.Embed(
-                    title="📨 Embed enviado",
-                    description=(
-                        f"📄 Arquivo: `{arquivo}.json`\n"
-                        f"📢 Canal: {canal.mention}\n"
-                        f"🛡️ Autor: {interaction.user.mention}\n"
-                        f"🧩 Quantidade: {len(embeds)} embeds"
-                    ),
-                    color=0x2ECC71,
-                    timestamp=datetime.utcnow()
-                )
+            # arquivo carregado/validado/empacotado uma vez para todos os canais
+            messages = self.load_embeds(arquivo)
+            destinos = resolve_channels(
+                interaction.guild, canal=canal, canais=canais, categoria=categoria, grupo=grupo
             )
+            check_broadcast_permission(interaction.user, destinos, categoria=categoria, grupo=grupo)
 
         except Exception as e:
             await interaction.response.send_message(
@@ -127,11 +127,11 @@ class Embeds(commands.Cog):
             await log_action(
                 self.bot,
                 action="EMBED",
+                guild_id=interaction.guild_id,
                 embed=discord.Embed(
                     title="❌ Erro ao enviar embed",
                     description=(
                         f"📄 Arquivo: `{arquivo}.json`\n"
-                        f"📢 Canal: {canal.mention}\n"
                         f"🛡️ Autor: {interaction.user.mention}\n\n"
                         f"🧨 Erro:\n```{e}```"
                     ),
@@ -139,6 +139,63 @@ class Embeds(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
             )
+            return
+
+        plan = describe_plan(messages)
+        total = sum(len(message) for message in messages)
+
+        # plano mostrado antes do primeiro envio
+        await interaction.response.send_message(
+            embed=self.make_embed(
+                "⏳ Enviando embed",
+                f"📄 Arquivo: `{arquivo}.json`\n📢 Canais: {len(destinos)}\n{plan}",
+                0x3498DB
+            ),
+            ephemeral=True
+        )
+
+        async def send(ch):
+            # mensagens em ordem dentro do canal; canais em paralelo
+            for message in messages:
+                await ch.send(embeds=message)
+
+        ok, failed = await broadcast(destinos, send, cost=len(messages))
+        results = format_results(ok, failed)
+        color = 0x2ECC71 if not failed else 0xE67E22 if ok else 0xE74C3C
+
+        await interaction.edit_original_response(
+            embed=self.make_embed(
+                "✅ Embed enviado" if ok else "❌ Erro ao enviar embed",
+                f"📄 Arquivo: `{arquivo}.json`\n{plan}\n{results}",
+                color
+            )
+        )
+
+        # ────────────── LOG (UMA ENTRADA POR ENVIO) ──────────────
+        await log_action(
+            self.bot,
+            action="EMBED",
+            guild_id=interaction.guild_id,
+            embed=discord.Embed(
+                title="📨 Embed enviado" if ok else "❌ Erro ao enviar embed",
+                description=(
+                    f"📄 Arquivo: `{arquivo}.json`\n"
+                    f"🛡️ Autor: {interaction.user.mention}\n"
+                    f"🧩 Quantidade: {total} embeds em {len(messages)} mensagem(ns)\n"
+                    f"{results}"
+                ),
+                color=color,
+                timestamp=datetime.utcnow()
+            )
+        )
+
+    @enviar_embed.autocomplete("arquivo")
+    async def arquivo_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self.templates.autocomplete(current)
+
+    @enviar_embed.autocomplete("grupo")
+    async def grupo_autocomplete(self, interaction: discord.Interaction, current: str):
+        return group_choices(interaction.guild_id, current)
 
 async def setup(bot):
     await bot.add_cog(Embeds(bot))
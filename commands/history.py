@@ -0,0 +1,262 @@
+import asyncio
+import discord
+from discord import app_commands
+from discord.ext import commands
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from typing import Literal
+from utils import guild_config, history
+from utils.logger import LOG_FILE, THREAD_NAMES, find_thread
+
+PAGE_SIZE = 10
+BACKFILL_BATCH = 500
+
+# nome da thread → ação (primeira ação que usa a thread)
+THREAD_ACTIONS = {}
+for _action, _name in THREAD_NAMES.items():
+    THREAD_ACTIONS.setdefault(_name, _action)
+
+def make_embed(title: str, description: str, color: int):
+    return discord.Embed(
+        title=title,
+        description=description,
+        color=color,
+        timestamp=datetime.utcnow()
+    )
+
+def format_event(event: dict) -> str:
+    resumo = " · ".join(line.strip() for line in (event["description"] or "").splitlines() if line.strip())
+    if len(resumo) > 160:
+        resumo = resumo[:157] + "..."
+    autor = f" • 🛡️ <@{event['author_id']}>" if event["author_id"] else ""
+    return (
+        f"<t:{int(event['created_at'])}:f> **{event['action']}** — {event['title'] or 'sem título'}{autor}\n"
+        f"{resumo}"
+    )
+
+# ID estável pelo conteúdo (não pelo número da linha): depois de rotacionar
+# ou truncar o arquivo, linhas novas não colidem com as já importadas.
+def file_event_id(entry: dict) -> str:
+    key = json.dumps(
+        [entry.get("logged_at"), entry.get("guild_id"), entry.get("action"), entry.get("embed")],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+# ────────────── PAGINAÇÃO ──────────────
+# `fetch(offset)` → (eventos, total); cada clique consulta o índice de novo.
+class HistoryPages(discord.ui.View):
+    def __init__(self, owner_id: int, title: str, fetch):
+        super().__init__(timeout=300)
+        self.owner_id = owner_id
+        self.title = title
+        self.fetch = fetch
+        self.page = 0
+        self.pages = 1
+
+    def render(self) -> discord.Embed:
+        start = time.perf_counter()
+        events, total = self.fetch(self.page * PAGE_SIZE)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.pages = max(1, -(-total // PAGE_SIZE))
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= self.pages - 1
+
+        embed = make_embed(
+            self.title,
+            "\n\n".join(format_event(event) for event in events) or "Nenhum registro encontrado.",
+            0x3498DB
+        )
+        embed.set_footer(text=f"Página {self.page + 1}/{self.pages} • {total} registros • {elapsed:.1f} ms")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.owner_id
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.pages - 1, self.page + 1)
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+class History(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def check_permission(self, interaction: discord.Interaction, permission: str) -> bool:
+        if getattr(interaction.user.guild_permissions, permission):
+            return True
+
+        await interaction.response.send_message(
+            embed=make_embed("❌ Permissão negada", "Você não pode consultar o histórico.", 0xE74C3C),
+            ephemeral=True
+        )
+        return False
+
+    # ────────────── HISTÓRICO DE UM MEMBRO ──────────────
+    @app_commands.command(name="historico", description="Histórico de moderação de um membro")
+    async def historico(self, interaction: discord.Interaction, membro: discord.User):
+        if not await self.check_permission(interaction, "moderate_members"):
+            return
+
+        view = HistoryPages(
+            interaction.user.id,
+            f"📚 Histórico de {membro}",
+            lambda offset: history.by_target(interaction.guild_id, membro.id, limit=PAGE_SIZE, offset=offset)
+        )
+        await interaction.response.send_message(embed=view.render(), view=view, ephemeral=True)
+
+    # ────────────── BUSCA NOS LOGS ──────────────
+    @app_commands.command(name="logs", description="Busca nos logs de moderação")
+    @app_commands.describe(
+        busca="Palavras no título/descrição (ex.: spam, nome do membro)",
+        acao="Filtra por ação",
+        autor="Filtra por quem executou"
+    )
+    async def logs(self, interaction: discord.Interaction, busca: str | None = None,
+                   acao: str | None = None, autor: discord.User | None = None):
+        if not await self.check_permission(interaction, "moderate_members"):
+            return
+
+        view = HistoryPages(
+            interaction.user.id,
+            f"🔎 Logs{f': {busca}' if busca else ''}",
+            lambda offset: history.search(
+                interaction.guild_id, busca,
+                action=acao,
+                author_id=autor.id if autor else None,
+                limit=PAGE_SIZE,
+                offset=offset
+            )
+        )
+        await interaction.response.send_message(embed=view.render(), view=view, ephemeral=True)
+
+    @logs.autocomplete("acao")
+    async def acao_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=action, value=action)
+            for action in history.actions(interaction.guild_id)
+            if current in action.lower()
+        ][:25]
+
+    # ────────────── BACKFILL (THREADS E ARQUIVO ANTIGOS) ──────────────
+    # Importa só o que é anterior ao primeiro registro ao vivo: o que veio
+    # depois já está no índice. Reexecutar não duplica (event_id fixo).
+    # Uma fonte por vez: com os dois sinks ativos, thread e arquivo têm os
+    # mesmos eventos.
+    @app_commands.command(name="logs_importar", description="Importa logs antigos para o histórico")
+    @app_commands.describe(fonte="threads: threads de log do canal • arquivo: data/logs.jsonl")
+    async def logs_importar(self, interaction: discord.Interaction, fonte: Literal["threads", "arquivo"] = "threads"):
+        if not await self.check_permission(interaction, "administrator"):
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guild_id = interaction.guild_id
+        cutoff = history.oldest_live(guild_id)
+        imported = 0
+        batch = []
+
+        def flush():
+            nonlocal imported
+            imported += history.record_many(batch)
+            batch.clear()
+
+        if fonte == "threads":
+            sources = await self.backfill_threads(interaction, cutoff, batch, flush)
+        else:
+            # leitura do arquivo + gravação em lotes: fora do event loop
+            sources = await asyncio.to_thread(self.backfill_file, guild_id, cutoff, batch, flush)
+
+        await asyncio.to_thread(flush)
+        await interaction.edit_original_response(
+            embed=make_embed(
+                "✅ Importação concluída",
+                f"📂 Fonte: **{fonte}** ({sources} lidas)\n📥 Registros novos: **{imported}**",
+                0x2ECC71
+            )
+        )
+
+    async def backfill_threads(self, interaction: discord.Interaction, cutoff: float | None, batch: list, flush) -> int:
+        guild_id = interaction.guild_id
+        before = datetime.fromtimestamp(cutoff, timezone.utc) if cutoff else None
+
+        channel_id = guild_config.get(guild_id).log_channel_id
+        if channel_id is None:
+            return 0
+
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        threads = []
+        for thread_name, action in THREAD_ACTIONS.items():
+            thread = await find_thread(channel, thread_name)
+            if thread is not None:
+                threads.append((thread, action))
+
+        for thread, action in threads:
+            async for message in thread.history(limit=None, before=before, oldest_first=True):
+                for index, embed in enumerate(message.embeds):
+                    author_id, target_ids = history.extract_ids(embed.description)
+                    batch.append({
+                        "event_id": f"msg:{message.id}:{index}",
+                        "guild_id": guild_id,
+                        "action": action,
+                        "author_id": author_id,
+                        "target_ids": target_ids,
+                        "title": embed.title,
+                        "description": embed.description,
+                        "created_at": (embed.timestamp or message.created_at).timestamp(),
+                    })
+                if len(batch) >= BACKFILL_BATCH:
+                    await asyncio.to_thread(flush)  # transação + FTS fora do event loop
+
+            await interaction.edit_original_response(
+                embed=make_embed("⏳ Importando logs", f"🧵 {thread.name}", 0x3498DB)
+            )
+
+        return len(threads)
+
+    def backfill_file(self, guild_id: int, cutoff: float | None, batch: list, flush) -> int:
+        lines = 0
+        try:
+            with open(LOG_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # linhas antigas não têm guild_id: eram todas da guild principal
+                    if entry.get("guild_id", guild_config.PRIMARY_GUILD_ID) != guild_id:
+                        continue
+                    # logged_at é utcnow() sem fuso
+                    created_at = datetime.fromisoformat(entry["logged_at"]).replace(tzinfo=timezone.utc).timestamp()
+                    if cutoff and created_at >= cutoff:
+                        continue
+                    embed = entry.get("embed", {})
+                    author_id, target_ids = history.extract_ids(embed.get("description"))
+                    batch.append({
+                        "event_id": f"file:{file_event_id(entry)}",
+                        "guild_id": guild_id,
+                        "action": entry.get("action", "DEFAULT"),
+                        "author_id": author_id,
+                        "target_ids": target_ids,
+                        "title": embed.get("title"),
+                        "description": embed.get("description"),
+                        "created_at": created_at,
+                    })
+                    if len(batch) >= BACKFILL_BATCH:
+                        flush()
+        except FileNotFoundError:
+            pass
+
+        return lines
+
+async def setup(bot):
+    await bot.add_cog(History(bot))
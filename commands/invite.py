@@ -1,35 +1,58 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+import time
+from collections import deque
+from datetime import datetime
 from utils.logger import log_action
+from utils import invites_store, metrics
+from utils.warmup import warm_up
+from utils.extensions import take_state
+from utils.sharding import owned_shards
 from typing import Literal
 
-INVITE_FILE = "invites.json"
-LOG_CHANNEL_ID = 1468183917562433618
-
-def load_invites():
-    try:
-        with open(INVITE_FILE, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                return {}
-            data = json.loads(content)
-        if isinstance(data, list):
-            data = {}
-        return data
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-def save_invites(data):
-    with open(INVITE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
 class InviteManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.guild_invites_cache = {}  # Cache de invites por guild
+        self.guild_invites_cache = {}  # Cache de invites por guild: code → (uses, max_uses)
+        self._recently_deleted = {}    # guild_id → deque[(deleted_at, code, uses, max_uses)]
+        self._join_locks = {}          # guild_id → asyncio.Lock (diffs em ordem)
+        self._warmed_up = False
+
+        # min-heap (expires_at, code): o sweeper dorme até o próximo prazo
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._expiry_wakeup = asyncio.Event()
+        self._sweeper: asyncio.Task | None = None
+
+    # ────────────── HAND-OFF NO /reload ──────────────
+    # Cache de invites já aquecido: sem isso, o cog recarregado não veria
+    # o on_ready de novo e atribuiria entradas sem o "antes".
+    def export_state(self) -> dict:
+        return {
+            "guild_invites_cache": self.guild_invites_cache,
+            "recently_deleted": self._recently_deleted,
+            "join_locks": self._join_locks,
+            "warmed_up": self._warmed_up,
+        }
+
+    async def cog_load(self):
+        state = take_state(self.qualified_name)
+        if state is not None:
+            self.guild_invites_cache = state["guild_invites_cache"]
+            self._recently_deleted = state["recently_deleted"]
+            self._join_locks = state["join_locks"]
+            self._warmed_up = state["warmed_up"]
+
+        # com vários processos, só os invites das guilds deste processo
+        self._expiry_heap = invites_store.expiry_schedule(owned_shards(self.bot))
+        heapq.heapify(self._expiry_heap)
+        self._sweeper = asyncio.create_task(self.expiry_sweeper())
+
+    async def cog_unload(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
 
     def make_embed(self, title: str, description: str, color: int):
         return discord.Embed(
@@ -85,15 +108,18 @@ class InviteManager(commands.Cog):
             reason=f"Convite criado por {interaction.user}"
         )
 
-        data = load_invites()
-        data[invite.code] = {
-            "expires_at": str(datetime.utcnow() + timedelta(seconds=expire_map[expiracao])),
+        expires_at = time.time() + expire_map[expiracao]
+        invites_store.add_invite({
+            "code": invite.code,
+            "guild_id": interaction.guild.id,
+            "channel_id": interaction.channel.id,
+            "inviter_id": interaction.user.id,
+            "expires_at": expires_at,
             "max_uses": usos
-        }
-        save_invites(data)
+        })
+        self.schedule_expiry(invite.code, expires_at)
 
-        # Atualiza cache de invites
-        await self.update_invite_cache(interaction.guild)
+        # o cache é atualizado por on_invite_create, sem refetch
 
         # ───────── VIEW COM BOTÕES ─────────
         view = discord.ui.View()
@@ -102,10 +128,7 @@ class InviteManager(commands.Cog):
         async def remove_callback(i: discord.Interaction):
             try:
                 await invite.delete()
-                data = load_invites()
-                if invite.code in data:
-                    del data[invite.code]
-                    save_invites(data)
+                invites_store.remove_invite(invite.code)
 
                 await i.response.send_message(embed=self.make_embed(
                     "✅ Invite removido",
@@ -116,6 +139,7 @@ class InviteManager(commands.Cog):
                 await log_action(
                     self.bot,
                     action="Invite",
+                    guild_id=i.guild_id,
                     embed=self.make_embed(
                         "❌ Invite removido",
                         f"👤 Autor: {i.user.mention}\n🔗 Invite: {invite.code}",
@@ -142,6 +166,7 @@ class InviteManager(commands.Cog):
         await log_action(
             self.bot,
             action="Invite",
+            guild_id=interaction.guild_id,
             embed=self.make_embed(
                 "📢 Invite criado",
                 f"👤 Autor: {interaction.user.mention}\n🔗 Invite: {invite.code}\n⏱ Expira: {expiracao}\n👥 Máx usos: {usos}",
@@ -152,7 +177,7 @@ class InviteManager(commands.Cog):
     # ─────────────── LISTAR CONVITES ───────────────
     @app_commands.command(name="convite_listar", description="Lista todos os convites criados")
     async def list_invites(self, interaction: discord.Interaction):
-        data = load_invites()
+        data = invites_store.list_invites(interaction.guild.id)
         if not data:
             await interaction.response.send_message(embed=self.make_embed(
                 "📋 Convites",
@@ -161,11 +186,14 @@ class InviteManager(commands.Cog):
             ), ephemeral=True)
             return
 
+        joins = invites_store.join_counts(interaction.guild.id)
+
         embed = discord.Embed(title="📋 Convites salvos", color=0x3498DB, timestamp=datetime.utcnow())
-        for code, info in data.items():
+        for info in data[:25]:  # limite de fields por embed
+            expires = f"<t:{int(info['expires_at'])}:f>" if info["expires_at"] else "Nunca"
             embed.add_field(
-                name=f"Invite: {code}",
-                value=f"Expira em: {info['expires_at']}\nMáx usos: {info['max_uses']}",
+                name=f"Invite: {info['code']}",
+                value=f"Expira em: {expires}\nMáx usos: {info['max_uses']}\nEntradas: {joins.get(info['code'], 0)}",
                 inline=False
             )
 
@@ -174,6 +202,7 @@ class InviteManager(commands.Cog):
         await log_action(
             self.bot,
             action="Invite",
+            guild_id=interaction.guild_id,
             embed=self.make_embed(
                 "📋 Convites listados",
                 f"👤 Autor: {interaction.user.mention}\nTotal convites: {len(data)}",
@@ -181,20 +210,196 @@ class InviteManager(commands.Cog):
             )
         )
 
+    # ─────────────── EXPIRAÇÃO AUTOMÁTICA ───────────────
+    def schedule_expiry(self, code: str, expires_at: float):
+        heapq.heappush(self._expiry_heap, (expires_at, code))
+        if self._expiry_heap[0] == (expires_at, code):
+            self._expiry_wakeup.set()  # novo prazo mais próximo: reagenda
+
+    async def expiry_sweeper(self):
+        await self.bot.wait_until_ready()
+
+        while True:
+            self._expiry_wakeup.clear()
+            timeout = self._expiry_heap[0][0] - time.time() if self._expiry_heap else None
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._expiry_wakeup.wait(), timeout)
+                    continue  # acordado por schedule_expiry: recalcula o prazo
+                except asyncio.TimeoutError:
+                    pass
+
+            try:
+                await self.sweep_expired()
+            except Exception as e:
+                print(f"⚠️ Falha ao limpar invites expirados: {e!r}")
+
+    async def sweep_expired(self):
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            heapq.heappop(self._expiry_heap)
+
+        shards = owned_shards(self.bot)
+        removed = invites_store.pop_expired(now, shards=shards)
+
+        # entradas órfãs (invites removidos pelo botão) não crescem sem limite
+        if len(self._expiry_heap) > 2 * invites_store.count_invites() + 64:
+            self._expiry_heap = invites_store.expiry_schedule(shards)
+            heapq.heapify(self._expiry_heap)
+
+        if not removed:
+            return
+
+        for info in removed:
+            cache = self.guild_invites_cache.get(info["guild_id"])
+            if cache is not None:
+                cache.pop(info["code"], None)
+
+        # um log por guild, no canal de logs de cada uma
+        by_guild: dict[int, list[str]] = {}
+        for info in removed:
+            by_guild.setdefault(info["guild_id"], []).append(info["code"])
+
+        for guild_id, guild_codes in by_guild.items():
+            codes = ", ".join(f"`{code}`" for code in guild_codes[:30])
+            if len(guild_codes) > 30:
+                codes += f" e mais {len(guild_codes) - 30}"
+
+            await log_action(
+                self.bot,
+                action="Invite",
+                guild_id=guild_id,
+                embed=self.make_embed(
+                    "⌛ Invites expirados",
+                    f"🧹 Removidos: {len(guild_codes)}\n🔗 {codes}",
+                    0x95A5A6
+                )
+            )
+
     # ─────────────── CACHE DE INVITES ───────────────
     async def update_invite_cache(self, guild: discord.Guild):
+        metrics.inc("invite_cache:full_fetch")
         try:
             invites = await guild.invites()
-            self.guild_invites_cache[guild.id] = {invite.code: invite.uses for invite in invites}
+            self.guild_invites_cache[guild.id] = {
+                invite.code: (invite.uses or 0, invite.max_uses or 0)
+                for invite in invites
+            }
         except Exception:
             self.guild_invites_cache[guild.id] = {}
 
     @commands.Cog.listener()
     async def on_ready(self):
-        for guild in self.bot.guilds:
-            await self.update_invite_cache(guild)
+        # reconexões não refazem o warm-up: os eventos mantêm o cache
+        if self._warmed_up:
+            return
+        self._warmed_up = True
+
+        await warm_up("cache de invites", [
+            (guild.id, lambda guild=guild: self.update_invite_cache(guild))
+            for guild in self.bot.guilds
+        ])
+
+    # ─────────────── CACHE INCREMENTAL (EVENTOS) ───────────────
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite: discord.Invite):
+        if invite.guild is None:
+            return
+        cache = self.guild_invites_cache.setdefault(invite.guild.id, {})
+        cache[invite.code] = (invite.uses or 0, invite.max_uses or 0)
+        metrics.inc("invite_cache:create")
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite: discord.Invite):
+        if invite.guild is None:
+            return
+
+        cache = self.guild_invites_cache.get(invite.guild.id, {})
+        uses, max_uses = cache.pop(invite.code, (0, 0))
+        metrics.inc("invite_cache:delete")
+
+        # invites de uso único somem antes do on_member_join chegar
+        deleted = self._recently_deleted.setdefault(invite.guild.id, deque(maxlen=50))
+        deleted.append((time.time(), invite.code, uses, max_uses))
+
+        invites_store.remove_invite(invite.code)
+
+    # ─────────────── ATRIBUIÇÃO DE ENTRADAS ───────────────
+    def _diff_uses(self, guild_id: int, current: dict) -> list[str]:
+        before = self.guild_invites_cache.get(guild_id, {})
+        used = [
+            code
+            for code, (uses, _) in current.items()
+            if uses > before.get(code, (0, 0))[0]
+        ]
+        if used:
+            return used
+
+        # nenhum uso novo: o invite pode ter sido apagado ao bater max_uses
+        deleted = self._recently_deleted.get(guild_id)
+        if not deleted:
+            return []
+
+        cutoff = time.time() - 30
+        candidates = [
+            entry
+            for entry in deleted
+            if entry[0] >= cutoff and entry[3] and entry[2] + 1 >= entry[3]
+        ]
+        if len(candidates) == 1:
+            deleted.remove(candidates[0])  # cada uso só é atribuído uma vez
+        return [entry[1] for entry in candidates]
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        guild = member.guild
+        lock = self._join_locks.setdefault(guild.id, asyncio.Lock())
+
+        async with lock:
+            # o gateway não envia os usos: um único fetch serve de snapshot
+            # para o diff e já substitui o cache da guild
+            try:
+                invites = await guild.invites()
+            except Exception:
+                return
+
+            current = {
+                invite.code: (invite.uses or 0, invite.max_uses or 0)
+                for invite in invites
+            }
+            used = self._diff_uses(guild.id, current)
+            self.guild_invites_cache[guild.id] = current
+
+            code = used[0] if len(used) == 1 else None
+            metrics.inc(
+                "invite_join:attributed" if code
+                else "invite_join:ambiguous" if used
+                else "invite_join:unknown"
+            )
+
+        invites_store.record_join(
+            guild.id,
+            member.id,
+            code,
+            time.time(),
+            ambiguous=len(used) > 1
+        )
+
+        if code is None:
+            return
+
+        await log_action(
+            self.bot,
+            action="Invite",
+            guild_id=member.guild.id,
+            embed=self.make_embed(
+                "📥 Entrada via convite",
+                f"👤 Membro: {member.mention}\n🔗 Invite: {code}",
+                0x3498DB
+            )
+        )
 
 async def setup(bot):
     cog = InviteManager(bot)
     await bot.add_cog(cog)
-    await bot.tree.sync()
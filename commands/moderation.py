@@ -1,8 +1,12 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
+import time
 from datetime import timedelta, datetime
 from utils.logger import log_action
+from utils.bulk import RateLimiter, run_bulk, parse_ids
+from utils import metrics
 
 COLOR_MUTE = 0xF1C40F
 COLOR_KICK = 0xE67E22
@@ -10,6 +14,9 @@ COLOR_BAN = 0xC0392B
 COLOR_UNMUTE = 0x2ECC71
 COLOR_ERROR = 0xE74C3C
 
+BULK_MAX = 1000           # membros por comando em massa
+BULK_BAN_CHUNK = 200      # limite do endpoint de bulk ban
+
 def footer_info(user: discord.Member):
     return f"ID: {user.id} • {datetime.utcnow().strftime('%d/%m/%Y %H:%M UTC')}"
 
@@ -25,14 +32,117 @@ async def send_dm_embed(user, embed):
     except discord.Forbidden:
         pass
 
-async def log_embed(bot, action, title, description, color):
+async def log_embed(bot, action, title, description, color, *, guild_id=None, author_id=None, target_ids=None):
     embed = discord.Embed(
         title=f"📋 {title}",
         description=description,
         color=color,
         timestamp=datetime.utcnow()
     )
-    await log_action(bot, action=action, embed=embed)
+    await log_action(
+        bot,
+        action=action,
+        embed=embed,
+        guild_id=guild_id,
+        author_id=author_id,
+        target_ids=target_ids
+    )
+
+# ────────────── PIPELINE DE AÇÃO ──────────────
+# defer imediato → (DM antes, só se a ação tira o membro da guild) → ação
+# → resposta + DM + log em paralelo. Cada etapa tem timeout próprio e a
+# latência/falhas vão para utils.metrics (Prometheus e /stats).
+STEP_TIMEOUTS = {
+    "defer": 2.5,
+    "dm": 3.0,
+    "action": 10.0,
+    "respond": 5.0,
+    "log": 2.0,
+}
+
+async def timed_step(step: str, coro):
+    start = time.perf_counter()
+    failed = True
+    try:
+        result = await asyncio.wait_for(coro, STEP_TIMEOUTS[step])
+        failed = False
+        return result
+    finally:
+        metrics.observe_step(step, time.perf_counter() - start, failed)
+
+async def run_action(interaction: discord.Interaction, *, action, response: discord.Embed,
+                     target: discord.abc.User | None = None, dm: tuple | None = None,
+                     dm_first: bool = False, log: tuple | None = None):
+    # dm  = (membro, embed)
+    # log = (ação, título, descrição, cor); `target` indexa o histórico
+    try:
+        await timed_step("defer", interaction.response.defer(ephemeral=True, thinking=True))
+    except Exception:
+        action.close()  # a ação nunca chegou a rodar
+        raise
+
+    async def send_dm():
+        if dm is not None:
+            await timed_step("dm", send_dm_embed(*dm))
+
+    if dm_first:
+        try:
+            await send_dm()
+        except Exception:
+            pass  # DM nunca impede a ação
+
+    try:
+        await timed_step("action", action)
+    except Exception as e:
+        await interaction.edit_original_response(
+            embed=make_embed("❌ Erro", f"Não foi possível aplicar a ação.\n```{e!r}```", COLOR_ERROR)
+        )
+        return
+
+    steps = [timed_step("respond", interaction.edit_original_response(embed=response))]
+    if not dm_first:
+        steps.append(send_dm())
+    if log is not None:
+        steps.append(timed_step("log", log_embed(
+            interaction.client, *log,
+            guild_id=interaction.guild_id,
+            author_id=interaction.user.id,
+            target_ids=[target.id] if target is not None else None
+        )))
+
+    await asyncio.gather(*steps, return_exceptions=True)
+
+# ────────────── AÇÃO AUTOMÁTICA (SEM INTERAÇÃO) ──────────────
+# Mesmo caminho do /mute para o automod: timeout → DM + log em paralelo,
+# com as mesmas etapas cronometradas. O autor do log é o próprio bot.
+async def auto_timeout(bot, member: discord.Member, minutes: int, *, title: str, reason: str) -> bool:
+    try:
+        await timed_step("action", member.timeout(timedelta(minutes=minutes), reason=reason))
+    except Exception as e:
+        print(f"⚠️ Timeout automático falhou para {member.id}: {e!r}")
+        return False
+
+    await asyncio.gather(
+        timed_step("dm", send_dm_embed(member, make_embed(
+            "🔇 Você foi mutado",
+            f"Duração: **{minutes} minutos**\nMotivo: {reason}",
+            COLOR_MUTE,
+            member
+        ))),
+        timed_step("log", log_embed(
+            bot,
+            "Mute",
+            title,
+            f"👤 Alvo: {member.mention}\n🛡️ Autor: {bot.user.mention} (automático)\n"
+            f"⏱️ Duração: {minutes} minutos\n📄 Motivo: {reason}",
+            COLOR_MUTE,
+            guild_id=member.guild.id,
+            author_id=bot.user.id,
+            target_ids=[member.id]
+        )),
+        return_exceptions=True
+    )
+    return True
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
@@ -48,38 +158,32 @@ class Moderation(commands.Cog):
             )
             return
 
-        await send_dm_embed(
-            membro,
-            make_embed(
+        await run_action(
+            interaction,
+            action=membro.timeout(timedelta(minutes=minutos)),
+            target=membro,
+            response=make_embed(
+                "🔇 Mute aplicado",
+                f"{membro.mention} mutado por **{minutos} minutos**.",
+                COLOR_MUTE,
+                membro
+            ),
+            dm=(membro, make_embed(
                 "🔇 Você foi mutado",
                 f"Servidor: **{interaction.guild.name}**\n"
                 f"Duração: **{minutos} minutos**\n"
                 f"Moderador: {interaction.user.mention}",
                 COLOR_MUTE,
                 membro
+            )),
+            log=(
+                "Mute",
+                "Mute aplicado",
+                f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}\n⏱️ Duração: {minutos} minutos",
+                COLOR_MUTE
             )
         )
 
-        await membro.timeout(timedelta(minutes=minutos))
-
-        await interaction.response.send_message(
-            embed=make_embed(
-                "🔇 Mute aplicado",
-                f"{membro.mention} mutado por **{minutos} minutos**.",
-                COLOR_MUTE,
-                membro
-            ),
-            ephemeral=True
-        )
-
-        await log_embed(
-            self.bot,
-            "Mute",
-            "Mute aplicado",
-            f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}\n⏱️ Duração: {minutos} minutos",
-            COLOR_MUTE
-        )
-
     # ────────────── UNMUTE (CORRIGIDO) ──────────────
     @app_commands.command(name="unmute")
     async def unmute(self, interaction: discord.Interaction, membro: discord.Member):
@@ -90,122 +194,354 @@ class Moderation(commands.Cog):
             )
             return
 
-        # ✅ DM ANTES de remover o timeout
-        await send_dm_embed(
-            membro,
-            make_embed(
+        # remover o timeout não tira o membro da guild: DM e log em paralelo
+        await run_action(
+            interaction,
+            action=membro.timeout(None),
+            target=membro,
+            response=make_embed(
+                "🔊 Unmute",
+                f"{membro.mention} desmutado.",
+                COLOR_UNMUTE,
+                membro
+            ),
+            dm=(membro, make_embed(
                 "🔊 Mute removido",
                 f"Servidor: **{interaction.guild.name}**\n"
                 f"Moderador: {interaction.user.mention}",
                 COLOR_UNMUTE,
                 membro
+            )),
+            log=(
+                "Unmute",
+                "Mute removido",
+                f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}",
+                COLOR_UNMUTE
             )
         )
 
-        await membro.timeout(None)
-
-        await interaction.response.send_message(
-            embed=make_embed(
-                "🔊 Unmute",
-                f"{membro.mention} desmutado.",
-                COLOR_UNMUTE,
-                membro
-            ),
-            ephemeral=True
-        )
-
-        await log_embed(
-            self.bot,
-            "Unmute",
-            "Mute removido",
-            f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}",
-            COLOR_UNMUTE
-        )
-
     # ────────────── KICK ──────────────
     @app_commands.command(name="kick")
     async def kick(self, interaction: discord.Interaction, membro: discord.Member, motivo: str = "Sem motivo"):
-        await send_dm_embed(
-            membro,
-            make_embed(
+        # DM antes: depois do kick o membro pode não ser alcançável
+        await run_action(
+            interaction,
+            action=membro.kick(reason=motivo),
+            target=membro,
+            response=make_embed("👢 Kick", f"{membro} expulso.", COLOR_KICK, membro),
+            dm=(membro, make_embed(
                 "👢 Você foi expulso",
                 f"Servidor: **{interaction.guild.name}**\nMotivo: {motivo}",
                 COLOR_KICK,
                 membro
+            )),
+            dm_first=True,
+            log=(
+                "Kick",
+                "Usuário expulso",
+                f"👤 Alvo: {membro}\n🛡️ Autor: {interaction.user.mention}\n📄 Motivo: {motivo}",
+                COLOR_KICK
             )
         )
 
-        await membro.kick(reason=motivo)
-
-        await interaction.response.send_message(
-            embed=make_embed("👢 Kick", f"{membro} expulso.", COLOR_KICK, membro),
-            ephemeral=True
-        )
-
-        await log_embed(
-            self.bot,
-            "Kick",
-            "Usuário expulso",
-            f"👤 Alvo: {membro}\n🛡️ Autor: {interaction.user.mention}\n📄 Motivo: {motivo}",
-            COLOR_KICK
-        )
-
     # ────────────── BAN ──────────────
     @app_commands.command(name="ban")
     async def ban(self, interaction: discord.Interaction, membro: discord.Member, motivo: str = "Sem motivo"):
-        await send_dm_embed(
-            membro,
-            make_embed(
+        await run_action(
+            interaction,
+            action=membro.ban(reason=motivo),
+            target=membro,
+            response=make_embed("🔨 Ban", f"{membro} banido.", COLOR_BAN, membro),
+            dm=(membro, make_embed(
                 "🔨 Você foi banido",
                 f"Servidor: **{interaction.guild.name}**\nMotivo: {motivo}",
                 COLOR_BAN,
                 membro
+            )),
+            dm_first=True,
+            log=(
+                "Ban",
+                "Usuário banido",
+                f"👤 Alvo: {membro}\n🛡️ Autor: {interaction.user.mention}\n📄 Motivo: {motivo}",
+                COLOR_BAN
+            )
+        )
+
+    # ────────────── EM MASSA: SELEÇÃO ──────────────
+    async def select_members(self, interaction: discord.Interaction, membros: str | None, entrou_nos_ultimos: int | None):
+        guild = interaction.guild
+        targets = {}
+
+        # IDs/menções: cache do gateway → LRU na hora; só quem falta vai
+        # para fetch_member, em paralelo e com rate limit
+        missing = []
+        for user_id in parse_ids(membros)[:BULK_MAX]:
+            member = self.bot.member_lru.get_cached(guild, user_id)
+            if member is not None:
+                targets[member.id] = member
+            else:
+                missing.append(user_id)
+
+        found = []
+
+        async def resolve(user_id):
+            member = await self.bot.member_lru.get(guild, user_id)
+            if member is not None:
+                found.append(member)
+
+        if missing:
+            await run_bulk(missing, resolve)
+        for member in found:
+            targets.setdefault(member.id, member)
+
+        # "entrou nos últimos N minutos" (cache de quem entrou com o bot online)
+        if entrou_nos_ultimos:
+            cutoff = discord.utils.utcnow() - timedelta(minutes=entrou_nos_ultimos)
+            for member in guild.members:
+                if member.joined_at and member.joined_at >= cutoff:
+                    targets.setdefault(member.id, member)
+
+        protected = {interaction.user.id, guild.owner_id, self.bot.user.id}
+        candidates = [m for m in targets.values() if m.id not in protected and not m.bot]
+
+        # hierarquia de cargos, como na interface do Discord: só o dono
+        # age sobre quem tem cargo igual ou acima do seu
+        if interaction.user.id == guild.owner_id:
+            allowed, skipped = candidates, []
+        else:
+            top_role = interaction.user.top_role
+            allowed = [m for m in candidates if m.top_role < top_role]
+            skipped = [m for m in candidates if m.top_role >= top_role]
+
+        interaction.extras["bulk_skipped"] = skipped
+        return allowed[:BULK_MAX]
+
+    # ────────────── EM MASSA: EXECUÇÃO ──────────────
+    async def run_bulk_action(self, interaction: discord.Interaction, title: str, color: int, targets: list,
+                              action, *, cost: int = 1, limiter: RateLimiter | None = None):
+        async def progress(done, total):
+            await interaction.edit_original_response(
+                embed=make_embed(f"⏳ {title}", f"Processados **{done}/{total}**...", color)
+            )
+
+        return await run_bulk(targets, action, cost=cost, limiter=limiter, on_progress=progress)
+
+    async def finish_bulk(self, interaction: discord.Interaction, log_action_name: str, title: str, color: int,
+                          ok: list, failed: list, details: str):
+        skipped = interaction.extras.get("bulk_skipped", [])
+        summary = f"✅ Sucesso: **{len(ok)}**\n❌ Falhas: **{len(failed)}**\n{details}"
+        if skipped:
+            summary += f"\n⏭️ Ignorados (cargo igual ou acima do seu): **{len(skipped)}**"
+        if failed:
+            summary += "\n\n" + "\n".join(
+                f"• `{getattr(item, 'id', item)}`: {type(e).__name__}" for item, e in failed[:10]
             )
+
+        await interaction.edit_original_response(embed=make_embed(f"📦 {title}", summary, color))
+
+        alvos = ", ".join(f"<@{m.id}>" for m in ok[:60])
+        if len(ok) > 60:
+            alvos += f" e mais {len(ok) - 60}"
+
+        await log_embed(
+            self.bot,
+            log_action_name,
+            title,
+            f"🛡️ Autor: {interaction.user.mention}\n{details}\n"
+            f"✅ Sucesso: {len(ok)} • ❌ Falhas: {len(failed)}\n\n👥 Alvos: {alvos or 'nenhum'}",
+            color,
+            guild_id=interaction.guild_id,
+            author_id=interaction.user.id,
+            target_ids=[m.id for m in ok]
         )
 
-        await membro.ban(reason=motivo)
+    async def check_permission(self, interaction: discord.Interaction, permission: str) -> bool:
+        if getattr(interaction.user.guild_permissions, permission):
+            return True
 
         await interaction.response.send_message(
-            embed=make_embed("🔨 Ban", f"{membro} banido.", COLOR_BAN, membro),
+            embed=make_embed("❌ Erro", "Sem permissão.", COLOR_ERROR, interaction.user),
             ephemeral=True
         )
+        return False
 
-        await log_embed(
-            self.bot,
-            "Ban",
-            "Usuário banido",
-            f"👤 Alvo: {membro}\n🛡️ Autor: {interaction.user.mention}\n📄 Motivo: {motivo}",
-            COLOR_BAN
+    async def start_bulk(self, interaction: discord.Interaction, permission: str,
+                         membros: str | None, entrou_nos_ultimos: int | None) -> list | None:
+        if not await self.check_permission(interaction, permission):
+            return None
+
+        # defer imediato: a seleção e o progresso vão na mesma resposta
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        targets = await self.select_members(interaction, membros, entrou_nos_ultimos)
+
+        if not targets:
+            skipped = interaction.extras.get("bulk_skipped", [])
+            await interaction.edit_original_response(
+                embed=make_embed(
+                    "❌ Erro",
+                    f"Nenhum membro abaixo do seu cargo na seleção ({len(skipped)} ignorados)."
+                    if skipped else "Nenhum membro encontrado para a seleção.",
+                    COLOR_ERROR
+                )
+            )
+            return None
+
+        return targets
+
+    # ────────────── MUTE EM MASSA ──────────────
+    @app_commands.command(name="mute_massa", description="Muta vários membros de uma vez")
+    @app_commands.describe(
+        membros="Menções ou IDs separados por espaço",
+        entrou_nos_ultimos="Inclui quem entrou nos últimos N minutos",
+        avisar="Envia DM para cada membro"
+    )
+    async def mute_massa(self, interaction: discord.Interaction, minutos: int, membros: str | None = None,
+                         entrou_nos_ultimos: int | None = None, avisar: bool = True):
+        targets = await self.start_bulk(interaction, "moderate_members", membros, entrou_nos_ultimos)
+        if targets is None:
+            return
+
+        async def action(membro):
+            # DM e timeout em paralelo: o timeout não tira o membro da guild
+            dm = make_embed(
+                "🔇 Você foi mutado",
+                f"Servidor: **{interaction.guild.name}**\n"
+                f"Duração: **{minutos} minutos**\n"
+                f"Moderador: {interaction.user.mention}",
+                COLOR_MUTE,
+                membro
+            )
+            results = await asyncio.gather(
+                send_dm_embed(membro, dm) if avisar else asyncio.sleep(0),
+                membro.timeout(timedelta(minutes=minutos)),
+                return_exceptions=True
+            )
+            if isinstance(results[1], BaseException):
+                raise results[1]
+
+        ok, failed = await self.run_bulk_action(
+            interaction, "Mute em massa", COLOR_MUTE, targets, action, cost=3 if avisar else 1
+        )
+        await self.finish_bulk(
+            interaction, "Mute", "Mute em massa", COLOR_MUTE, ok, failed,
+            f"⏱️ Duração: {minutos} minutos"
+        )
+
+    # ────────────── KICK EM MASSA ──────────────
+    @app_commands.command(name="kick_massa", description="Expulsa vários membros de uma vez")
+    @app_commands.describe(
+        membros="Menções ou IDs separados por espaço",
+        entrou_nos_ultimos="Inclui quem entrou nos últimos N minutos",
+        avisar="Envia DM para cada membro"
+    )
+    async def kick_massa(self, interaction: discord.Interaction, membros: str | None = None,
+                         entrou_nos_ultimos: int | None = None, motivo: str = "Sem motivo", avisar: bool = True):
+        targets = await self.start_bulk(interaction, "kick_members", membros, entrou_nos_ultimos)
+        if targets is None:
+            return
+
+        async def action(membro):
+            # DM antes: depois do kick o membro pode não ser alcançável
+            if avisar:
+                await send_dm_embed(
+                    membro,
+                    make_embed(
+                        "👢 Você foi expulso",
+                        f"Servidor: **{interaction.guild.name}**\nMotivo: {motivo}",
+                        COLOR_KICK,
+                        membro
+                    )
+                )
+            await membro.kick(reason=motivo)
+
+        ok, failed = await self.run_bulk_action(
+            interaction, "Kick em massa", COLOR_KICK, targets, action, cost=3 if avisar else 1
+        )
+        await self.finish_bulk(
+            interaction, "Kick", "Kick em massa", COLOR_KICK, ok, failed,
+            f"📄 Motivo: {motivo}"
+        )
+
+    # ────────────── BAN EM MASSA ──────────────
+    @app_commands.command(name="ban_massa", description="Bane vários membros de uma vez")
+    @app_commands.describe(
+        membros="Menções ou IDs separados por espaço",
+        entrou_nos_ultimos="Inclui quem entrou nos últimos N minutos",
+        avisar="Envia DM para cada membro antes do ban"
+    )
+    async def ban_massa(self, interaction: discord.Interaction, membros: str | None = None,
+                        entrou_nos_ultimos: int | None = None, motivo: str = "Sem motivo", avisar: bool = False):
+        targets = await self.start_bulk(interaction, "ban_members", membros, entrou_nos_ultimos)
+        if targets is None:
+            return
+
+        limiter = RateLimiter()
+
+        # 1️⃣ DMs em paralelo (antes: depois do ban não há canal em comum)
+        if avisar:
+            async def dm(membro):
+                await send_dm_embed(
+                    membro,
+                    make_embed(
+                        "🔨 Você foi banido",
+                        f"Servidor: **{interaction.guild.name}**\nMotivo: {motivo}",
+                        COLOR_BAN,
+                        membro
+                    )
+                )
+
+            await self.run_bulk_action(interaction, "Avisando por DM", COLOR_BAN, targets, dm, cost=2, limiter=limiter)
+
+        # 2️⃣ endpoint de bulk ban: até 200 usuários por chamada
+        by_id = {m.id: m for m in targets}
+        ok, failed = [], []
+        for start in range(0, len(targets), BULK_BAN_CHUNK):
+            chunk = targets[start:start + BULK_BAN_CHUNK]
+            await limiter.acquire()
+            try:
+                result = await interaction.guild.bulk_ban(chunk, reason=motivo)
+            except discord.HTTPException as e:
+                failed += [(m, e) for m in chunk]
+                continue
+
+            ok += [by_id[u.id] for u in result.banned if u.id in by_id]
+            failed += [(by_id[u.id], RuntimeError("não banido")) for u in result.failed if u.id in by_id]
+
+            await interaction.edit_original_response(
+                embed=make_embed("⏳ Ban em massa", f"Processados **{start + len(chunk)}/{len(targets)}**...", COLOR_BAN)
+            )
+
+        await self.finish_bulk(
+            interaction, "Ban", "Ban em massa", COLOR_BAN, ok, failed,
+            f"📄 Motivo: {motivo}"
         )
 
 # ────────────── CONTEXT MENU ──────────────
 @app_commands.context_menu(name="Timeout 10 minutos")
 async def ctx_timeout(interaction: discord.Interaction, membro: discord.Member):
-    await send_dm_embed(
-        membro,
-        make_embed(
+    await run_action(
+        interaction,
+        action=membro.timeout(timedelta(minutes=10)),
+        target=membro,
+        response=make_embed("🔇 Mute", "Mute aplicado por 10 minutos.", COLOR_MUTE, membro),
+        dm=(membro, make_embed(
             "🔇 Você foi mutado",
             "Duração: **10 minutos**",
             COLOR_MUTE,
             membro
+        )),
+        log=(
+            "Mute (Apps)",
+            "Mute via Apps",
+            f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}\n⏱️ Duração: 10 minutos",
+            COLOR_MUTE
         )
     )
 
-    await membro.timeout(timedelta(minutes=10))
-
-    await interaction.response.send_message(
-        embed=make_embed("🔇 Mute", "Mute aplicado por 10 minutos.", COLOR_MUTE, membro),
-        ephemeral=True
-    )
-
-    await log_embed(
-        interaction.client,
-        "Mute (Apps)",
-        "Mute via Apps",
-        f"👤 Alvo: {membro.mention}\n🛡️ Autor: {interaction.user.mention}\n⏱️ Duração: 10 minutos",
-        COLOR_MUTE
-    )
-
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
     bot.tree.add_command(ctx_timeout)
+
+async def teardown(bot):
+    # o context menu não pertence ao cog: sai da árvore no unload/reload
+    bot.tree.remove_command(ctx_timeout.name, type=ctx_timeout.type)
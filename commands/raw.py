@@ -1,14 +1,20 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
 from datetime import datetime
 from utils.raw_api import send_raw_v2
+from utils.cv2_validator import validate_payload
 from utils.logger import log_action
+from utils.templates import TemplateRegistry
+from utils.broadcast import (
+    broadcast, check_broadcast_permission, format_results, group_choices, resolve_channels
+)
 
 class Raw(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # payloads de messages/ já validados em memória
+        self.templates = TemplateRegistry("messages", self.load_payload)
 
     # ────────────── EMBED HELPER ──────────────
     def make_embed(self, title: str, description: str, color: int):
@@ -21,115 +27,37 @@ class Raw(commands.Cog):
 
     # ────────────── JSON VALIDATOR (API v10 + COMPONENTS V2) ──────────────
     def validate_payload(self, payload: dict):
-        if not isinstance(payload, dict):
-            raise ValueError("O payload precisa ser um objeto JSON")
+        validate_payload(payload)
 
-        if not any(k in payload for k in ("content", "embeds", "components")):
-            raise ValueError(
-                "Payload inválido: é necessário `content`, `embeds` ou `components`"
-            )
-
-        if "components" not in payload:
-            return  # payload só de texto/embed é válido
-
-        if not isinstance(payload["components"], list):
-            raise ValueError("`components` precisa ser uma lista")
-
-        def validate_component(comp, path="components"):
-            if "type" not in comp:
-                raise ValueError(f"{path} sem campo `type`")
-
-            ctype = comp["type"]
-
-            # ───── CONTAINER (Layout / Components V2) ─────
-            if ctype == 17:
-                if "components" not in comp or not isinstance(comp["components"], list):
-                    raise ValueError(f"{path}: container precisa de `components`")
-
-                for i, child in enumerate(comp["components"]):
-                    validate_component(child, f"{path}.components[{i}]")
-
-            # ───── ACTION ROW ─────
-            elif ctype == 1:
-                if "components" not in comp:
-                    raise ValueError(f"{path}: action row sem `components`")
-
-                for i, child in enumerate(comp["components"]):
-                    validate_component(child, f"{path}.components[{i}]")
-
-            # ───── BUTTON ─────
-            elif ctype == 2:
-                if "style" not in comp:
-                    raise ValueError(f"{path}: botão sem `style`")
-
-                if comp.get("style") == 5:
-                    if "url" not in comp:
-                        raise ValueError(f"{path}: botão link precisa de `url`")
-                else:
-                    if "custom_id" not in comp:
-                        raise ValueError(f"{path}: botão precisa de `custom_id`")
-
-            # ───── TEXT ─────
-            elif ctype == 10:
-                if "content" not in comp:
-                    raise ValueError(f"{path}: texto sem `content`")
-
-            # ───── MEDIA ─────
-            elif ctype == 12:
-                if "items" not in comp:
-                    raise ValueError(f"{path}: media sem `items`")
-
-            # ───── DIVIDER ─────
-            elif ctype == 14:
-                pass  # divider não exige validação extra
-
-            else:
-                raise ValueError(f"{path}: tipo não suportado ({ctype})")
-
-        for i, component in enumerate(payload["components"]):
-            validate_component(component, f"components[{i}]")
+    def load_payload(self, payload: dict):
+        self.validate_payload(payload)
+        return payload
 
     # ────────────── SLASH COMMAND ──────────────
     @app_commands.command(name="enviar_raw_v2", description="Envia Components V2 RAW")
+    @app_commands.describe(
+        arquivo="Arquivo em messages/",
+        canal="Canal de destino",
+        canais="Vários canais (menções ou IDs)",
+        categoria="Todos os canais de texto da categoria",
+        grupo="Grupo de canais salvo (/grupo_canais)"
+    )
     async def enviar_raw_v2(
         self,
         interaction: discord.Interaction,
-        canal: discord.TextChannel,
-        arquivo: str
+        arquivo: str,
+        canal: discord.TextChannel | None = None,
+        canais: str | None = None,
+        categoria: discord.CategoryChannel | None = None,
+        grupo: str | None = None
     ):
         try:
-            with open(f"messages/{arquivo}.json", "r", encoding="utf-8") as f:
-                payload = json.load(f)
-
-            # ────────────── VALIDAÇÃO ──────────────
-            self.validate_payload(payload)
-
-            send_raw_v2(canal.id, payload)
-
-            await interaction.response.send_message(
-                embed=self.make_embed(
-                    "✅ RAW enviado",
-                    f"Arquivo `{arquivo}.json` enviado em {canal.mention}.",
-                    0x2ECC71
-                ),
-                ephemeral=True
-            )
-
-            # ────────────── LOG SUCESSO ──────────────
-            await log_action(
-                self.bot,
-                action="RAW",
-                embed=discord.Embed(
-                    title="📦 RAW enviado",
-                    description=(
-                        f"📄 Arquivo: `{arquivo}.json`\n"
-                        f"📢 Canal: {canal.mention}\n"
-                        f"🛡️ Autor: {interaction.user.mention}"
-                    ),
-                    color=0x2ECC71,
-                    timestamp=datetime.utcnow()
-                )
+            # ────────────── CACHE (JÁ VALIDADO) ──────────────
+            payload = self.templates.get(arquivo)
+            destinos = resolve_channels(
+                interaction.guild, canal=canal, canais=canais, categoria=categoria, grupo=grupo
             )
+            check_broadcast_permission(interaction.user, destinos, categoria=categoria, grupo=grupo)
 
         except Exception as e:
             await interaction.response.send_message(
@@ -145,11 +73,11 @@ class Raw(commands.Cog):
             await log_action(
                 self.bot,
                 action="RAW",
+                guild_id=interaction.guild_id,
                 embed=discord.Embed(
                     title="❌ Erro ao enviar RAW",
                     description=(
                         f"📄 Arquivo: `{arquivo}.json`\n"
-                        f"📢 Canal: {canal.mention}\n"
                         f"🛡️ Autor: {interaction.user.mention}\n\n"
                         f"🧨 Erro:\n```{e}```"
                     ),
@@ -157,6 +85,45 @@ class Raw(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
             )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        ok, failed = await broadcast(destinos, lambda ch: send_raw_v2(self.bot, ch, payload))
+        results = format_results(ok, failed)
+        color = 0x2ECC71 if not failed else 0xE67E22 if ok else 0xE74C3C
+
+        await interaction.edit_original_response(
+            embed=self.make_embed(
+                "✅ RAW enviado" if ok else "❌ Erro ao enviar RAW",
+                f"📄 Arquivo: `{arquivo}.json`\n{results}",
+                color
+            )
+        )
+
+        # ────────────── LOG (UMA ENTRADA POR ENVIO) ──────────────
+        await log_action(
+            self.bot,
+            action="RAW",
+            guild_id=interaction.guild_id,
+            embed=discord.Embed(
+                title="📦 RAW enviado" if ok else "❌ Erro ao enviar RAW",
+                description=(
+                    f"📄 Arquivo: `{arquivo}.json`\n"
+                    f"🛡️ Autor: {interaction.user.mention}\n"
+                    f"{results}"
+                ),
+                color=color,
+                timestamp=datetime.utcnow()
+            )
+        )
+
+    @enviar_raw_v2.autocomplete("arquivo")
+    async def arquivo_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self.templates.autocomplete(current)
+
+    @enviar_raw_v2.autocomplete("grupo")
+    async def grupo_autocomplete(self, interaction: discord.Interaction, current: str):
+        return group_choices(interaction.guild_id, current)
 
 async def setup(bot):
     await bot.add_cog(Raw(bot))
@@ -0,0 +1,93 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+import os
+from utils.logger import log_action
+from utils.command_sync import format_report
+from utils.extensions import EXTENSIONS, refresh_commands, reload_with_state
+
+class Reload(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    def make_embed(self, title: str, description: str, color: int):
+        return discord.Embed(
+            title=title,
+            description=description,
+            color=color,
+            timestamp=datetime.utcnow()
+        )
+
+    # ────────────── RELOAD A QUENTE ──────────────
+    # Recarrega um módulo de commands/ sem reconectar o gateway nem refazer
+    # o warm-up. Com o launcher, vale só para o processo que recebeu o
+    # comando (worker informado na resposta).
+    @app_commands.command(name="reload", description="Recarrega uma extensão sem reiniciar o bot")
+    @app_commands.describe(extensao="Módulo em commands/ (ex.: commands.invite)")
+    async def reload(self, interaction: discord.Interaction, extensao: str):
+        # ────────────── PERMISSÃO ──────────────
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Permissão negada", "Apenas administradores podem usar este comando.", 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        if extensao not in self.bot.extensions:
+            await interaction.response.send_message(
+                embed=self.make_embed("❌ Extensão não carregada", f"`{extensao}`", 0xE74C3C),
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            elapsed, handed = await reload_with_state(self.bot, extensao)
+            reports = await refresh_commands(self.bot.tree)
+        except Exception as e:
+            await interaction.edit_original_response(
+                embed=self.make_embed(
+                    "❌ Erro ao recarregar",
+                    f"📦 `{extensao}` (versão anterior mantida)\n```{e!r}```"[:4000],
+                    0xE74C3C
+                )
+            )
+            return
+
+        description = (
+            f"📦 **Extensão:** `{extensao}`\n"
+            f"⏱️ **Tempo:** {elapsed * 1000:.1f}ms\n"
+            f"🔁 **Estado preservado:** {', '.join(handed) or 'nenhum'}\n"
+            f"🧩 **Worker:** {os.getenv('WORKER_ID', '0')}"
+        )
+        if reports:
+            description += "\n\n" + "\n".join(format_report(r) for r in reports)
+
+        # o cog recarregado pode ser este: self.bot continua válido
+        await interaction.edit_original_response(
+            embed=self.make_embed("♻️ Extensão recarregada", description, 0x2ECC71)
+        )
+
+        await log_action(
+            self.bot,
+            action="DEFAULT",
+            guild_id=interaction.guild_id,
+            embed=self.make_embed(
+                "♻️ Reload executado",
+                f"🛡️ Autor: {interaction.user.mention}\n📦 Extensão: `{extensao}`\n⏱️ Tempo: {elapsed * 1000:.1f}ms",
+                0x3498DB
+            )
+        )
+
+    @reload.autocomplete("extensao")
+    async def extensao_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in EXTENSIONS
+            if current.lower() in name
+        ][:25]
+
+async def setup(bot):
+    await bot.add_cog(Reload(bot))
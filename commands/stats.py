@@ -0,0 +1,99 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+from utils import metrics
+from utils.logger import get_log_stats
+
+TOP_COMMANDS = 10
+
+def _ms(seconds: float) -> str:
+    if seconds == float("inf"):
+        return ">10s"
+    return f"{seconds * 1000:.0f}ms"
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(
+        name="stats",
+        description="Mostra latência dos comandos, uso da API e filas de log"
+    )
+    async def stats(self, interaction: discord.Interaction):
+        # ────────────── PERMISSÃO ──────────────
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                embed=discord.Embed(
+                    title="❌ Permissão negada",
+                    description="Apenas administradores podem usar este comando.",
+                    color=0xE74C3C,
+                    timestamp=datetime.utcnow()
+                ),
+                ephemeral=True
+            )
+            return
+
+        embed = discord.Embed(
+            title="📈 Estatísticas do bot",
+            color=0x3498DB,
+            timestamp=datetime.utcnow()
+        )
+
+        # ────────────── COMANDOS ──────────────
+        top = sorted(
+            metrics.command_latency.items(),
+            key=lambda item: item[1].count,
+            reverse=True
+        )[:TOP_COMMANDS]
+        embed.add_field(
+            name="⚡ Comandos (p50 / p99)",
+            value="\n".join(
+                f"`/{name}` ×{hist.count} — {_ms(hist.quantile(0.5))} / {_ms(hist.quantile(0.99))}"
+                f" · ❌ {metrics.command_errors.get(name, 0)}"
+                for name, hist in top
+            ) or "Nenhum comando executado ainda.",
+            inline=False
+        )
+
+        # ────────────── ETAPAS DE MODERAÇÃO ──────────────
+        embed.add_field(
+            name="🛡️ Etapas de moderação (p50 / p99)",
+            value="\n".join(
+                f"`{step}` ×{hist.count} — {_ms(hist.quantile(0.5))} / {_ms(hist.quantile(0.99))}"
+                f" · ❌ {metrics.step_failures.get(step, 0)}"
+                for step, hist in metrics.step_latency.items()
+            ) or "Nenhuma ação de moderação ainda.",
+            inline=False
+        )
+
+        # ────────────── API / GATEWAY ──────────────
+        total = sum(metrics.http_requests.values())
+        limited = sum(metrics.http_ratelimits.values())
+        latency = self.bot.latency
+        embed.add_field(
+            name="🌐 API",
+            value=(
+                f"📨 **Requisições:** {total}\n"
+                f"⏳ **429s:** {limited}\n"
+                f"💓 **Gateway:** {_ms(latency) if latency == latency else '—'}\n"
+                f"🌀 **Lag do loop:** {_ms(metrics.loop_lag_last)} (máx {_ms(metrics.loop_lag_max)})"
+            ),
+            inline=False
+        )
+
+        # ────────────── FILAS DE LOG ──────────────
+        sinks = get_log_stats()
+        embed.add_field(
+            name="📜 Filas de log",
+            value="\n".join(
+                f"`{sink}` — {s['embeds']} enviados · {s['failures']} falhas · {s['queued']} na fila · {s['outbox']} no outbox"
+                for sink, s in sorted(sinks.items())
+            ) or "Nenhuma fila ativa.",
+            inline=False
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 from datetime import datetime
 from utils.logger import log_action  # ← ADIÇÃO (já existente no projeto)
+from utils.command_sync import sync_if_changed, format_report
 
 class Sync(commands.Cog):
     def __init__(self, bot):
@@ -12,7 +13,8 @@ class Sync(commands.Cog):
         name="sync",
         description="Sincroniza os comandos Slash e Apps sem reiniciar o bot"
     )
-    async def sync(self, interaction: discord.Interaction):
+    @app_commands.describe(forcar="Sincroniza mesmo sem mudanças nos comandos")
+    async def sync(self, interaction: discord.Interaction, forcar: bool = False):
         # ────────────── PERMISSÃO ──────────────
         if not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message(
@@ -26,29 +28,39 @@ class Sync(commands.Cog):
             )
             return
 
+        # dois syncs podem passar dos 3s da interação: responde antes
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
         try:
-            synced = await self.bot.tree.sync()
+            # ────────────── SYNC POR ESCOPO (PULA O QUE NÃO MUDOU) ──────────────
+            reports = [
+                await sync_if_changed(self.bot.tree, guild=scope, force=forcar)
+                for scope in (None, interaction.guild)
+            ]
+            synced = sum(r["count"] for r in reports if r["synced"])
+            report_text = "\n".join(format_report(r) for r in reports)
 
             # ────────────── RESPOSTA AO USUÁRIO ──────────────
-            await interaction.response.send_message(
+            await interaction.edit_original_response(
                 embed=discord.Embed(
                     title="✅ Sincronização concluída",
-                    description=f"**{len(synced)} comandos** foram sincronizados com sucesso.",
+                    description=report_text,
                     color=0x2ECC71,
                     timestamp=datetime.utcnow()
-                ),
-                ephemeral=True
+                )
             )
 
             # ────────────── LOG AUTOMÁTICO (ADIÇÃO) ──────────────
             await log_action(
                 self.bot,
                 action="DEFAULT",
+                guild_id=interaction.guild_id,
                 embed=discord.Embed(
                     title="🔄 Sync executado",
                     description=(
                         f"🛡️ **Autor:** {interaction.user.mention}\n"
-                        f"📦 **Comandos sincronizados:** {len(synced)}\n"
+                        f"📦 **Comandos sincronizados:** {synced}\n"
+                        f"⚡ **Forçado:** {'sim' if forcar else 'não'}\n"
                         f"🏷️ **Guild:** {interaction.guild.name} (`{interaction.guild.id}`)"
                     ),
                     color=0x3498DB,
@@ -57,20 +69,20 @@ class Sync(commands.Cog):
             )
 
         except Exception as e:
-            await interaction.response.send_message(
+            await interaction.edit_original_response(
                 embed=discord.Embed(
                     title="❌ Erro ao sincronizar",
                     description=f"```{e}```",
                     color=0xE74C3C,
                     timestamp=datetime.utcnow()
-                ),
-                ephemeral=True
+                )
             )
 
             # ────────────── LOG DE ERRO (ADIÇÃO) ──────────────
             await log_action(
                 self.bot,
                 action="DEFAULT",
+                guild_id=interaction.guild_id,
                 embed=discord.Embed(
                     title="❌ Erro no /sync",
                     description=(
@@ -0,0 +1,83 @@
+# Launcher multi-processo (opcional): divide os shards do bot entre
+# vários processos `app.py`, um por núcleo. Sem ele, `python app.py`
+# continua funcionando com todos os shards num processo só.
+#
+# Cada worker recebe SHARD_COUNT, SHARD_IDS (faixa contígua), WORKER_ID e
+# METRICS_PORT próprio (base + índice). Só o worker 0 sincroniza os
+# comandos. Worker que cai é reiniciado com backoff.
+#
+# Uso: python launcher.py [-w 4] [--shards 16]
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+from dotenv import load_dotenv
+
+from utils.metrics import METRICS_PORT
+from utils.sharding import plan_shards
+
+RESTART_BASE = 5.0      # segundos; dobra a cada queda seguida
+RESTART_MAX = 300.0
+STABLE_AFTER = 600.0    # rodando há 10 min sem cair: zera o backoff
+
+# ────────────── SHARDS RECOMENDADOS ──────────────
+async def recommended_shards(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"}
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return int(data["shards"])
+
+# ────────────── WORKER ──────────────
+async def run_worker(index: int, shard_ids: list[int], shard_count: int, metrics_base: int):
+    env = {
+        **os.environ,
+        "SHARD_COUNT": str(shard_count),
+        "SHARD_IDS": ",".join(map(str, shard_ids)),
+        "WORKER_ID": str(index),
+        "METRICS_PORT": str(metrics_base + index),
+        "SYNC_COMMANDS": "1" if index == 0 else "0",
+    }
+    delay = RESTART_BASE
+
+    while True:
+        started = time.monotonic()
+        print(f"🚀 Worker {index}: shards {shard_ids[0]}–{shard_ids[-1]} de {shard_count}")
+        proc = await asyncio.create_subprocess_exec(sys.executable, "app.py", env=env)
+        code = await proc.wait()
+
+        if time.monotonic() - started > STABLE_AFTER:
+            delay = RESTART_BASE
+        print(f"⚠️ Worker {index} saiu (código {code}), reiniciando em {delay:.0f}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RESTART_MAX)
+
+async def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Divide os shards do Waffle entre processos")
+    parser.add_argument("-w", "--workers", type=int, default=int(os.getenv("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", 0)),
+                        help="total de shards (padrão: recomendado pelo Discord)")
+    args = parser.parse_args()
+
+    shard_count = args.shards or await recommended_shards(os.getenv("TOKEN"))
+    metrics_base = int(os.getenv("METRICS_PORT", METRICS_PORT))
+    plan = plan_shards(shard_count, args.workers)
+    print(f"🧇 {shard_count} shards em {len(plan)} workers")
+
+    await asyncio.gather(*(
+        run_worker(index, shard_ids, shard_count, metrics_base)
+        for index, shard_ids in enumerate(plan)
+    ))
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import time
+
+AUTOMOD_FILE = os.getenv("AUTOMOD_FILE", "data/automod.json")
+RELOAD_INTERVAL = 5.0  # segundos entre verificações do mtime
+
+# ────────────── FORMATO DO ARQUIVO ──────────────
+# {
+#     "words": ["palavra", "outra expressão"],
+#     "domains": ["bit.ly", "discord.gg"],
+#     "timeout_minutes": 10,
+#     "delete_message": true
+# }
+# Palavras casam inteiras (sem diferenciar maiúsculas); domínios casam
+# também como subdomínio (x.bit.ly), mas não dentro de outro nome (abit.ly).
+DEFAULTS = {
+    "words": [],
+    "domains": [],
+    "timeout_minutes": 10,
+    "delete_message": True,
+}
+
+# Tipos conferidos antes de trocar as regras: `"words": "spam"` viraria
+# as letras s/p/a/m e puniria quase toda mensagem.
+def validate(config: dict):
+    for key in ("words", "domains"):
+        value = config[key]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"`{key}` precisa ser uma lista de textos")
+    minutes = config["timeout_minutes"]
+    if isinstance(minutes, bool) or not isinstance(minutes, int) or minutes <= 0:
+        raise ValueError("`timeout_minutes` precisa ser um inteiro positivo")
+    if not isinstance(config["delete_message"], bool):
+        raise ValueError("`delete_message` precisa ser true ou false")
+
+# ────────────── REGEX COMBINADA (TRIE) ──────────────
+# Todas as palavras e domínios viram UMA regex, com os prefixos comuns
+# fatorados (trie → alternância aninhada): o motor testa cada posição
+# do texto uma vez, sem repetir o mesmo prefixo para cada padrão.
+def _trie_pattern(terms) -> str:
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # fim de termo
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if end:
+            # termo que é prefixo de outro: o resto é opcional
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+def _terms(values) -> list[str]:
+    return sorted({str(v).strip().casefold() for v in values if str(v).strip()})
+
+class Matcher:
+    __slots__ = ("regex", "words", "domains")
+
+    def __init__(self, words=(), domains=()):
+        self.words = _terms(words)
+        self.domains = _terms(domains)
+
+        parts = []
+        if self.domains:
+            parts.append(rf"(?P<domain>(?<!-)(?:{_trie_pattern(self.domains)})(?![\w-]))")
+        if self.words:
+            parts.append(rf"(?P<word>(?:{_trie_pattern(self.words)})(?!\w))")
+        # um único lookbehind na frente: posições no meio de uma palavra
+        # são descartadas antes de entrar na alternância
+        self.regex = re.compile(rf"(?<!\w)(?:{'|'.join(parts)})") if parts else None
+
+    # → ("word" | "domain", trecho) ou None
+    def search(self, text: str) -> tuple[str, str] | None:
+        if self.regex is None or not text:
+            return None
+        match = self.regex.search(text.casefold())
+        if match is None:
+            return None
+        return match.lastgroup, match.group()
+
+# ────────────── REGRAS COM HOT-RELOAD ──────────────
+# Recompila quando o mtime do arquivo muda. JSON inválido mantém as
+# regras anteriores (e avisa uma vez por versão do arquivo).
+class AutomodRules:
+    def __init__(self, path: str = AUTOMOD_FILE, reload_interval: float = RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.config = dict(DEFAULTS)
+        self.matcher = Matcher()
+        self._mtime = None
+        self._checked_at = None
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        if mtime is None:
+            self.config, self.matcher = dict(DEFAULTS), Matcher()
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("o JSON precisa ser um objeto")
+            config = {**DEFAULTS, **data}
+            validate(config)
+            matcher = Matcher(config["words"], config["domains"])
+        except (OSError, ValueError, TypeError, re.error) as e:
+            print(f"⚠️ Automod: {self.path} inválido, mantendo as regras anteriores: {e}")
+            return
+
+        self.config, self.matcher = config, matcher
+        print(f"🛡️ Automod: {len(matcher.words)} palavras e {len(matcher.domains)} domínios carregados")
+
+    def check(self, text: str) -> tuple[str, str] | None:
+        self.refresh()
+        return self.matcher.search(text)
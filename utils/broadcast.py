@@ -0,0 +1,103 @@
+import discord
+from discord import app_commands
+
+from utils import guild_config
+from utils.bulk import parse_ids, run_bulk
+
+BROADCAST_CONCURRENCY = 8   # envios simultâneos (cada canal tem seu bucket)
+MAX_LISTED = 25             # canais listados por extenso na resposta/log
+
+# ────────────── GRUPOS DE CANAIS SALVOS ──────────────
+# nome do grupo → [IDs de canal], na config da guild (utils.guild_config).
+def group_names(guild_id: int) -> list[str]:
+    return sorted(guild_config.get(guild_id).channel_groups)
+
+def group_choices(guild_id: int, current: str) -> list[app_commands.Choice[str]]:
+    current = current.lower()
+    return [
+        app_commands.Choice(name=name, value=name)
+        for name in group_names(guild_id)
+        if current in name.lower()
+    ][:25]
+
+def get_group(guild_id: int, name: str) -> list[int] | None:
+    return guild_config.get(guild_id).channel_groups.get(name)
+
+def set_group(guild_id: int, name: str, channel_ids: list[int]):
+    config = guild_config.get(guild_id)
+    config.channel_groups[name] = list(channel_ids)
+    config.save()
+
+def delete_group(guild_id: int, name: str) -> bool:
+    config = guild_config.get(guild_id)
+    removed = config.channel_groups.pop(name, None) is not None
+    if removed:
+        config.save()
+    return removed
+
+# ────────────── RESOLUÇÃO DE DESTINOS ──────────────
+# Junta canal único, lista de menções/IDs, categoria e grupo salvo,
+# sem repetir canal e mantendo a ordem em que foram informados.
+def resolve_channels(guild: discord.Guild, *, canal: discord.TextChannel | None = None,
+                     canais: str | None = None, categoria: discord.CategoryChannel | None = None,
+                     grupo: str | None = None) -> list[discord.TextChannel]:
+    ids: list[int] = []
+
+    if canal is not None:
+        ids.append(canal.id)
+
+    ids += parse_ids(canais)
+
+    if categoria is not None:
+        ids += [ch.id for ch in categoria.text_channels]
+
+    if grupo:
+        group = get_group(guild.id, grupo)
+        if group is None:
+            raise ValueError(f"Grupo `{grupo}` não encontrado")
+        ids += group
+
+    channels = []
+    seen = set()
+    for channel_id in ids:
+        channel = guild.get_channel(channel_id)
+        if isinstance(channel, discord.TextChannel) and channel.id not in seen:
+            seen.add(channel.id)
+            channels.append(channel)
+
+    if not channels:
+        raise ValueError("Nenhum canal de texto informado")
+
+    return channels
+
+# ────────────── PERMISSÃO PARA VÁRIOS DESTINOS ──────────────
+# Um canal só segue a regra de sempre; categoria, grupo ou mais de um
+# canal exigem gerenciar canais ou mensagens.
+def check_broadcast_permission(member: discord.Member, channels: list[discord.TextChannel], *,
+                               categoria: discord.CategoryChannel | None = None, grupo: str | None = None):
+    if len(channels) <= 1 and categoria is None and not grupo:
+        return
+    perms = member.guild_permissions
+    if not (perms.manage_channels or perms.manage_messages):
+        raise PermissionError(
+            "Enviar para vários canais (categoria, grupo ou lista) exige "
+            "a permissão de gerenciar canais ou mensagens"
+        )
+
+# ────────────── ENVIO CONCORRENTE ──────────────
+# Conteúdo já carregado e validado uma vez; `send(canal)` só faz o(s) POST.
+# `cost` é o número de mensagens por canal, para o ritmo contar todas.
+async def broadcast(channels: list[discord.TextChannel], send, *, cost: int = 1) -> tuple[list, list]:
+    return await run_bulk(channels, send, cost=cost, limit=BROADCAST_CONCURRENCY)
+
+def format_results(ok: list, failed: list) -> str:
+    lines = [f"✅ Enviados: **{len(ok)}** • ❌ Falhas: **{len(failed)}**"]
+
+    if ok:
+        mentions = ", ".join(ch.mention for ch in ok[:MAX_LISTED])
+        if len(ok) > MAX_LISTED:
+            mentions += f" e mais {len(ok) - MAX_LISTED}"
+        lines.append(f"📢 {mentions}")
+
+    lines += [f"• {ch.mention}: {type(e).__name__}" for ch, e in failed[:MAX_LISTED]]
+    return "\n".join(lines)
@@ -0,0 +1,75 @@
+import asyncio
+import re
+import time
+
+BULK_CONCURRENCY = 8      # requisições simultâneas
+BULK_RATE = 40.0          # requisições/s (abaixo do limite global de 50/s)
+PROGRESS_INTERVAL = 2.0   # segundos entre atualizações de progresso
+
+# ────────────── TOKEN BUCKET ──────────────
+# Limita o ritmo global; os buckets por rota (e os 429) continuam com o
+# HTTPClient do discord.py, que só vê uma fila curta em vez de uma rajada.
+class RateLimiter:
+    def __init__(self, rate: float = BULK_RATE, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst or int(rate)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# ────────────── EXECUÇÃO CONCORRENTE ──────────────
+# Roda `action(item)` para cada item com concorrência e ritmo limitados.
+# `on_progress(feitos, total)` é chamado no máximo a cada PROGRESS_INTERVAL.
+# `cost` é o número de requisições que cada item faz (ex.: DM + ação).
+async def run_bulk(items, action, *, cost: int = 1, limit: int = BULK_CONCURRENCY,
+                   limiter: RateLimiter | None = None, on_progress=None) -> tuple[list, list]:
+    items = list(items)
+    limiter = limiter or RateLimiter()
+    semaphore = asyncio.Semaphore(limit)
+    done = 0
+    last_report = time.monotonic()
+    ok, failed = [], []
+
+    async def run(item):
+        nonlocal done, last_report
+        async with semaphore:
+            for _ in range(cost):
+                await limiter.acquire()
+            try:
+                await action(item)
+                ok.append(item)
+            except Exception as e:
+                failed.append((item, e))
+
+        done += 1
+        now = time.monotonic()
+        if on_progress is not None and now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            try:
+                await on_progress(done, len(items))
+            except Exception:
+                pass  # progresso nunca derruba a operação
+
+    await asyncio.gather(*(run(item) for item in items))
+    return ok, failed
+
+# ────────────── PARSE DE MEMBROS ──────────────
+_ID_RE = re.compile(r"\d{15,20}")
+
+def parse_ids(text: str | None) -> list[int]:
+    # aceita menções (<@123>), IDs soltos, separados por espaço/vírgula
+    seen = {}
+    for match in _ID_RE.findall(text or ""):
+        seen.setdefault(int(match), None)
+    return list(seen)
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+import discord
+
+HASHES_FILE = "data/command_hashes.json"
+
+os.makedirs("data", exist_ok=True)
+
+# ────────────── PERSISTÊNCIA ──────────────
+def _load_state() -> dict:
+    try:
+        with open(HASHES_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _save_state(state: dict):
+    tmp = f"{HASHES_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, ensure_ascii=False)
+    os.replace(tmp, HASHES_FILE)
+
+# ────────────── HASH CANÔNICO ──────────────
+def _digest(data) -> str:
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _command_key(payload: dict) -> str:
+    return f"{payload.get('type', 1)}:{payload['name']}"
+
+def scope_name(guild: discord.abc.Snowflake | None) -> str:
+    return "global" if guild is None else f"guild:{guild.id}"
+
+def serialize_scope(tree: discord.app_commands.CommandTree, guild=None) -> dict[str, str]:
+    # chave (tipo:nome) → hash do JSON que seria enviado no sync
+    return {
+        _command_key(payload): _digest(payload)
+        for payload in (cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild))
+    }
+
+# ────────────── SYNC CONDICIONAL ──────────────
+# Só chama tree.sync() quando o hash do escopo mudou desde o último sync.
+async def sync_if_changed(tree, guild=None, *, force: bool = False) -> dict:
+    scope = scope_name(guild)
+    commands = serialize_scope(tree, guild)
+    scope_hash = _digest(commands)
+
+    state = _load_state()
+    previous = state.get(scope, {})
+    old_commands = previous.get("commands", {})
+
+    report = {
+        "scope": scope,
+        "count": len(commands),
+        "added": sorted(k for k in commands if k not in old_commands),
+        "removed": sorted(k for k in old_commands if k not in commands),
+        "changed": sorted(
+            k for k in commands
+            if k in old_commands and old_commands[k] != commands[k]
+        ),
+        "synced": False,
+    }
+
+    if not force and previous.get("hash") == scope_hash:
+        return report
+
+    synced = await tree.sync(guild=guild)
+    report["count"] = len(synced)
+    report["synced"] = True
+
+    state[scope] = {"hash": scope_hash, "commands": commands}
+    _save_state(state)
+    return report
+
+def format_report(report: dict) -> str:
+    label = "🌐 Global" if report["scope"] == "global" else f"🏷️ {report['scope']}"
+
+    if not report["synced"]:
+        return f"{label}: sem mudanças, sync pulado ({report['count']} comandos)"
+
+    lines = [f"{label}: **{report['count']} comandos** sincronizados"]
+    for sign, key in (("+", "added"), ("-", "removed"), ("~", "changed")):
+        if report[key]:
+            names = ", ".join(f"`{k.split(':', 1)[1]}`" for k in report[key])
+            lines.append(f"  {sign} {names}")
+    return "\n".join(lines)
@@ -0,0 +1,353 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+# ────────────── LIMITES DA API (v10 + COMPONENTS V2) ──────────────
+IS_COMPONENTS_V2 = 1 << 15
+
+MAX_CONTENT = 2000           # `content` da mensagem
+MAX_EMBEDS = 10
+MAX_LEGACY_ROWS = 5          # action rows no topo sem a flag V2
+MAX_TOTAL_COMPONENTS = 40    # componentes (aninhados inclusos) com a flag V2
+MAX_TOTAL_TEXT = 4000        # soma de todos os Text Display
+MAX_DEPTH = 3                # container → action row/section → botão/acessório
+
+# ────────────── TIPOS ──────────────
+ACTION_ROW = 1
+BUTTON = 2
+STRING_SELECT = 3
+USER_SELECT = 5
+ROLE_SELECT = 6
+MENTIONABLE_SELECT = 7
+CHANNEL_SELECT = 8
+SECTION = 9
+TEXT_DISPLAY = 10
+THUMBNAIL = 11
+MEDIA_GALLERY = 12
+FILE = 13
+SEPARATOR = 14
+CONTAINER = 17
+
+SELECTS = {STRING_SELECT, USER_SELECT, ROLE_SELECT, MENTIONABLE_SELECT, CHANNEL_SELECT}
+INTERACTIVE = {BUTTON} | SELECTS
+
+# ────────────── TABELA DE REGRAS ──────────────
+# name       → nome usado nas mensagens de erro
+# children   → (chave, tipos permitidos, mínimo, máximo)
+# accessory  → tipos permitidos em `accessory` (section)
+# required   → campos obrigatórios
+# strings    → tamanho máximo de campos de texto
+# top_level  → pode aparecer direto em `components` da mensagem
+SPEC = {
+    ACTION_ROW: {
+        "name": "action row",
+        "children": ("components", INTERACTIVE, 1, 5),
+        "top_level": True,
+    },
+    BUTTON: {
+        "name": "botão",
+        "required": ("style",),
+        "strings": {"label": 80, "custom_id": 100, "url": 512},
+    },
+    STRING_SELECT: {
+        "name": "select",
+        "required": ("custom_id", "options"),
+        "strings": {"custom_id": 100, "placeholder": 150},
+    },
+    USER_SELECT: {
+        "name": "select de usuário",
+        "required": ("custom_id",),
+        "strings": {"custom_id": 100, "placeholder": 150},
+    },
+    ROLE_SELECT: {
+        "name": "select de cargo",
+        "required": ("custom_id",),
+        "strings": {"custom_id": 100, "placeholder": 150},
+    },
+    MENTIONABLE_SELECT: {
+        "name": "select de menção",
+        "required": ("custom_id",),
+        "strings": {"custom_id": 100, "placeholder": 150},
+    },
+    CHANNEL_SELECT: {
+        "name": "select de canal",
+        "required": ("custom_id",),
+        "strings": {"custom_id": 100, "placeholder": 150},
+    },
+    SECTION: {
+        "name": "section",
+        "children": ("components", {TEXT_DISPLAY}, 1, 3),
+        "accessory": {BUTTON, THUMBNAIL},
+        "required": ("accessory",),
+        "top_level": True,
+    },
+    TEXT_DISPLAY: {
+        "name": "texto",
+        "required": ("content",),
+        "top_level": True,
+    },
+    THUMBNAIL: {
+        "name": "thumbnail",
+        "required": ("media",),
+        "strings": {"description": 1024},
+    },
+    MEDIA_GALLERY: {
+        "name": "media",
+        "required": ("items",),
+        "top_level": True,
+    },
+    FILE: {
+        "name": "arquivo",
+        "required": ("file",),
+        "top_level": True,
+    },
+    SEPARATOR: {
+        "name": "divider",
+        "top_level": True,
+    },
+    CONTAINER: {
+        "name": "container",
+        "children": (
+            "components",
+            {ACTION_ROW, TEXT_DISPLAY, SECTION, MEDIA_GALLERY, SEPARATOR, FILE},
+            1,
+            MAX_TOTAL_COMPONENTS,
+        ),
+        "top_level": True,
+    },
+}
+
+# ────────────── CHECAGENS ESPECÍFICAS ──────────────
+def _check_button(comp, path):
+    style = comp["style"]
+    if style not in (1, 2, 3, 4, 5, 6):
+        raise ValueError(f"{path}: botão com `style` inválido ({style})")
+
+    if style == 5:
+        if "url" not in comp:
+            raise ValueError(f"{path}: botão link precisa de `url`")
+    elif style == 6:
+        if "sku_id" not in comp:
+            raise ValueError(f"{path}: botão premium precisa de `sku_id`")
+    elif "custom_id" not in comp:
+        raise ValueError(f"{path}: botão precisa de `custom_id`")
+
+    if style in (5, 6) and "custom_id" in comp:
+        raise ValueError(f"{path}: botão link/premium não pode ter `custom_id`")
+
+def _check_string_select(comp, path):
+    options = comp["options"]
+    if not isinstance(options, list) or not 1 <= len(options) <= 25:
+        raise ValueError(f"{path}: select precisa de 1 a 25 `options`")
+
+    for i, option in enumerate(options):
+        if not isinstance(option, dict) or "label" not in option or "value" not in option:
+            raise ValueError(f"{path}.options[{i}]: opção precisa de `label` e `value`")
+        for key, limit in (("label", 100), ("value", 100), ("description", 100)):
+            if len(str(option.get(key, ""))) > limit:
+                raise ValueError(f"{path}.options[{i}]: `{key}` passa de {limit} caracteres")
+
+def _check_select_values(comp, path):
+    min_values = comp.get("min_values", 1)
+    max_values = comp.get("max_values", 1)
+    if not 0 <= min_values <= 25 or not 1 <= max_values <= 25 or min_values > max_values:
+        raise ValueError(f"{path}: `min_values`/`max_values` fora do intervalo 0–25")
+
+def _check_media(media, path):
+    if not isinstance(media, dict) or not media.get("url"):
+        raise ValueError(f"{path}: `media` precisa de `url`")
+
+def _check_thumbnail(comp, path):
+    _check_media(comp["media"], path)
+
+def _check_gallery(comp, path):
+    items = comp["items"]
+    if not isinstance(items, list) or not 1 <= len(items) <= 10:
+        raise ValueError(f"{path}: media precisa de 1 a 10 `items`")
+
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"{path}.items[{i}]: item inválido")
+        _check_media(item.get("media"), f"{path}.items[{i}]")
+        if len(item.get("description") or "") > 1024:
+            raise ValueError(f"{path}.items[{i}]: `description` passa de 1024 caracteres")
+
+def _check_file(comp, path):
+    file = comp["file"]
+    if not isinstance(file, dict) or not str(file.get("url", "")).startswith("attachment://"):
+        raise ValueError(f"{path}: arquivo precisa de `file.url` no formato attachment://")
+
+def _check_separator(comp, path):
+    if comp.get("spacing", 1) not in (1, 2):
+        raise ValueError(f"{path}: divider com `spacing` inválido")
+
+def _check_container(comp, path):
+    color = comp.get("accent_color")
+    if color is not None and not (isinstance(color, int) and 0 <= color <= 0xFFFFFF):
+        raise ValueError(f"{path}: `accent_color` precisa ser um inteiro RGB")
+
+def _check_action_row(comp, path):
+    types = [child.get("type") for child in comp["components"] if isinstance(child, dict)]
+    if any(t in SELECTS for t in types) and len(types) > 1:
+        raise ValueError(f"{path}: action row com select só pode ter 1 componente")
+
+CHECKS = {
+    ACTION_ROW: (_check_action_row,),
+    BUTTON: (_check_button,),
+    STRING_SELECT: (_check_string_select, _check_select_values),
+    USER_SELECT: (_check_select_values,),
+    ROLE_SELECT: (_check_select_values,),
+    MENTIONABLE_SELECT: (_check_select_values,),
+    CHANNEL_SELECT: (_check_select_values,),
+    THUMBNAIL: (_check_thumbnail,),
+    MEDIA_GALLERY: (_check_gallery,),
+    FILE: (_check_file,),
+    SEPARATOR: (_check_separator,),
+    CONTAINER: (_check_container,),
+}
+
+# ────────────── WALKER ITERATIVO ──────────────
+def _walk(components: list, v2: bool):
+    if not v2 and len(components) > MAX_LEGACY_ROWS:
+        raise ValueError(f"Sem a flag Components V2 o limite é {MAX_LEGACY_ROWS} action rows")
+
+    total = 0
+    text = 0
+    custom_ids = set()
+
+    # pilha explícita: (componente, caminho, tipos permitidos, profundidade)
+    stack = [
+        (comp, f"components[{i}]", None, 1)
+        for i, comp in reversed(list(enumerate(components)))
+    ]
+
+    while stack:
+        comp, path, allowed, depth = stack.pop()
+
+        if not isinstance(comp, dict) or "type" not in comp:
+            raise ValueError(f"{path} sem campo `type`")
+
+        ctype = comp["type"]
+        spec = SPEC.get(ctype)
+        if spec is None:
+            raise ValueError(f"{path}: tipo não suportado ({ctype})")
+
+        name = spec["name"]
+
+        if allowed is None:
+            if not spec.get("top_level") or (not v2 and ctype != ACTION_ROW):
+                raise ValueError(f"{path}: {name} não pode ficar no topo da mensagem")
+        elif ctype not in allowed:
+            raise ValueError(f"{path}: {name} não é permitido aqui")
+
+        if depth > MAX_DEPTH:
+            raise ValueError(f"{path}: aninhamento passa de {MAX_DEPTH} níveis")
+
+        total += 1
+        if v2 and total > MAX_TOTAL_COMPONENTS:
+            raise ValueError(f"A mensagem passa de {MAX_TOTAL_COMPONENTS} componentes")
+
+        for field in spec.get("required", ()):
+            if field not in comp:
+                raise ValueError(f"{path}: {name} sem `{field}`")
+
+        for field, limit in spec.get("strings", {}).items():
+            value = comp.get(field)
+            if value is not None and len(str(value)) > limit:
+                raise ValueError(f"{path}: `{field}` passa de {limit} caracteres")
+
+        if ctype == TEXT_DISPLAY:
+            text += len(str(comp["content"]))
+            if text > MAX_TOTAL_TEXT:
+                raise ValueError(f"Os textos somam mais de {MAX_TOTAL_TEXT} caracteres")
+
+        custom_id = comp.get("custom_id")
+        if custom_id is not None:
+            if custom_id in custom_ids:
+                raise ValueError(f"{path}: `custom_id` duplicado ({custom_id})")
+            custom_ids.add(custom_id)
+
+        children = spec.get("children")
+        if children is not None:
+            key, child_types, min_len, max_len = children
+            items = comp.get(key)
+            if not isinstance(items, list):
+                raise ValueError(f"{path}: {name} precisa de `{key}`")
+            if not min_len <= len(items) <= max_len:
+                raise ValueError(f"{path}: {name} precisa de {min_len} a {max_len} componentes")
+
+        for check in CHECKS.get(ctype, ()):
+            check(comp, path)
+
+        if children is not None:
+            for i in range(len(items) - 1, -1, -1):
+                stack.append((items[i], f"{path}.{key}[{i}]", child_types, depth + 1))
+
+        if "accessory" in spec:
+            stack.append((comp["accessory"], f"{path}.accessory", spec["accessory"], depth + 1))
+
+def _validate(payload: dict):
+    if not isinstance(payload, dict):
+        raise ValueError("O payload precisa ser um objeto JSON")
+
+    if not any(k in payload for k in ("content", "embeds", "components")):
+        raise ValueError(
+            "Payload inválido: é necessário `content`, `embeds` ou `components`"
+        )
+
+    v2 = bool(payload.get("flags", 0) & IS_COMPONENTS_V2)
+
+    if v2 and (payload.get("content") or payload.get("embeds")):
+        raise ValueError("Com a flag Components V2 não é possível usar `content` ou `embeds`")
+
+    if len(payload.get("content") or "") > MAX_CONTENT:
+        raise ValueError(f"`content` passa de {MAX_CONTENT} caracteres")
+
+    if len(payload.get("embeds") or []) > MAX_EMBEDS:
+        raise ValueError(f"Máximo de {MAX_EMBEDS} embeds por mensagem")
+
+    if "components" not in payload:
+        return  # payload só de texto/embed é válido
+
+    if not isinstance(payload["components"], list):
+        raise ValueError("`components` precisa ser uma lista")
+
+    _walk(payload["components"], v2)
+
+# ────────────── MEMOIZAÇÃO POR HASH DO CONTEÚDO ──────────────
+CACHE_SIZE = 256
+_results: OrderedDict[str, str | None] = OrderedDict()
+
+def payload_hash(payload) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+def validate_payload(payload: dict):
+    try:
+        key = payload_hash(payload)
+    except (TypeError, ValueError, RecursionError):
+        key = None  # não serializável / fundo demais: valida sem cache
+
+    if key is not None and key in _results:
+        _results.move_to_end(key)
+        error = _results[key]
+        if error is not None:
+            raise ValueError(error)
+        return
+
+    try:
+        _validate(payload)
+        error = None
+    except ValueError as e:
+        error = str(e)
+
+    if key is not None:
+        _results[key] = error
+        if len(_results) > CACHE_SIZE:
+            _results.popitem(last=False)
+
+    if error is not None:
+        raise ValueError(error)
+
+def clear_cache():
+    _results.clear()
@@ -0,0 +1,100 @@
+import discord
+
+# ────────────── LIMITES DO DISCORD ──────────────
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_CHARS_PER_MESSAGE = 6000    # soma de todos os embeds da mensagem
+MAX_FIELDS_PER_EMBED = 25
+
+TEXT_LIMITS = {
+    "title": 256,
+    "description": 4096,
+    "field name": 256,
+    "field value": 1024,
+    "footer": 2048,
+    "author": 256,
+}
+
+# Textos individuais não são cortados (mudaria o conteúdo): estourou,
+# o arquivo é recusado antes de qualquer envio.
+def _check_text(index: int, part: str, text: str | None):
+    if text and len(text) > TEXT_LIMITS[part]:
+        raise ValueError(
+            f"Embed #{index}: {part} com {len(text)} caracteres (máx. {TEXT_LIMITS[part]})"
+        )
+
+def check_limits(index: int, embed: discord.Embed):
+    _check_text(index, "title", embed.title)
+    _check_text(index, "description", embed.description)
+    _check_text(index, "footer", embed.footer.text)
+    _check_text(index, "author", embed.author.name)
+    for field in embed.fields:
+        _check_text(index, "field name", field.name)
+        _check_text(index, "field value", field.value)
+
+# ────────────── DIVISÃO DE FIELDS ──────────────
+# Embed com mais de 25 fields (ou mais de 6000 caracteres) vira uma
+# sequência: o primeiro mantém título/descrição/autor, os seguintes só
+# continuam os fields na mesma cor; o footer fica no último.
+def split_embed(embed: discord.Embed) -> list[discord.Embed]:
+    if len(embed.fields) <= MAX_FIELDS_PER_EMBED and len(embed) <= MAX_CHARS_PER_MESSAGE:
+        return [embed]
+
+    footer = embed.footer.text
+    fields = embed.fields
+    # cópia profunda: o embed recebido (cache de templates) nunca é alterado
+    head = discord.Embed.from_dict(embed.to_dict())
+    head.clear_fields()
+    head.remove_footer()
+
+    parts = [head]
+    current = head
+    for field in fields:
+        if (
+            len(current.fields) >= MAX_FIELDS_PER_EMBED
+            or len(current) + len(field.name) + len(field.value) > MAX_CHARS_PER_MESSAGE
+        ):
+            current = discord.Embed(color=embed.color)
+            parts.append(current)
+        current.add_field(name=field.name, value=field.value, inline=field.inline)
+
+    if footer:
+        if len(current) + len(footer) > MAX_CHARS_PER_MESSAGE:
+            current = discord.Embed(color=embed.color)
+            parts.append(current)
+        current.set_footer(text=footer)
+
+    return parts
+
+# ────────────── EMPACOTAMENTO ──────────────
+# Guloso na ordem do arquivo: enche a mensagem até 10 embeds / 6000
+# caracteres e abre a próxima. Como a ordem é fixa, isso já dá o menor
+# número de mensagens possível.
+def pack(embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+    messages: list[list[discord.Embed]] = []
+    current: list[discord.Embed] = []
+    size = 0
+
+    for embed in (part for e in embeds for part in split_embed(e)):
+        if current and (
+            len(current) >= MAX_EMBEDS_PER_MESSAGE
+            or size + len(embed) > MAX_CHARS_PER_MESSAGE
+        ):
+            messages.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += len(embed)
+
+    if current:
+        messages.append(current)
+    return messages
+
+def describe_plan(messages: list[list[discord.Embed]]) -> str:
+    total = sum(len(message) for message in messages)
+    lines = [f"📦 **{len(messages)}** mensagem(ns) • {total} embeds por canal"]
+    lines += [
+        f"• #{i}: {len(message)} embeds, {sum(len(e) for e in message)} caracteres"
+        for i, message in enumerate(messages[:10], start=1)
+    ]
+    if len(messages) > 10:
+        lines.append(f"• e mais {len(messages) - 10} mensagens")
+    return "\n".join(lines)
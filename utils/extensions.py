@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+
+import discord
+
+from utils import guild_config
+from utils.command_sync import sync_if_changed
+
+EXTENSIONS = (
+    "commands.embeds",
+    "commands.raw",
+    "commands.moderation",
+    "commands.sync",
+    "commands.invite",
+    "commands.stats",
+    "commands.channel_groups",
+    "commands.history",
+    "commands.config",
+    "commands.reload",
+    "commands.automod",
+    "commands.antiflood",
+)
+
+# com o launcher, só o worker 0 sincroniza os comandos
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "1") != "0"
+
+# duração do último load/reload de cada extensão (segundos), para consulta
+load_timings: dict[str, float] = {}
+
+# ────────────── CARGA INICIAL EM PARALELO ──────────────
+# Os cogs não dependem uns dos outros: o import/setup de cada um roda em
+# sequência (CPU), mas o que esperam em cog_load (disco, API) se sobrepõe.
+# Uma extensão quebrada não impede as demais; o erro sobe no fim.
+async def _timed_load(bot, name: str):
+    start = time.perf_counter()
+    await bot.load_extension(name)
+    load_timings[name] = time.perf_counter() - start
+
+async def load_all(bot, extensions=EXTENSIONS):
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_timed_load(bot, name) for name in extensions),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+
+    failed = [(name, r) for name, r in zip(extensions, results) if isinstance(r, BaseException)]
+    slowest = sorted(load_timings.items(), key=lambda item: item[1], reverse=True)[:3]
+    print(
+        f"⏱️ Extensões: {len(extensions) - len(failed)} carregadas em {elapsed * 1000:.0f}ms"
+        f" (mais lentas: {', '.join(f'{n} {t * 1000:.0f}ms' for n, t in slowest)})"
+    )
+    for name, error in failed:
+        print(f"❌ Falha ao carregar {name}: {error!r}")
+    if failed:
+        raise failed[0][1]
+
+# ────────────── HAND-OFF DE ESTADO NO RELOAD ──────────────
+# Cogs com estado de longa duração implementam `export_state() -> dict`;
+# o cog novo recupera o estado com `take_state` no próprio cog_load, antes
+# de começar a receber eventos. As filas de log vivem em utils.logger, que
+# não é recarregado: sobrevivem ao reload sem precisar de hand-off.
+_handoff: dict[str, dict] = {}
+
+def take_state(cog_name: str) -> dict | None:
+    # não remove: se o módulo novo falhar, o antigo recarregado usa de novo
+    return _handoff.get(cog_name)
+
+async def reload_with_state(bot, name: str) -> tuple[float, list[str]]:
+    handed = []
+    for cog in list(bot.cogs.values()):
+        if cog.__module__ == name and hasattr(cog, "export_state"):
+            _handoff[cog.qualified_name] = cog.export_state()
+            handed.append(cog.qualified_name)
+
+    start = time.perf_counter()
+    try:
+        # se o módulo novo falhar, o discord.py volta para o antigo (que
+        # também recupera o estado em cog_load)
+        await bot.reload_extension(name)
+    finally:
+        for cog_name in handed:
+            _handoff.pop(cog_name, None)
+    load_timings[name] = elapsed = time.perf_counter() - start
+
+    return elapsed, handed
+
+# ────────────── ÁRVORE DE COMANDOS ──────────────
+# A guild principal recebe uma cópia dos comandos globais (aparecem na
+# hora). Depois de um reload a cópia aponta para o cog antigo: refaz.
+async def refresh_commands(tree: discord.app_commands.CommandTree) -> list[dict]:
+    guild = discord.Object(id=guild_config.PRIMARY_GUILD_ID)
+    tree.clear_commands(guild=guild)
+    tree.copy_global_to(guild=guild)
+
+    if not SYNC_COMMANDS:
+        return []
+
+    # sync só quando a árvore mudou (hash persistido por escopo)
+    return [await sync_if_changed(tree, guild=scope) for scope in (None, guild)]
@@ -0,0 +1,99 @@
+import os
+import time
+from array import array
+from collections import OrderedDict
+
+# ────────────── LIMITES (ENV) ──────────────
+FLOOD_MESSAGES = int(os.getenv("FLOOD_MESSAGES", 6))          # mensagens...
+FLOOD_SECONDS = float(os.getenv("FLOOD_SECONDS", 5))          # ...nesta janela
+FLOOD_TIMEOUT_MINUTES = int(os.getenv("FLOOD_TIMEOUT_MINUTES", 10))
+FLOOD_MAX_TRACKED = int(os.getenv("FLOOD_MAX_TRACKED", 100_000))
+
+RAID_JOINS = int(os.getenv("RAID_JOINS", 10))                 # entradas...
+RAID_SECONDS = float(os.getenv("RAID_SECONDS", 10))           # ...nesta janela
+RAID_LOCKDOWN_MINUTES = int(os.getenv("RAID_LOCKDOWN_MINUTES", 10))
+
+# ────────────── JANELA DESLIZANTE (RING BUFFER) ──────────────
+# Guarda só os últimos `limit` instantes num array de doubles (sem objetos
+# float). O `limit`-ésimo evento dentro da janela dispara: depois de gravar
+# o atual, o mais antigo dos últimos `limit` (contando ele) ainda está na
+# janela. Uma comparação, O(1).
+class RateWindow:
+    __slots__ = ("times", "head", "count", "last")
+
+    def __init__(self, limit: int):
+        self.times = array("d", bytes(8 * limit))
+        self.head = 0
+        self.count = 0
+        self.last = 0.0
+
+    def hit(self, now: float, window: float) -> bool:
+        times = self.times
+        times[self.head] = now
+        self.head = (self.head + 1) % len(times)
+        if self.count < len(times):
+            self.count += 1
+        self.last = now
+        # buffer cheio: times[head] é o mais antigo dos últimos `limit`
+        return self.count >= len(times) and now - times[self.head] <= window
+
+    def reset(self):
+        self.count = 0
+
+# ────────────── RASTREADOR COM DESPEJO ──────────────
+# chave → RateWindow em ordem de último uso. Cada evento move a chave
+# para o fim; do início saem as ociosas (sem evento há mais de uma
+# janela, que não podem mais estourar) e, acima de `max_tracked`, as
+# menos recentes. Memória limitada, custo O(1) amortizado por evento.
+class RateTracker:
+    def __init__(self, limit: int, window: float, max_tracked: int):
+        self.limit = limit
+        self.window = window
+        self.max_tracked = max_tracked
+        self._entries: OrderedDict = OrderedDict()
+
+    def hit(self, key, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        entries = self._entries
+
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = RateWindow(self.limit)
+        else:
+            entries.move_to_end(key)
+        exceeded = entry.hit(now, self.window)
+
+        # no máximo duas remoções por evento: o custo não acumula
+        for _ in range(2):
+            oldest_key, oldest = next(iter(entries.items()))
+            if oldest is entry:
+                break
+            if now - oldest.last > self.window or len(entries) > self.max_tracked:
+                del entries[oldest_key]
+            else:
+                break
+
+        return exceeded
+
+    def forget(self, key):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# ────────────── ENTRADAS POR GUILD (RAID) ──────────────
+# Janela de entradas + os IDs dos últimos `limit` que entraram, para
+# punir também quem chegou antes do alarme disparar.
+class JoinWindow(RateWindow):
+    __slots__ = ("member_ids",)
+
+    def __init__(self, limit: int):
+        super().__init__(limit)
+        self.member_ids = array("Q", bytes(8 * limit))
+
+    def join(self, member_id: int, now: float, window: float) -> bool:
+        self.member_ids[self.head] = member_id
+        return self.hit(now, window)
+
+    def recent(self) -> list[int]:
+        return [member_id for member_id in self.member_ids[:self.count] if member_id]
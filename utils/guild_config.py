@@ -0,0 +1,132 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+from utils.sqlite_db import SQLiteDB
+from utils.thread_store import THREADS_FILE, load_thread_ids
+
+CONFIG_DB = "data/guild_config.db"
+LEGACY_GROUPS_FILE = "data/channel_groups.json"
+CONFIG_CACHE_SIZE = 256
+
+# ────────────── GUILD PRINCIPAL (CONFIG ANTIGA) ──────────────
+# A guild que o bot atendia sozinho herda o canal de logs, os webhooks do
+# .env e o mapa de threads antigo. As demais começam vazias (sem logs em
+# thread/webhook até um /config).
+PRIMARY_GUILD_ID = int(os.getenv("GUILD_ID", 797637779332661258))
+PRIMARY_LOG_CHANNEL_ID = int(os.getenv("LOG_CHANNEL_ID", 1468183917562433618))
+
+def _env_webhooks() -> dict[str, str]:
+    url = os.getenv("LOG_WEBHOOK_URL")
+    webhooks = {
+        "Mute": os.getenv("LOG_WEBHOOK_MUTE") or url,
+        "Mute (Apps)": os.getenv("LOG_WEBHOOK_MUTE") or url,
+        "Unmute": os.getenv("LOG_WEBHOOK_UNMUTE") or url,
+        "Kick": os.getenv("LOG_WEBHOOK_KICK") or url,
+        "Ban": os.getenv("LOG_WEBHOOK_BAN") or url,
+        "DEFAULT": os.getenv("LOG_WEBHOOK_DEFAULT") or url,
+    }
+    return {action: value for action, value in webhooks.items() if value}
+
+os.makedirs("data", exist_ok=True)
+
+# ────────────── SCHEMA ──────────────
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_config (
+    guild_id        INTEGER PRIMARY KEY,
+    log_channel_id  INTEGER,
+    webhooks        TEXT NOT NULL DEFAULT '{}',
+    threads         TEXT NOT NULL DEFAULT '{}',
+    channel_groups  TEXT NOT NULL DEFAULT '{}',
+    updated_at      REAL
+);
+"""
+
+JSON_FIELDS = ("webhooks", "threads", "channel_groups")
+
+_db = SQLiteDB(CONFIG_DB, SCHEMA)
+_lock = _db.lock
+_connect = _db.connect
+close = _db.close
+
+# ────────────── CONFIG DE UMA GUILD ──────────────
+# webhooks: ação → URL  •  threads: nome da thread → ID
+# channel_groups: nome do grupo → [IDs de canal]
+class GuildConfig:
+    __slots__ = ("guild_id", "log_channel_id", "webhooks", "threads", "channel_groups")
+
+    def __init__(self, guild_id: int, log_channel_id: int | None = None, webhooks: dict | None = None,
+                 threads: dict | None = None, channel_groups: dict | None = None):
+        self.guild_id = guild_id
+        self.log_channel_id = log_channel_id
+        self.webhooks: dict[str, str] = webhooks or {}
+        self.threads: dict[str, int] = threads or {}
+        self.channel_groups: dict[str, list[int]] = channel_groups or {}
+
+    def save(self):
+        with _lock:
+            _connect().execute(
+                "INSERT OR REPLACE INTO guild_config VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.guild_id,
+                    self.log_channel_id,
+                    *(json.dumps(getattr(self, field), ensure_ascii=False) for field in JSON_FIELDS),
+                    time.time()
+                )
+            )
+
+# ────────────── MIGRAÇÃO (ARQUIVOS ANTIGOS) ──────────────
+# Só na primeira vez que a guild aparece (sem linha no banco): depois
+# disso o banco é a fonte da verdade.
+def _legacy_groups(guild_id: int) -> dict[str, list[int]]:
+    try:
+        with open(LEGACY_GROUPS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return data.get(str(guild_id), {}) if isinstance(data, dict) else {}
+
+def _new_config(guild_id: int) -> GuildConfig:
+    config = GuildConfig(guild_id, channel_groups=_legacy_groups(guild_id))
+
+    if guild_id == PRIMARY_GUILD_ID:
+        config.log_channel_id = PRIMARY_LOG_CHANNEL_ID
+        config.webhooks = _env_webhooks()
+        config.threads = load_thread_ids()
+
+    if config.log_channel_id or config.channel_groups:
+        config.save()
+    if guild_id == PRIMARY_GUILD_ID and os.path.exists(THREADS_FILE):
+        os.replace(THREADS_FILE, f"{THREADS_FILE}.migrated")
+    return config
+
+def _load(guild_id: int) -> GuildConfig:
+    with _lock:
+        row = _connect().execute("SELECT * FROM guild_config WHERE guild_id = ?", (guild_id,)).fetchone()
+
+    if row is None:
+        return _new_config(guild_id)
+
+    return GuildConfig(
+        guild_id,
+        log_channel_id=row["log_channel_id"],
+        **{field: json.loads(row[field]) for field in JSON_FIELDS}
+    )
+
+# ────────────── CACHE LRU ──────────────
+# Carregada sob demanda na primeira vez que a guild aparece; só as
+# CONFIG_CACHE_SIZE mais usadas ficam em memória. Cada guild é atendida
+# por um único processo (o do seu shard), então o cache não fica velho.
+_cache: OrderedDict[int, GuildConfig] = OrderedDict()
+
+def get(guild_id: int) -> GuildConfig:
+    config = _cache.get(guild_id)
+    if config is not None:
+        _cache.move_to_end(guild_id)
+        return config
+
+    config = _cache[guild_id] = _load(guild_id)
+    if len(_cache) > CONFIG_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return config
@@ -0,0 +1,228 @@
+import asyncio
+import os
+import re
+import sqlite3
+import time
+
+from utils.sqlite_db import SQLiteDB
+
+HISTORY_DB = "data/history.db"
+WRITE_BATCH = 200  # registros por transação no escritor em segundo plano
+
+os.makedirs("data", exist_ok=True)
+
+# ────────────── SCHEMA ──────────────
+# Cada log_action vira uma linha estruturada (guild, ação, autor, alvos,
+# tempo) + índice FTS5 do título/descrição para a busca livre de /logs.
+# event_id é único: reimportar o mesmo evento (backfill) não duplica.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id     TEXT NOT NULL UNIQUE,
+    guild_id     INTEGER,
+    action       TEXT NOT NULL,
+    author_id    INTEGER,
+    title        TEXT,
+    description  TEXT,
+    created_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_guild ON events(guild_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_events_author ON events(author_id, created_at);
+
+CREATE TABLE IF NOT EXISTS event_targets (
+    target_id  INTEGER NOT NULL,
+    event      INTEGER NOT NULL,
+    PRIMARY KEY (target_id, event)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_targets_event ON event_targets(event);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    title, description, action,
+    content='events', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, title, description, action)
+    VALUES (new.id, new.title, new.description, new.action);
+END;
+CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, title, description, action)
+    VALUES ('delete', old.id, old.title, old.description, old.action);
+    DELETE FROM event_targets WHERE event = old.id;
+END;
+"""
+
+_db = SQLiteDB(HISTORY_DB, SCHEMA)
+_lock = _db.lock
+_connect = _db.connect
+close = _db.close
+
+# ────────────── IDS A PARTIR DO TEXTO DO EMBED ──────────────
+# Fallback para quem não passa autor/alvos (e para o backfill): os logs
+# seguem o padrão "🛡️ Autor: <@id>" / "👤 Alvo: <@id>".
+_AUTHOR_RE = re.compile(r"(?:Autor|Moderador):\**\s*<@!?(\d+)>")
+_TARGET_LINE_RE = re.compile(r"(?:Alvos?|Membro):\**\s*(.*)")
+_MENTION_RE = re.compile(r"<@!?(\d+)>")
+
+def extract_ids(description: str | None) -> tuple[int | None, list[int]]:
+    text = description or ""
+    author = _AUTHOR_RE.search(text)
+    targets = []
+    for line in _TARGET_LINE_RE.findall(text):
+        targets += [int(i) for i in _MENTION_RE.findall(line)]
+    return (int(author.group(1)) if author else None), list(dict.fromkeys(targets))
+
+# ────────────── ESCRITA ──────────────
+# record: dict com event_id, guild_id, action, author_id, target_ids,
+# title, description, created_at
+def record_many(records: list[dict]) -> int:
+    inserted = 0
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            for rec in records:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO events "
+                    "(event_id, guild_id, action, author_id, title, description, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        rec["event_id"], rec.get("guild_id"), rec["action"], rec.get("author_id"),
+                        rec.get("title"), rec.get("description"), rec.get("created_at") or time.time()
+                    )
+                )
+                if not cur.rowcount:
+                    continue  # evento já registrado
+                inserted += 1
+                conn.executemany(
+                    "INSERT OR IGNORE INTO event_targets (target_id, event) VALUES (?, ?)",
+                    [(target_id, cur.lastrowid) for target_id in rec.get("target_ids") or ()]
+                )
+    return inserted
+
+def record(**rec) -> bool:
+    return record_many([rec]) == 1
+
+# ────────────── ESCRITA EM SEGUNDO PLANO ──────────────
+# log_action só enfileira: um único escritor junta o que chegou e grava
+# numa transação em thread separada, fora do event loop. Falha no
+# histórico nunca impede o log.
+_pending: asyncio.Queue | None = None
+_writer: asyncio.Task | None = None
+
+def submit(**rec):
+    global _pending, _writer
+    if _writer is None or _writer.done():
+        _pending = asyncio.Queue()
+        _writer = asyncio.create_task(_write_loop(_pending), name="history-writer")
+    _pending.put_nowait(rec)
+
+async def _write_loop(queue: asyncio.Queue):
+    while True:
+        rec = await queue.get()
+        if rec is None:
+            return
+
+        batch, closing = [rec], False
+        while len(batch) < WRITE_BATCH:
+            try:
+                nxt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if nxt is None:
+                closing = True  # sentinela: grava o lote e encerra
+                break
+            batch.append(nxt)
+
+        try:
+            await asyncio.to_thread(record_many, batch)
+        except Exception as e:
+            print(f"⚠️ Histórico: falha ao registrar {len(batch)} eventos: {e!r}")
+
+        if closing:
+            return
+
+async def close_writer():
+    # drena o que já foi enfileirado antes de fechar o banco
+    global _pending, _writer
+    if _writer is not None and not _writer.done():
+        _pending.put_nowait(None)
+        await _writer
+    _pending = _writer = None
+
+# ────────────── CONSULTA ──────────────
+def _with_targets(conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> list[dict]:
+    events = [dict(row) for row in rows]
+    if not events:
+        return events
+
+    by_id = {event["id"]: event for event in events}
+    for event in events:
+        event["target_ids"] = []
+    marks = ",".join("?" * len(by_id))
+    for row in conn.execute(f"SELECT event, target_id FROM event_targets WHERE event IN ({marks})", list(by_id)):
+        by_id[row["event"]]["target_ids"].append(row["target_id"])
+    return events
+
+def by_target(guild_id: int, target_id: int, *, limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+    with _lock:
+        conn = _connect()
+        total = conn.execute(
+            "SELECT COUNT(*) FROM event_targets t JOIN events e ON e.id = t.event "
+            "WHERE t.target_id = ? AND e.guild_id = ?",
+            (target_id, guild_id)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT e.* FROM event_targets t JOIN events e ON e.id = t.event "
+            "WHERE t.target_id = ? AND e.guild_id = ? "
+            "ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+            (target_id, guild_id, limit, offset)
+        ).fetchall()
+        return _with_targets(conn, rows), total
+
+def _fts_query(text: str) -> str:
+    # cada palavra vira um prefixo literal: sem erro de sintaxe do FTS5
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"*' for t in terms)
+
+def search(guild_id: int, query: str | None = None, *, action: str | None = None,
+           author_id: int | None = None, limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+    where = ["e.guild_id = ?"]
+    params: list = [guild_id]
+
+    if query and query.strip():
+        # subconsulta: o FTS resolve o MATCH uma vez, em vez de por linha
+        where.append("e.id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)")
+        params.append(_fts_query(query))
+    if action:
+        where.append("e.action = ?")
+        params.append(action)
+    if author_id:
+        where.append("e.author_id = ?")
+        params.append(author_id)
+
+    clause = " AND ".join(where)
+    with _lock:
+        conn = _connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM events e WHERE {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT e.* FROM events e WHERE {clause} ORDER BY e.created_at DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return _with_targets(conn, rows), total
+
+def oldest_live(guild_id: int) -> float | None:
+    # primeiro evento registrado ao vivo (backfill usa "msg:" / "file:")
+    with _lock:
+        row = _connect().execute(
+            "SELECT MIN(created_at) FROM events "
+            "WHERE guild_id = ? AND event_id NOT LIKE 'msg:%' AND event_id NOT LIKE 'file:%'",
+            (guild_id,)
+        ).fetchone()
+    return row[0]
+
+def actions(guild_id: int) -> list[str]:
+    with _lock:
+        rows = _connect().execute(
+            "SELECT DISTINCT action FROM events WHERE guild_id = ? ORDER BY action", (guild_id,)
+        ).fetchall()
+    return [row["action"] for row in rows]
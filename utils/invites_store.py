@@ -1,25 +1,248 @@
 import json
 import os
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timezone
 
-INVITES_FILE = "data/invites.json"
+from utils.guild_config import PRIMARY_GUILD_ID
+from utils.sqlite_db import SQLiteDB
+
+INVITES_DB = "data/invites.db"
+
+# arquivos antigos, migrados uma única vez para o banco
+LEGACY_LIST_FILE = "data/invites.json"   # lista (utils antigo)
+LEGACY_DICT_FILE = "invites.json"        # dict code → info (InviteManager antigo)
 
 os.makedirs("data", exist_ok=True)
 
-def load_invites():
-    if not os.path.exists(INVITES_FILE):
-        return []
-    with open(INVITES_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+# ────────────── SCHEMA ──────────────
+# SQLite em WAL: inserts/deletes O(1) por índice, escrita atômica e segura
+# contra crash, sem reescrever o arquivo inteiro a cada comando.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invites (
+    code        TEXT PRIMARY KEY,
+    guild_id    INTEGER,
+    channel_id  INTEGER,
+    inviter_id  INTEGER,
+    max_uses    INTEGER NOT NULL DEFAULT 0,
+    uses        INTEGER NOT NULL DEFAULT 0,
+    created_at  REAL,
+    expires_at  REAL,
+    extra       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_invites_guild ON invites(guild_id);
+CREATE INDEX IF NOT EXISTS idx_invites_expires ON invites(expires_at);
+CREATE INDEX IF NOT EXISTS idx_invites_used_up ON invites(code) WHERE max_uses > 0 AND uses >= max_uses;
+
+CREATE TABLE IF NOT EXISTS invite_joins (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id    INTEGER NOT NULL,
+    member_id   INTEGER NOT NULL,
+    code        TEXT,
+    joined_at   REAL NOT NULL,
+    ambiguous   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_joins_code ON invite_joins(code);
+CREATE INDEX IF NOT EXISTS idx_joins_guild ON invite_joins(guild_id, joined_at);
+"""
+
+COLUMNS = ("code", "guild_id", "channel_id", "inviter_id", "max_uses", "uses", "created_at", "expires_at")
+
+_db = SQLiteDB(INVITES_DB, SCHEMA, on_open=lambda conn: _migrate_legacy(conn))
+_lock = _db.lock
+_connect = _db.connect
+close = _db.close
+
+# ────────────── CONVERSÕES ──────────────
+def to_timestamp(value) -> float | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)  # formato antigo: utcnow() sem tz
+    return dt.timestamp()
+
+def _row_to_dict(row: sqlite3.Row) -> dict:
+    data = {key: row[key] for key in COLUMNS}
+    if row["extra"]:
+        data.update(json.loads(row["extra"]))
+    return data
+
+def _to_params(data: dict) -> dict:
+    params = {key: data.get(key) for key in COLUMNS}
+    params["max_uses"] = params["max_uses"] or 0
+    params["uses"] = params["uses"] or 0
+    params["created_at"] = to_timestamp(params["created_at"]) or datetime.now(timezone.utc).timestamp()
+    params["expires_at"] = to_timestamp(params["expires_at"])
+    extra = {k: v for k, v in data.items() if k not in COLUMNS}
+    params["extra"] = json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+    return params
+
+# ────────────── MIGRAÇÃO DOS JSON ANTIGOS ──────────────
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+        return json.loads(content) if content else None
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _migrate_legacy(conn: sqlite3.Connection):
+    records = []
+
+    legacy_list = _read_json(LEGACY_LIST_FILE)
+    if isinstance(legacy_list, list):
+        records += [item for item in legacy_list if isinstance(item, dict) and item.get("code")]
+
+    legacy_dict = _read_json(LEGACY_DICT_FILE)
+    if isinstance(legacy_dict, dict):
+        records += [
+            {"code": code, **info}
+            for code, info in legacy_dict.items()
+            if isinstance(info, dict)
+        ]
 
-def save_invites(invites: list):
-    with open(INVITES_FILE, "w", encoding="utf-8") as f:
-        json.dump(invites, f, indent=4, ensure_ascii=False)
+    # os arquivos antigos eram de uma guild só (sem guild_id): a principal
+    for r in records:
+        r["guild_id"] = r.get("guild_id") or PRIMARY_GUILD_ID
 
+    with conn:
+        conn.execute("BEGIN")
+        if records:
+            conn.executemany(
+                "INSERT OR IGNORE INTO invites VALUES "
+                "(:code, :guild_id, :channel_id, :inviter_id, :max_uses, :uses, :created_at, :expires_at, :extra)",
+                [_to_params(r) for r in records]
+            )
+        # bancos migrados antes desta correção ficaram com guild_id NULL:
+        # sem isso somem do /convite_listar
+        fixed = conn.execute(
+            "UPDATE invites SET guild_id = ? WHERE guild_id IS NULL", (PRIMARY_GUILD_ID,)
+        ).rowcount
+    if records:
+        print(f"📦 {len(records)} invites migrados para {INVITES_DB}")
+    if fixed:
+        print(f"📦 {fixed} invites antigos atribuídos à guild principal")
+
+    for path in (LEGACY_LIST_FILE, LEGACY_DICT_FILE):
+        if os.path.exists(path):
+            os.replace(path, f"{path}.migrated")
+
+# ────────────── API ──────────────
 def add_invite(data: dict):
-    invites = load_invites()
-    invites.append(data)
-    save_invites(invites)
+    with _lock:
+        _connect().execute(
+            "INSERT OR REPLACE INTO invites VALUES "
+            "(:code, :guild_id, :channel_id, :inviter_id, :max_uses, :uses, :created_at, :expires_at, :extra)",
+            _to_params(data)
+        )
+
+def remove_invite(code: str) -> bool:
+    with _lock:
+        cur = _connect().execute("DELETE FROM invites WHERE code = ?", (code,))
+    return cur.rowcount > 0
+
+def remove_invites(codes) -> int:
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            cur = conn.executemany("DELETE FROM invites WHERE code = ?", [(c,) for c in codes])
+    return cur.rowcount
+
+def get_invite(code: str) -> dict | None:
+    with _lock:
+        row = _connect().execute("SELECT * FROM invites WHERE code = ?", (code,)).fetchone()
+    return _row_to_dict(row) if row else None
+
+def list_invites(guild_id: int | None = None) -> list[dict]:
+    with _lock:
+        if guild_id is None:
+            rows = _connect().execute("SELECT * FROM invites ORDER BY created_at").fetchall()
+        else:
+            rows = _connect().execute(
+                "SELECT * FROM invites WHERE guild_id = ? ORDER BY created_at", (guild_id,)
+            ).fetchall()
+    return [_row_to_dict(row) for row in rows]
+
+def count_invites(guild_id: int | None = None) -> int:
+    with _lock:
+        if guild_id is None:
+            return _connect().execute("SELECT COUNT(*) FROM invites").fetchone()[0]
+        return _connect().execute(
+            "SELECT COUNT(*) FROM invites WHERE guild_id = ?", (guild_id,)
+        ).fetchone()[0]
+
+# ────────────── EXPIRAÇÃO ──────────────
+# `shards`: (shard_count, shard_ids) de utils.sharding.owned_shards — com
+# vários processos, cada um só agenda e remove os invites das suas guilds
+# (mesma fórmula de shard_for). Invites sem guild ficam com todos.
+def _shard_clause(shards: tuple[int, list[int]] | None) -> tuple[str, list]:
+    if shards is None:
+        return "", []
+    shard_count, shard_ids = shards
+    marks = ",".join("?" * len(shard_ids))
+    return f" AND (guild_id IS NULL OR (guild_id >> 22) % ? IN ({marks}))", [shard_count, *shard_ids]
+
+def expiry_schedule(shards: tuple[int, list[int]] | None = None) -> list[tuple[float, str]]:
+    clause, params = _shard_clause(shards)
+    with _lock:
+        rows = _connect().execute(
+            f"SELECT expires_at, code FROM invites WHERE expires_at IS NOT NULL{clause}", params
+        ).fetchall()
+    return [(row["expires_at"], row["code"]) for row in rows]
+
+# Duas condições, dois DELETEs: com OR o SQLite varre a tabela inteira;
+# separados, cada um usa o seu índice (expires_at e o parcial de usados).
+EXPIRY_CONDITIONS = (
+    ("expires_at <= ?", True),
+    ("max_uses > 0 AND uses >= max_uses", False),
+)
+
+def pop_expired(now: float, batch: int = 500, shards: tuple[int, list[int]] | None = None) -> list[dict]:
+    # remove em lotes: expirados ou com usos esgotados
+    clause, params = _shard_clause(shards)
+    removed = []
+    with _lock:
+        conn = _connect()
+        for condition, uses_now in EXPIRY_CONDITIONS:
+            while True:
+                with conn:
+                    conn.execute("BEGIN")
+                    rows = conn.execute(
+                        "DELETE FROM invites WHERE code IN ("
+                        f"  SELECT code FROM invites WHERE {condition}{clause} LIMIT ?"
+                        ") RETURNING *",
+                        ((now,) if uses_now else ()) + (*params, batch)
+                    ).fetchall()
+                removed += [_row_to_dict(row) for row in rows]
+                if len(rows) < batch:
+                    break
+    return removed
+
+# ────────────── ATRIBUIÇÃO DE ENTRADAS ──────────────
+def record_join(guild_id: int, member_id: int, code: str | None, joined_at: float, ambiguous: bool = False):
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO invite_joins (guild_id, member_id, code, joined_at, ambiguous) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (guild_id, member_id, code, joined_at, int(ambiguous))
+            )
+            if code is not None:
+                conn.execute("UPDATE invites SET uses = uses + 1 WHERE code = ?", (code,))
 
-def list_invites():
-    return load_invites()
+def join_counts(guild_id: int) -> dict[str, int]:
+    with _lock:
+        rows = _connect().execute(
+            "SELECT code, COUNT(*) AS total FROM invite_joins "
+            "WHERE guild_id = ? AND code IS NOT NULL GROUP BY code",
+            (guild_id,)
+        ).fetchall()
+    return {row["code"]: row["total"] for row in rows}
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import time
+
+from utils.sqlite_db import SQLiteDB
+
+OUTBOX_DB = "data/log_outbox.db"
+OUTBOX_MAX_ROWS = 50_000     # acima disso os eventos mais antigos são descartados
+
+# backoff exponencial por entrada: 5s, 10s, 20s ... até 10 min
+RETRY_BASE = 5.0
+RETRY_MAX = 600.0
+
+os.makedirs("data", exist_ok=True)
+
+# ────────────── SCHEMA ──────────────
+# Entregas de log pendentes/falhas, por sink. (event_id, sink) é único:
+# o mesmo evento nunca entra duas vezes no outbox do mesmo destino.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id      TEXT NOT NULL,
+    sink          TEXT NOT NULL,
+    action        TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    created_at    REAL NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    next_attempt  REAL NOT NULL,
+    last_error    TEXT,
+    UNIQUE (event_id, sink)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(sink, next_attempt);
+"""
+
+_db = SQLiteDB(OUTBOX_DB, SCHEMA)
+_lock = _db.lock
+_connect = _db.connect
+close = _db.close
+
+def backoff(attempts: int) -> float:
+    return min(RETRY_BASE * 2 ** max(attempts - 1, 0), RETRY_MAX)
+
+# ────────────── API ──────────────
+# `entries`: [(event_id, embed_dict)]
+def store(sink: str, action: str, entries: list[tuple[str, dict]], *,
+          attempts: int = 0, error: str | None = None) -> int:
+    now = time.time()
+    retry_at = now + backoff(attempts) if attempts else now
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO outbox "
+                "(event_id, sink, action, payload, created_at, attempts, next_attempt, last_error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (event_id, sink, action, json.dumps(payload, ensure_ascii=False), now, attempts, retry_at, error)
+                    for event_id, payload in entries
+                ]
+            )
+            # limite de tamanho: descarta pelo id (índice da PK), sem varrer a tabela
+            conn.execute(
+                "DELETE FROM outbox WHERE id <= (SELECT MAX(id) FROM outbox) - ?",
+                (OUTBOX_MAX_ROWS,)
+            )
+    return cur.rowcount
+
+def due(sink: str, now: float | None = None, limit: int = 10) -> list[sqlite3.Row]:
+    with _lock:
+        return _connect().execute(
+            "SELECT id, event_id, payload, attempts FROM outbox "
+            "WHERE sink = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+            (sink, now if now is not None else time.time(), limit)
+        ).fetchall()
+
+def next_due(sink: str) -> float | None:
+    # próxima tentativa agendada do sink (None: outbox vazio); usa o índice
+    with _lock:
+        return _connect().execute(
+            "SELECT MIN(next_attempt) FROM outbox WHERE sink = ?", (sink,)
+        ).fetchone()[0]
+
+def delete(ids: list[int]):
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+def reschedule(rows: list[sqlite3.Row], error: str):
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                [
+                    (row["attempts"] + 1, now + backoff(row["attempts"] + 1), error, row["id"])
+                    for row in rows
+                ]
+            )
+
+def pending(sink: str | None = None) -> int:
+    with _lock:
+        if sink is None:
+            return _connect().execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        return _connect().execute(
+            "SELECT COUNT(*) FROM outbox WHERE sink = ?", (sink,)
+        ).fetchone()[0]
+
+def pending_sinks() -> list[tuple[str, str]]:
+    # (sink, action) com entregas pendentes: usado para recriar os sinks no startup
+    with _lock:
+        rows = _connect().execute("SELECT sink, MIN(action) AS action FROM outbox GROUP BY sink").fetchall()
+    return [(row["sink"], row["action"]) for row in rows]
+
+def rename_sink(old: str, new: str) -> int:
+    # move as entradas para outro sink (nome antigo, webhook trocado). O
+    # que sobrar no nome antigo já existe no novo (mesmo event_id): apaga.
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN")
+            moved = conn.execute(
+                "UPDATE OR IGNORE outbox SET sink = ? WHERE sink = ?", (new, old)
+            ).rowcount
+            conn.execute("DELETE FROM outbox WHERE sink = ?", (old,))
+    return moved
+
+def drop_sink(sink: str) -> int:
+    with _lock:
+        return _connect().execute("DELETE FROM outbox WHERE sink = ?", (sink,)).rowcount
@@ -0,0 +1,312 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+import discord
+
+from utils import log_outbox
+
+# ────────────── LIMITES DO DISCORD ──────────────
+BATCH_MAX_EMBEDS = 10     # embeds por mensagem
+BATCH_MAX_CHARS = 6000    # caracteres somados de todos os embeds
+BATCH_DELAY = 2.0         # segundos esperando mais embeds antes do flush
+
+# ────────────── OUTBOX ──────────────
+QUEUE_MAX = 1000          # embeds em memória por sink; o excedente vai para o disco
+REPLAY_INTERVAL = 5.0     # segundos entre verificações do outbox (só com pendências)
+REPLAY_MAX_BATCHES = 10   # lotes reenviados por rodada (não atrasa a fila ao vivo)
+DELIVERED_MEMORY = 10_000 # event IDs entregues lembrados para deduplicar
+
+# ────────────── CIRCUIT BREAKER ──────────────
+BREAKER_THRESHOLD = 5     # falhas seguidas até abrir o circuito
+BREAKER_COOLDOWN = 60.0   # segundos pulando o sink antes de tentar de novo
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        # half-open deixa passar uma tentativa; se falhar, reabre
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> bool:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+# ────────────── MÉTRICAS POR SINK ──────────────
+class SinkStats:
+    def __init__(self):
+        self.batches = 0
+        self.embeds = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_error = None
+
+    def record_latency(self, elapsed: float):
+        self.latency_total += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+
+    def as_dict(self) -> dict:
+        attempts = self.batches + self.failures
+        return {
+            "batches": self.batches,
+            "embeds": self.embeds,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "latency_avg": self.latency_total / attempts if attempts else 0.0,
+            "latency_max": self.latency_max,
+            "last_error": self.last_error,
+        }
+
+# ────────────── SINK COM FILA ──────────────
+# Fila + worker de um destino de log (thread, webhook ou arquivo).
+# `send` recebe a lista de embeds agrupados e faz uma única chamada à API.
+# Cada sink tem seu próprio worker, então os destinos rodam em paralelo e
+# um sink lento nunca atrasa os outros.
+#
+# Nada é descartado: lotes que falham (ou chegam com o circuito aberto) e
+# o excedente da fila em memória vão para o outbox em disco, reenviado
+# pelo próprio worker com backoff exponencial. Reenvios saem depois dos
+# eventos ao vivo; cada embed mantém o timestamp original. Sem nada no
+# outbox (`has_pending` falso) o worker não consulta o SQLite nem acorda
+# sozinho: só o próximo evento ou uma gravação no outbox o reativam.
+#
+# Todo acesso ao outbox roda no worker, via asyncio.to_thread: `put` (no
+# caminho do comando) nunca toca o disco, nem com a fila cheia.
+class LogSink:
+    def __init__(self, name: str, send, timeout: float = 10.0, action: str = "DEFAULT"):
+        self.name = name
+        self.send = send
+        self.timeout = timeout
+        self.action = action  # usado para recriar o sink após um restart
+        self.breaker = CircuitBreaker()
+        self.stats = SinkStats()
+        self.queue = asyncio.Queue()
+        self._delivered: set[str] = set()
+        self._delivered_order: deque[str] = deque()
+        self._overflow: list[tuple[str, discord.Embed]] = []
+        self._next_replay = 0.0
+        # pendências de uma execução anterior: o primeiro giro confere o
+        # outbox (fora do event loop) e desliga a flag se estiver vazio
+        self.has_pending = True
+        self.task = asyncio.create_task(self._worker(), name=f"log-sink:{name}")
+
+    def put(self, embed, event_id: str):
+        if self.queue.qsize() >= QUEUE_MAX:
+            # fila cheia: o worker grava o excedente no outbox no próximo giro
+            self._overflow.append((event_id, embed))
+            self.stats.spilled += 1
+            self.has_pending = True
+            return
+        self.queue.put_nowait((event_id, embed))
+
+    async def close(self):
+        self.queue.put_nowait(None)  # sentinela: drena o que já está na fila
+        await self.task
+
+    async def _next(self, deadline: float, closing: bool):
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        remaining = deadline - asyncio.get_running_loop().time()
+        if closing or remaining <= 0:
+            raise asyncio.TimeoutError
+
+        return await asyncio.wait_for(self.queue.get(), remaining)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        carry = None
+        closing = False
+
+        while True:
+            if self._overflow:
+                await self._spill()
+            if self.has_pending and loop.time() >= self._next_replay:
+                await self._replay()
+
+            if carry is not None:
+                item, carry = carry, None
+            elif closing:
+                break
+            else:
+                # ocioso com pendências: acorda na hora do próximo reenvio
+                wait = max(self._next_replay - loop.time(), 0.0) if self.has_pending else None
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), wait)
+                except asyncio.TimeoutError:
+                    continue
+
+            if item is None:
+                break
+
+            batch = [item]
+            size = len(item[1])
+            deadline = loop.time() + BATCH_DELAY
+
+            # junta até 10 embeds / 6000 caracteres ou até estourar o delay
+            while len(batch) < BATCH_MAX_EMBEDS:
+                try:
+                    nxt = await self._next(deadline, closing)
+                except asyncio.TimeoutError:
+                    break
+
+                if nxt is None:
+                    closing = True
+                    continue
+
+                if size + len(nxt[1]) > BATCH_MAX_CHARS:
+                    carry = nxt
+                    break
+
+                batch.append(nxt)
+                size += len(nxt[1])
+
+            await self._deliver(batch)
+
+        # encerrando: o excedente ainda em memória vai para o disco
+        if self._overflow:
+            await self._spill()
+
+    async def _spill(self):
+        overflow, self._overflow = self._overflow, []
+        await asyncio.to_thread(
+            log_outbox.store, self.name, self.action,
+            [(event_id, embed.to_dict()) for event_id, embed in overflow]
+        )
+
+    # ────────────── ENTREGA ──────────────
+    def _mark_delivered(self, event_ids):
+        for event_id in event_ids:
+            if event_id in self._delivered:
+                continue
+            self._delivered.add(event_id)
+            self._delivered_order.append(event_id)
+            if len(self._delivered_order) > DELIVERED_MEMORY:
+                self._delivered.discard(self._delivered_order.popleft())
+
+    async def _send(self, embeds: list) -> Exception | None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.send(embeds), self.timeout)
+        except Exception as e:  # log nunca derruba o worker
+            self.stats.record_latency(time.perf_counter() - start)
+            self.stats.failures += 1
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats.timeouts += 1
+            self.stats.last_error = repr(e)
+
+            if self.breaker.record_failure():
+                print(f"⚠️ Log sink {self.name} pausado por {self.breaker.cooldown:.0f}s: {e!r}")
+            return e
+
+        self.stats.record_latency(time.perf_counter() - start)
+        self.stats.batches += 1
+        self.stats.embeds += len(embeds)
+        self.breaker.record_success()
+        return None
+
+    async def _deliver(self, batch: list):
+        batch = [(event_id, embed) for event_id, embed in batch if event_id not in self._delivered]
+        if not batch:
+            return
+
+        if not self.breaker.allow():
+            self.stats.skipped += len(batch)
+            error = "circuito aberto"
+        else:
+            e = await self._send([embed for _, embed in batch])
+            if e is None:
+                self._mark_delivered(event_id for event_id, _ in batch)
+                return
+            error = repr(e)
+
+        await asyncio.to_thread(
+            log_outbox.store,
+            self.name, self.action,
+            [(event_id, embed.to_dict()) for event_id, embed in batch],
+            attempts=1, error=error
+        )
+        self.stats.spilled += len(batch)
+        self.has_pending = True
+        self._next_replay = asyncio.get_running_loop().time() + REPLAY_INTERVAL
+
+    # ────────────── REENVIO DO OUTBOX ──────────────
+    async def _replay(self):
+        self._next_replay = asyncio.get_running_loop().time() + REPLAY_INTERVAL
+
+        for _ in range(REPLAY_MAX_BATCHES):
+            if not self.breaker.allow():
+                return
+
+            rows = await asyncio.to_thread(log_outbox.due, self.name, limit=BATCH_MAX_EMBEDS)
+            if not rows:
+                await self._schedule_replay()
+                return
+
+            # já entregues (ex.: timeout que chegou a passar): só limpa
+            stale = [row["id"] for row in rows if row["event_id"] in self._delivered]
+            if stale:
+                await asyncio.to_thread(log_outbox.delete, stale)
+            rows = [row for row in rows if row["event_id"] not in self._delivered]
+
+            batch, embeds, size = [], [], 0
+            for row in rows:
+                embed = discord.Embed.from_dict(json.loads(row["payload"]))
+                if embeds and size + len(embed) > BATCH_MAX_CHARS:
+                    break
+                batch.append(row)
+                embeds.append(embed)
+                size += len(embed)
+
+            if not batch:
+                continue
+
+            e = await self._send(embeds)
+            if e is not None:
+                await asyncio.to_thread(log_outbox.reschedule, batch, repr(e))
+                await self._schedule_replay()
+                return
+
+            await asyncio.to_thread(log_outbox.delete, [row["id"] for row in batch])
+            self._mark_delivered(row["event_id"] for row in batch)
+            self.stats.replayed += len(batch)
+
+    async def _schedule_replay(self):
+        # nada vencido: outbox vazio desliga a verificação; senão espera
+        # a próxima tentativa agendada (backoff) em vez de consultar a cada giro
+        retry_at = await asyncio.to_thread(log_outbox.next_due, self.name)
+        if retry_at is None:
+            self.has_pending = False
+            return
+        wait = max(retry_at - time.time(), REPLAY_INTERVAL)
+        self._next_replay = asyncio.get_running_loop().time() + wait
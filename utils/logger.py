@@ -1,18 +1,30 @@
 import os
+import json
+import asyncio
+import threading
+import uuid
+import aiohttp
 import discord
 from datetime import datetime
 from urllib.parse import urlparse
+from utils import guild_config, history, log_outbox, metrics
+from utils.log_queue import LogSink
+from utils.sharding import owns_guild
 
-# ────────────── LOAD ENV ──────────────
-LOG_WEBHOOK_URL = os.getenv("LOG_WEBHOOK_URL")
-LOG_WEBHOOK_MUTE = os.getenv("LOG_WEBHOOK_MUTE")
-LOG_WEBHOOK_KICK = os.getenv("LOG_WEBHOOK_KICK")
-LOG_WEBHOOK_BAN = os.getenv("LOG_WEBHOOK_BAN")
-LOG_WEBHOOK_UNMUTE = os.getenv("LOG_WEBHOOK_UNMUTE")
-LOG_WEBHOOK_DEFAULT = os.getenv("LOG_WEBHOOK_DEFAULT")
+# ────────────── SINKS ATIVOS ──────────────
+# LOG_SINKS=thread,webhook,file  (padrão: thread,webhook)
+LOG_SINKS = {
+    s.strip()
+    for s in os.getenv("LOG_SINKS", "thread,webhook").split(",")
+    if s.strip()
+}
+LOG_FILE = os.getenv("LOG_FILE", "data/logs.jsonl")
 
-# ────────────── LOG CHANNEL ──────────────
-LOG_CHANNEL_ID = 1468183917562433618
+SINK_TIMEOUTS = {
+    "thread": float(os.getenv("LOG_TIMEOUT_THREAD", 10)),
+    "webhook": float(os.getenv("LOG_TIMEOUT_WEBHOOK", 5)),
+    "file": float(os.getenv("LOG_TIMEOUT_FILE", 2)),
+}
 
 # ────────────── THREADS FIXAS ──────────────
 THREAD_NAMES = {
@@ -24,15 +36,6 @@ THREAD_NAMES = {
     "DEFAULT": "📋 logs-geral"
 }
 
-WEBHOOKS = {
-    "Mute": LOG_WEBHOOK_MUTE or LOG_WEBHOOK_URL,
-    "Mute (Apps)": LOG_WEBHOOK_MUTE or LOG_WEBHOOK_URL,
-    "Unmute": LOG_WEBHOOK_UNMUTE or LOG_WEBHOOK_URL,
-    "Kick": LOG_WEBHOOK_KICK or LOG_WEBHOOK_URL,
-    "Ban": LOG_WEBHOOK_BAN or LOG_WEBHOOK_URL,
-    "DEFAULT": LOG_WEBHOOK_DEFAULT or LOG_WEBHOOK_URL
-}
-
 # ────────────── VALIDATION ──────────────
 def is_valid_webhook(url: str | None) -> bool:
     if not url:
@@ -47,62 +50,347 @@ def is_valid_webhook(url: str | None) -> bool:
     except Exception:
         return False
 
-# ────────────── THREAD MANAGER ──────────────
-async def get_or_create_thread(bot, action: str):
+# ────────────── POOL DE WEBHOOKS ──────────────
+# Cada URL vira um discord.Webhook reutilizável, criado na primeira vez
+# que alguma guild a usa, todos na mesma sessão aiohttp dedicada (pool de
+# conexões). Ações/guilds que apontam para a mesma URL compartilham o
+# mesmo cliente; URL inválida gera um único aviso.
+_webhook_session: aiohttp.ClientSession | None = None
+_webhook_clients: dict[str, discord.Webhook] = {}
+_invalid_webhooks: set[str] = set()
+
+async def init_webhooks():
+    global _webhook_session
+
+    if _webhook_session is None or _webhook_session.closed:
+        _webhook_session = aiohttp.ClientSession(trace_configs=[metrics.http_trace()])
+
+    _webhook_clients.clear()
+    _invalid_webhooks.clear()
+
+    # valida já no startup os webhooks da guild principal (config do .env)
+    primary = guild_config.get(guild_config.PRIMARY_GUILD_ID)
+    for action in primary.webhooks:
+        get_webhook(primary.guild_id, action)
+
+def _webhook_client(url: str) -> discord.Webhook | None:
+    webhook = _webhook_clients.get(url)
+    if webhook is not None or url in _invalid_webhooks or _webhook_session is None:
+        return webhook
+
     try:
-        channel = bot.get_channel(LOG_CHANNEL_ID)
+        if not is_valid_webhook(url):
+            raise ValueError(url)
+        webhook = discord.Webhook.from_url(url, session=_webhook_session)
+    except ValueError:
+        # um único aviso por URL, em vez de revalidar a cada log
+        _invalid_webhooks.add(url)
+        print("⚠️ Webhook de log inválido na config, usando DEFAULT")
+        return None
+
+    _webhook_clients[url] = webhook
+    return webhook
+
+def get_webhook(guild_id: int, action: str) -> discord.Webhook | None:
+    webhooks = guild_config.get(guild_id).webhooks
+
+    url = webhooks.get(action)
+    if url:
+        webhook = _webhook_client(url)
+        if webhook is not None:
+            return webhook
+
+    url = webhooks.get("DEFAULT")
+    return _webhook_client(url) if url else None
+
+# ────────────── THREAD MANAGER ──────────────
+# Cache nome da thread → ID por guild (persistido na config da guild).
+# Depois do warm-up a resolução é um lookup no dict, sem nenhuma chamada
+# à API: o envio usa um PartialMessageable, que funciona mesmo com a
+# thread arquivada.
+_thread_locks: dict[tuple[int, str], asyncio.Lock] = {}
+ARCHIVED_SCAN_LIMIT = 100  # threads arquivadas consultadas por busca
+
+def invalidate_thread(guild_id: int, action: str):
+    config = guild_config.get(guild_id)
+    thread_name = THREAD_NAMES.get(action, THREAD_NAMES["DEFAULT"])
+    if config.threads.pop(thread_name, None) is not None:
+        config.save()
+
+async def find_thread(channel: discord.TextChannel, thread_name: str):
+    # threads ativas (cache do gateway)
+    for thread in channel.threads:
+        if thread.name == thread_name:
+            return thread
+
+    # threads arquivadas (auto-archive de 7 dias), das mais recentes para
+    # as mais antigas: só as primeiras ARCHIVED_SCAN_LIMIT, sem paginar o
+    # arquivo inteiro do canal a cada cache miss
+    async for thread in channel.archived_threads(limit=ARCHIVED_SCAN_LIMIT):
+        if thread.name == thread_name and not thread.locked:
+            return thread
+
+    return None
+
+async def get_or_create_thread(bot, guild_id: int, action: str):
+    config = guild_config.get(guild_id)
+    thread_name = THREAD_NAMES.get(action, THREAD_NAMES["DEFAULT"])
+
+    thread_id = config.threads.get(thread_name)
+    if thread_id is not None:
+        return bot.get_partial_messageable(
+            thread_id,
+            type=discord.ChannelType.public_thread
+        )
+
+    # guild sem canal de logs configurado: nada a fazer
+    if config.log_channel_id is None:
+        return None
+
+    lock = _thread_locks.setdefault((guild_id, thread_name), asyncio.Lock())
+    async with lock:
+        # outra task pode ter resolvido enquanto esperávamos o lock
+        thread_id = config.threads.get(thread_name)
+        if thread_id is not None:
+            return bot.get_partial_messageable(
+                thread_id,
+                type=discord.ChannelType.public_thread
+            )
+
+        # erros da API sobem para o sink: o lote vai para o outbox e
+        # conta no circuit breaker, em vez de sumir como "entregue"
+        channel = bot.get_channel(config.log_channel_id)
         if channel is None:
-            channel = await bot.fetch_channel(LOG_CHANNEL_ID)
+            channel = await bot.fetch_channel(config.log_channel_id)
 
         if not isinstance(channel, discord.TextChannel):
             return None
 
+        # procura thread existente (ativa ou arquivada)
+        thread = await find_thread(channel, thread_name)
+
+        # cria se não existir
+        if thread is None:
+            thread = await channel.create_thread(
+                name=thread_name,
+                type=discord.ChannelType.public_thread,
+                auto_archive_duration=10080  # 7 dias
+            )
+
+        config.threads[thread_name] = thread.id
+        config.save()
+        return thread
+
+# ────────────── SENDERS (CHAMADOS PELOS WORKERS) ──────────────
+async def _resolve_thread(bot, guild_id: int, action: str):
+    thread = await get_or_create_thread(bot, guild_id, action)
+    if thread is None:
+        # sem canal de logs válido: falha de entrega, não sucesso
+        raise RuntimeError(f"Thread de log indisponível (guild {guild_id}, {action})")
+    return thread
+
+async def _send_thread(bot, guild_id: int, action: str, embeds: list):
+    thread = await _resolve_thread(bot, guild_id, action)
+
+    try:
+        await thread.send(embeds=embeds)
+    except (discord.NotFound, discord.Forbidden):
+        # thread apagada/trancada: invalida o cache e resolve de novo
+        invalidate_thread(guild_id, action)
+        thread = await _resolve_thread(bot, guild_id, action)
+        await thread.send(embeds=embeds)
+
+async def _send_webhook(webhook: discord.Webhook, embeds: list):
+    await webhook.send(
+        embeds=embeds,
+        username="Mod Logs"
+    )
+
+_file_lock = threading.Lock()
+
+def _write_file(guild_id: int, action: str, embeds: list):
+    with _file_lock, open(LOG_FILE, "a", encoding="utf-8") as f:
+        for embed in embeds:
+            record = {
+                "logged_at": datetime.utcnow().isoformat(),
+                "guild_id": guild_id,
+                "action": action,
+                "embed": embed.to_dict()
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+async def _send_file(guild_id: int, action: str, embeds: list):
+    await asyncio.to_thread(_write_file, guild_id, action, embeds)
+
+# ────────────── FILAS POR SINK ──────────────
+# Nome do sink: "<tipo>:<guild>:<destino>" — uma fila por destino real.
+_sinks: dict[str, LogSink] = {}
+
+def _get_sink(kind: str, guild_id: int, key: str, action: str, send) -> LogSink:
+    name = f"{kind}:{guild_id}:{key}"
+    sink = _sinks.get(name)
+    if sink is None:
+        sink = _sinks[name] = LogSink(name, send, timeout=SINK_TIMEOUTS[kind], action=action)
+    return sink
+
+def _sink_for(bot, kind: str, guild_id: int, action: str) -> LogSink | None:
+    if kind == "thread":
+        if guild_config.get(guild_id).log_channel_id is None:
+            return None
         thread_name = THREAD_NAMES.get(action, THREAD_NAMES["DEFAULT"])
+        return _get_sink(
+            "thread", guild_id, thread_name, action,
+            lambda embeds: _send_thread(bot, guild_id, action, embeds)
+        )
 
-        # procura thread existente
-        for thread in channel.threads:
-            if thread.name == thread_name:
-                return thread
+    if kind == "webhook":
+        webhook = get_webhook(guild_id, action)
+        if webhook is None:
+            return None
+        return _get_sink(
+            "webhook", guild_id, str(webhook.id), action,  # nome sem o token
+            lambda embeds: _send_webhook(webhook, embeds)
+        )
 
-        # cria se não existir
-        return await channel.create_thread(
-            name=thread_name,
-            type=discord.ChannelType.public_thread,
-            auto_archive_duration=10080  # 7 dias
+    if kind == "file":
+        return _get_sink(
+            "file", guild_id, action, action,
+            lambda embeds: _send_file(guild_id, action, embeds)
         )
 
-    except Exception:
-        return None
+    return None
+
+def get_log_stats() -> dict[str, dict]:
+    return {
+        name: {
+            **sink.stats.as_dict(),
+            "queued": sink.queue.qsize(),
+            "outbox": log_outbox.pending(name),
+            "breaker": sink.breaker.state
+        }
+        for name, sink in _sinks.items()
+    }
 
 # ────────────── MAIN LOGGER ──────────────
-async def log_action(bot, *, action: str = "DEFAULT", embed: discord.Embed):
-    # ────────────── 1️⃣ LOG VIA CANAL (THREAD FIXA) ──────────────
-    try:
-        thread = await get_or_create_thread(bot, action)
-        if thread:
-            await thread.send(embed=embed)
-    except Exception:
-        pass  # nunca quebra comando
+# Apenas enfileira: o envio (agrupado em até 10 embeds por mensagem)
+# acontece nos workers de cada sink, em paralelo e sem adicionar
+# latência ao comando. `event_id` identifica o evento em todos os sinks
+# (deduplicação no outbox); padrão: um UUID novo.
+#
+# Todo log também vira um registro estruturado no histórico local
+# (utils.history, gravado em segundo plano). Autor/alvos não informados
+# são extraídos do texto.
+async def log_action(bot, *, action: str = "DEFAULT", embed: discord.Embed, event_id: str | None = None,
+                     guild_id: int | None = None, author_id: int | None = None,
+                     target_ids: list[int] | None = None):
+    metrics.inc(f"log_action:{action}")
+    event_id = event_id or uuid.uuid4().hex
+    # logs sem guild (tarefas de fundo antigas) vão para a guild principal
+    guild_id = guild_id or guild_config.PRIMARY_GUILD_ID
 
-    # ────────────── 2️⃣ LOG VIA WEBHOOK ──────────────
-    try:
-        webhook_url = WEBHOOKS.get(action)
+    parsed_author, parsed_targets = history.extract_ids(embed.description)
+    history.submit(
+        event_id=event_id,
+        guild_id=guild_id,
+        action=action,
+        author_id=author_id or parsed_author,
+        target_ids=target_ids if target_ids is not None else parsed_targets,
+        title=embed.title,
+        description=embed.description,
+        created_at=embed.timestamp.timestamp() if embed.timestamp else None
+    )
+
+    # 1️⃣ thread fixa  2️⃣ webhook  3️⃣ arquivo local
+    for kind in ("thread", "webhook", "file"):
+        if kind not in LOG_SINKS:
+            continue
+        sink = _sink_for(bot, kind, guild_id, action)
+        if sink is not None:
+            sink.put(embed, event_id)
 
-        if not is_valid_webhook(webhook_url):
-            webhook_url = WEBHOOKS.get("DEFAULT")
+# ────────────── OUTBOX PENDENTE (STARTUP) ──────────────
+# Recria os sinks que têm entregas pendentes de uma execução anterior;
+# cada worker reenvia o próprio outbox assim que sobe. Com vários
+# processos, cada um só reenvia o das guilds dos seus shards.
+#
+# O sink sai do nome gravado, não da config atual: um webhook trocado no
+# /config ainda reenvia pelo antigo enquanto ele estiver na config; se
+# saiu, o pendente passa para o webhook atual da ação.
+def _webhook_by_id(guild_id: int, webhook_id: str) -> discord.Webhook | None:
+    for url in set(guild_config.get(guild_id).webhooks.values()):
+        webhook = _webhook_client(url)
+        if webhook is not None and str(webhook.id) == webhook_id:
+            return webhook
+    return None
 
-        if not is_valid_webhook(webhook_url):
-            return
+def _restore_sink(bot, kind: str, guild_id: int, key: str, action: str) -> LogSink | None:
+    name = f"{kind}:{guild_id}:{key}"
+
+    if kind == "webhook":
+        webhook = _webhook_by_id(guild_id, key)
+        if webhook is not None:
+            return _get_sink(
+                "webhook", guild_id, key, action,
+                lambda embeds: _send_webhook(webhook, embeds)
+            )
+        current = _sink_for(bot, "webhook", guild_id, action)
+        if current is None:
+            # sem webhook nenhum: não há destino (thread/arquivo têm o evento)
+            dropped = log_outbox.drop_sink(name)
+            print(f"⚠️ Outbox: {dropped} logs de {name} descartados (webhook removido)")
+            return None
+        log_outbox.rename_sink(name, current.name)
+        return current
 
-        webhook = discord.Webhook.from_url(
-            webhook_url,
-            client=bot.http._HTTPClient__session
+    if kind == "thread":
+        if guild_config.get(guild_id).log_channel_id is None:
+            return None
+        return _get_sink(
+            "thread", guild_id, key, action,
+            lambda embeds: _send_thread(bot, guild_id, action, embeds)
         )
 
-        await webhook.send(
-            embed=embed,
-            username="Mod Logs"
+    if kind == "file":
+        return _get_sink(
+            "file", guild_id, key, action,
+            lambda embeds: _send_file(guild_id, key, embeds)
         )
 
-    except Exception:
-        pass  # webhook nunca pode derrubar comando
+    return None
+
+def start_log_replay(bot):
+    for name, action in log_outbox.pending_sinks():
+        parts = name.split(":", 2)
+        if len(parts) == 2:
+            # nome antigo "<tipo>:<destino>": era sempre a guild principal
+            parts = [parts[0], str(guild_config.PRIMARY_GUILD_ID), parts[1]]
+            log_outbox.rename_sink(name, ":".join(parts))
+
+        kind, guild_id, key = parts[0], int(parts[1]), parts[2]
+        if kind in LOG_SINKS and owns_guild(bot, guild_id):
+            _restore_sink(bot, kind, guild_id, key, action)
+
+# ────────────── STARTUP ──────────────
+# Estado do logger do zero: bancos do outbox/histórico reabertos sob
+# demanda e pool de webhooks recriado. Chamado no setup_hook.
+async def init_logger():
+    log_outbox.close()
+    history.close()
+    await init_webhooks()
+
+# ────────────── SHUTDOWN ──────────────
+# Drena todas as filas antes do bot fechar a sessão HTTP.
+async def close_logger():
+    global _webhook_session
+
+    sinks = list(_sinks.values())
+    _sinks.clear()
+    await asyncio.gather(*(sink.close() for sink in sinks), return_exceptions=True)
+    await history.close_writer()
+
+    if _webhook_session is not None:
+        await _webhook_session.close()
+        _webhook_session = None
+    _webhook_clients.clear()
+    log_outbox.close()
+    history.close()
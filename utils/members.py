@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+import discord
+
+MEMBER_LRU_SIZE = 1024
+
+# ────────────── MEMBROS SOB DEMANDA ──────────────
+# Sem chunking, o cache do discord.py não tem todos os membros. Quem
+# precisa de um membro por ID passa por aqui: cache do gateway → LRU →
+# fetch_member (1 chamada à API, guardada no LRU).
+class MemberLRU:
+    def __init__(self, size: int = MEMBER_LRU_SIZE):
+        self.size = size
+        self._members: OrderedDict[tuple[int, int], discord.Member] = OrderedDict()
+
+    def __len__(self):
+        return len(self._members)
+
+    def put(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self._members[key] = member
+        self._members.move_to_end(key)
+        if len(self._members) > self.size:
+            self._members.popitem(last=False)
+
+    def discard(self, guild_id: int, user_id: int):
+        self._members.pop((guild_id, user_id), None)
+
+    # só cache do gateway / LRU, sem chamada à API
+    def get_cached(self, guild: discord.Guild, user_id: int) -> discord.Member | None:
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+
+        key = (guild.id, user_id)
+        member = self._members.get(key)
+        if member is not None:
+            self._members.move_to_end(key)
+        return member
+
+    async def get(self, guild: discord.Guild, user_id: int) -> discord.Member | None:
+        member = self.get_cached(guild, user_id)
+        if member is not None:
+            return member
+
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+
+        self.put(member)
+        return member
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import re
+import time
+
+import aiohttp
+from aiohttp import web
+
+METRICS_HOST = "127.0.0.1"   # só localhost
+METRICS_PORT = 9108          # padrão; METRICS_PORT no .env sobrescreve
+LOOP_LAG_INTERVAL = 0.5   # segundos entre amostras de lag do event loop
+
+# limites dos buckets (segundos), estilo Prometheus
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# ────────────── HISTOGRAMA ──────────────
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        # estimativa pelo limite superior do bucket (suficiente p/ achar lentos)
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return BUCKETS[-1]
+
+# ────────────── REGISTRO ──────────────
+command_latency: dict[str, Histogram] = {}
+command_errors: dict[str, int] = {}
+operation_latency: dict[str, Histogram] = {}
+step_latency: dict[str, Histogram] = {}            # etapas do pipeline de moderação
+step_failures: dict[str, int] = {}
+http_requests: dict[tuple[str, str], int] = {}     # (método, rota) → total
+http_ratelimits: dict[tuple[str, str], int] = {}   # (método, rota) → 429s
+counters: dict[str, int] = {}
+
+loop_lag_last = 0.0
+loop_lag_max = 0.0
+
+_bot = None
+_runner: web.AppRunner | None = None
+_lag_task: asyncio.Task | None = None
+
+def observe_command(name: str, seconds: float, error: bool = False):
+    command_latency.setdefault(name, Histogram()).observe(seconds)
+    if error:
+        command_errors[name] = command_errors.get(name, 0) + 1
+
+def observe(operation: str, seconds: float):
+    operation_latency.setdefault(operation, Histogram()).observe(seconds)
+
+def observe_step(step: str, seconds: float, failed: bool = False):
+    step_latency.setdefault(step, Histogram()).observe(seconds)
+    if failed:
+        step_failures[step] = step_failures.get(step, 0) + 1
+
+def inc(name: str, amount: int = 1):
+    counters[name] = counters.get(name, 0) + amount
+
+# ────────────── HTTP (aiohttp TraceConfig) ──────────────
+# IDs e tokens viram placeholders: uma série por rota, não por recurso.
+_ROUTE_RE = re.compile(r"/webhooks/\d+/[\w-]+|/\d{15,20}")
+
+def _route(url) -> str:
+    path = url.path.split("/api/v10", 1)[-1]
+    return _ROUTE_RE.sub(lambda m: "/webhooks/{id}/{token}" if m.group().startswith("/webhooks") else "/{id}", path)
+
+async def _on_request_end(session, ctx, params: aiohttp.TraceRequestEndParams):
+    key = (params.method, _route(params.url))
+    http_requests[key] = http_requests.get(key, 0) + 1
+    if params.response.status == 429:
+        http_ratelimits[key] = http_ratelimits.get(key, 0) + 1
+
+def http_trace() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_end.append(_on_request_end)
+    return trace
+
+# ────────────── LAG DO EVENT LOOP ──────────────
+async def _measure_loop_lag():
+    global loop_lag_last, loop_lag_max
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        loop_lag_last = max(0.0, time.perf_counter() - start - LOOP_LAG_INTERVAL)
+        loop_lag_max = max(loop_lag_max, loop_lag_last)
+
+# ────────────── FORMATO PROMETHEUS ──────────────
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+def _histogram_lines(metric: str, label: str, histograms: dict[str, Histogram]) -> list[str]:
+    lines = [f"# TYPE {metric} histogram"]
+    for name, hist in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS, hist.counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else bound
+            lines.append(f"{metric}_bucket{_labels(**{label: name, 'le': le})} {cumulative}")
+        lines.append(f"{metric}_sum{_labels(**{label: name})} {hist.total}")
+        lines.append(f"{metric}_count{_labels(**{label: name})} {hist.count}")
+    return lines
+
+def render() -> str:
+    from utils.logger import get_log_stats
+
+    lines = _histogram_lines("waffle_command_latency_seconds", "command", command_latency)
+
+    lines.append("# TYPE waffle_command_errors_total counter")
+    for name, n in sorted(command_errors.items()):
+        lines.append(f"waffle_command_errors_total{_labels(command=name)} {n}")
+
+    lines += _histogram_lines("waffle_operation_latency_seconds", "operation", operation_latency)
+
+    lines += _histogram_lines("waffle_moderation_step_latency_seconds", "step", step_latency)
+    lines.append("# TYPE waffle_moderation_step_failures_total counter")
+    for step, n in sorted(step_failures.items()):
+        lines.append(f"waffle_moderation_step_failures_total{_labels(step=step)} {n}")
+
+    lines.append("# TYPE waffle_http_requests_total counter")
+    for (method, route), n in sorted(http_requests.items()):
+        lines.append(f"waffle_http_requests_total{_labels(method=method, route=route)} {n}")
+
+    lines.append("# TYPE waffle_http_ratelimited_total counter")
+    for (method, route), n in sorted(http_ratelimits.items()):
+        lines.append(f"waffle_http_ratelimited_total{_labels(method=method, route=route)} {n}")
+
+    lines.append("# TYPE waffle_events_total counter")
+    for name, n in sorted(counters.items()):
+        lines.append(f"waffle_events_total{_labels(event=name)} {n}")
+
+    lines.append("# TYPE waffle_log_sink_embeds_total counter")
+    lines.append("# TYPE waffle_log_sink_failures_total counter")
+    lines.append("# TYPE waffle_log_sink_queued gauge")
+    lines.append("# TYPE waffle_log_sink_outbox gauge")
+    for sink, stats in sorted(get_log_stats().items()):
+        lines.append(f"waffle_log_sink_embeds_total{_labels(sink=sink)} {stats['embeds']}")
+        lines.append(f"waffle_log_sink_failures_total{_labels(sink=sink)} {stats['failures']}")
+        lines.append(f"waffle_log_sink_queued{_labels(sink=sink)} {stats['queued']}")
+        lines.append(f"waffle_log_sink_outbox{_labels(sink=sink)} {stats['outbox']}")
+
+    if _bot is not None:
+        cog = _bot.get_cog("InviteManager")
+        if cog is not None:
+            lines.append("# TYPE waffle_invite_cache_size gauge")
+            for guild_id, cache in cog.guild_invites_cache.items():
+                lines.append(f"waffle_invite_cache_size{_labels(guild=guild_id)} {len(cache)}")
+
+        lines.append("# TYPE waffle_gateway_latency_seconds gauge")
+        latency = _bot.latency
+        lines.append(f"waffle_gateway_latency_seconds {latency if latency == latency else 0}")  # NaN antes do 1º heartbeat
+
+    lines.append("# TYPE waffle_event_loop_lag_seconds gauge")
+    lines.append(f"waffle_event_loop_lag_seconds {loop_lag_last}")
+    lines.append("# TYPE waffle_event_loop_lag_max_seconds gauge")
+    lines.append(f"waffle_event_loop_lag_max_seconds {loop_lag_max}")
+
+    return "\n".join(lines) + "\n"
+
+# ────────────── ENDPOINT LOCAL ──────────────
+async def _handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+async def start(bot):
+    global _bot, _runner, _lag_task
+    _bot = bot
+    _lag_task = asyncio.create_task(_measure_loop_lag(), name="metrics:loop-lag")
+
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    _runner = web.AppRunner(app, access_log=None)
+    await _runner.setup()
+
+    port = int(os.getenv("METRICS_PORT", METRICS_PORT))
+    try:
+        await web.TCPSite(_runner, METRICS_HOST, port).start()
+        print(f"📈 Métricas em http://{METRICS_HOST}:{port}/metrics")
+    except OSError as e:
+        print(f"⚠️ Endpoint de métricas indisponível: {e}")
+
+async def stop():
+    global _runner, _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
@@ -1,22 +1,26 @@
-import requests
-import os
-from dotenv import load_dotenv
+import time
+import discord
+from discord.http import Route
+from utils import metrics
 
-load_dotenv()
-TOKEN = os.getenv("TOKEN")
-API_BASE = "https://discord.com/api/v10"
-
-def send_raw_v2(channel_id: int, payload: dict):
-    headers = {
-        "Authorization": f"Bot {TOKEN}",
-        "Content-Type": "application/json"
-    }
-
-    r = requests.post(
-        f"{API_BASE}/channels/{channel_id}/messages",
-        headers=headers,
-        json=payload
+# ────────────── ENVIO RAW (COMPONENTS V2) ──────────────
+# Usa o HTTPClient do próprio bot: sessão aiohttp única (pool de conexões),
+# buckets por rota e tratamento de 429 / Retry-After feitos pelo discord.py.
+async def send_raw_v2(bot, channel: discord.abc.Messageable, payload: dict):
+    route = Route(
+        "POST",
+        "/channels/{channel_id}/messages",
+        channel_id=channel.id
     )
 
-    if not r.ok:
-        raise RuntimeError(f"Erro API: {r.status_code} → {r.text}")
+    start = time.perf_counter()
+    try:
+        data = await bot.http.request(route, json=payload)
+    except discord.HTTPException as e:
+        metrics.inc("send_raw_v2:error")
+        raise RuntimeError(f"Erro API: {e.status} → {e.text}") from e
+    finally:
+        metrics.observe("send_raw_v2", time.perf_counter() - start)
+
+    # mensagem criada (parcial: id + canal, sem novo fetch)
+    return channel.get_partial_message(int(data["id"]))
@@ -0,0 +1,65 @@
+import os
+
+import discord
+
+# ────────────── PERFIS DE RUNTIME ──────────────
+# BOT_PROFILE=minimal|moderation|full  (padrão: moderation)
+#
+# minimal    → só guilds; nenhum membro em cache, sem chunking
+# moderation → membros/invites/bans para moderação e rastreio de convites,
+#              mensagens para o automod (message_content é privilegiado:
+#              habilitar no portal); cache apenas de quem entrou com o
+#              bot online, sem chunking e sem cache de mensagens
+# full       → comportamento antigo: Intents.all(), cache total e chunking
+DEFAULT_PROFILE = "moderation"
+
+def _minimal_intents() -> discord.Intents:
+    return discord.Intents(guilds=True)
+
+def _moderation_intents() -> discord.Intents:
+    return discord.Intents(
+        guilds=True,
+        members=True,           # on_member_join (atribuição de convites)
+        moderation=True,        # bans
+        invites=True,           # on_invite_create / on_invite_delete
+        guild_messages=True,    # on_message (automod)
+        message_content=True,   # texto das mensagens (automod)
+    )
+
+PROFILES = {
+    "minimal": {
+        "intents": _minimal_intents,
+        "member_cache_flags": discord.MemberCacheFlags.none,
+        "chunk_guilds_at_startup": False,
+        "max_messages": None,
+    },
+    "moderation": {
+        "intents": _moderation_intents,
+        "member_cache_flags": lambda: discord.MemberCacheFlags(voice=False, joined=True),
+        "chunk_guilds_at_startup": False,
+        "max_messages": None,
+    },
+    "full": {
+        "intents": discord.Intents.all,
+        "member_cache_flags": discord.MemberCacheFlags.all,
+        "chunk_guilds_at_startup": True,
+        "max_messages": 1000,
+    },
+}
+
+def get_profile_name() -> str:
+    name = os.getenv("BOT_PROFILE", DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        print(f"⚠️ BOT_PROFILE `{name}` desconhecido, usando `{DEFAULT_PROFILE}`")
+        name = DEFAULT_PROFILE
+    return name
+
+# kwargs prontos para commands.Bot.__init__
+def bot_options(name: str | None = None) -> dict:
+    profile = PROFILES[name or get_profile_name()]
+    return {
+        "intents": profile["intents"](),
+        "member_cache_flags": profile["member_cache_flags"](),
+        "chunk_guilds_at_startup": profile["chunk_guilds_at_startup"],
+        "max_messages": profile["max_messages"],
+    }
@@ -0,0 +1,49 @@
+import os
+
+# ────────────── SHARDS DESTE PROCESSO ──────────────
+# SHARD_COUNT=16 SHARD_IDS=0,1,2,3  → este processo conecta só esses shards
+# (definidos pelo launcher.py). Sem as variáveis, o AutoShardedBot usa o
+# número recomendado pelo Discord e conecta todos.
+def shard_options() -> dict:
+    count = os.getenv("SHARD_COUNT")
+    ids = os.getenv("SHARD_IDS")
+
+    options = {}
+    if count:
+        options["shard_count"] = int(count)
+    if ids:
+        options["shard_ids"] = [int(i) for i in ids.split(",") if i.strip()]
+    return options
+
+# shard de uma guild (fórmula do Discord)
+def shard_for(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+# Com vários processos, dados em disco compartilhados (outbox, invites)
+# só devem ser tratados pelo processo que atende a guild.
+# (shard_count, shard_ids) deste processo; None: atende todas as guilds.
+def owned_shards(bot) -> tuple[int, list[int]] | None:
+    shard_ids = getattr(bot, "shard_ids", None)
+    shard_count = getattr(bot, "shard_count", None)
+    if not shard_ids or not shard_count:
+        return None
+    return shard_count, list(shard_ids)
+
+def owns_guild(bot, guild_id: int | None) -> bool:
+    shards = owned_shards(bot)
+    if guild_id is None or shards is None:
+        return True
+    return shard_for(guild_id, shards[0]) in shards[1]
+
+# Divide os shards em faixas contíguas, uma por worker.
+def plan_shards(shard_count: int, workers: int) -> list[list[int]]:
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+
+    plan = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        plan.append(list(range(start, end)))
+        start = end
+    return plan
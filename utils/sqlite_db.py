@@ -0,0 +1,33 @@
+import sqlite3
+import threading
+
+# ────────────── CONEXÃO SQLITE COMPARTILHADA ──────────────
+# Uma conexão por banco, aberta sob demanda em WAL (leitores não esperam
+# o escritor) com synchronous=NORMAL, e um lock por banco: as chamadas
+# vêm do event loop e de threads (asyncio.to_thread). `on_open(conn)`
+# roda uma vez, logo depois do schema (ex.: migração de arquivos antigos).
+class SQLiteDB:
+    def __init__(self, path: str, schema: str, on_open=None):
+        self.path = path
+        self.schema = schema
+        self.on_open = on_open
+        self.lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            self._conn = conn
+            if self.on_open is not None:
+                self.on_open(conn)
+        return self._conn
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from discord import app_commands
+
+RESCAN_INTERVAL = 5.0  # segundos entre varreduras do diretório (mtime)
+
+# ────────────── REGISTRO DE TEMPLATES ──────────────
+# Indexa os *.json de um diretório e guarda o resultado já validado de
+# `build(data)` em memória. Cada arquivo é invalidado quando o mtime muda.
+# Só nomes vindos do índice são abertos, então path traversal não existe.
+class TemplateRegistry:
+    def __init__(self, directory: str, build, rescan_interval: float = RESCAN_INTERVAL):
+        self.directory = directory
+        self.build = build
+        self.rescan_interval = rescan_interval
+        self._mtimes: dict[str, float] = {}
+        self._cache: dict[str, object] = {}
+        self._scanned_at = None
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._scanned_at is not None and now - self._scanned_at < self.rescan_interval:
+            return
+        self._scanned_at = now
+
+        mtimes = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".json"):
+                        mtimes[entry.name[:-5]] = entry.stat().st_mtime
+        except FileNotFoundError:
+            pass
+
+        # descarta o que sumiu ou mudou; o parse acontece no próximo get()
+        for name in list(self._cache):
+            if mtimes.get(name) != self._mtimes.get(name):
+                del self._cache[name]
+
+        self._mtimes = mtimes
+
+    def invalidate(self, name: str | None = None):
+        if name is None:
+            self._cache.clear()
+            self._scanned_at = None
+        else:
+            self._cache.pop(name, None)
+
+    def names(self) -> list[str]:
+        self.refresh()
+        return sorted(self._mtimes)
+
+    def get(self, name: str):
+        self.refresh()
+
+        if name not in self._mtimes:
+            raise ValueError(f"Arquivo `{name}.json` não encontrado")
+
+        if name not in self._cache:
+            path = os.path.join(self.directory, f"{name}.json")
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._cache[name] = self.build(data)
+
+        return self._cache[name]
+
+    async def autocomplete(self, current: str) -> list[app_commands.Choice[str]]:
+        current = current.lower()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.names()
+            if current in name.lower()
+        ][:25]
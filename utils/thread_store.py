@@ -0,0 +1,20 @@
+import json
+import os
+
+THREADS_FILE = "data/log_threads.json"
+
+os.makedirs("data", exist_ok=True)
+
+# ────────────── MAPA NOME DA THREAD → ID (LEGADO, SÓ LEITURA) ──────────────
+# Importado uma vez para a config da guild principal (utils.guild_config).
+def load_thread_ids() -> dict[str, int]:
+    try:
+        with open(THREADS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return {name: int(thread_id) for name, thread_id in data.items()}
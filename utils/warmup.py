@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+WARMUP_CONCURRENCY = 8
+
+# duração de cada fase do warm-up (segundos), para consulta
+phase_timings: dict[str, float] = {}
+
+# ────────────── WARM-UP CONCORRENTE ──────────────
+# `jobs` é uma lista de (chave, fábrica de corrotina). Chaves repetidas
+# viram uma única tarefa; todas rodam em paralelo limitadas pelo semáforo.
+async def warm_up(name: str, jobs, *, limit: int = WARMUP_CONCURRENCY) -> dict:
+    unique = {}
+    for key, factory in jobs:
+        unique.setdefault(key, factory)
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(factory):
+        async with semaphore:
+            return await factory()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run(factory) for factory in unique.values()),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+
+    phase_timings[name] = elapsed
+    failed = sum(isinstance(r, BaseException) for r in results)
+    print(f"⏱️ Warm-up {name}: {len(unique)} tarefas em {elapsed:.2f}s ({failed} falhas)")
+
+    return dict(zip(unique, results))